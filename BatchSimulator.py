@@ -0,0 +1,357 @@
+#
+# BatchSimulator.py
+# 18 October 2026
+#
+
+from __future__ import annotations
+from time import perf_counter
+from typing import Sequence
+try:
+    import numpy as np
+except ImportError as error:
+    # NumPy is only needed here, so the rest of MENACE runs without it
+    raise ImportError("BatchSimulator needs NumPy, which isn't installed; install it with pip install numpy") from error
+from BitBoard import lineMasks
+from MENACE import MENACE
+from Matchbox import Matchbox
+from Move import Move
+from Checkpoint import Checkpointer
+from Trainer import TrainingResults
+import Symmetry
+
+# the number stored in the board tensor for each symbol; the same as the digits in Board.canonicalKey
+_CROSS = 1
+_NOUGHT = 2
+# the symbol for each number in the board tensor, with None for blank cells (and for draws)
+_SYMBOLS = (None, Move.CROSS, Move.NOUGHT)
+
+# the largest board whose canonical keys fit in a 64 bit integer (3 ** 36 < 2 ** 63 < 3 ** 49)
+MAX_SIZE = 6
+
+
+class _BeadTable:
+    """
+    One MENACE's matchboxes as arrays: the canonical keys in sorted order, and a row of beads for each key, in the
+    board's canonical orientation, so the beads for a whole batch of boards can be looked up at once
+    """
+    # the MENACE the beads belong to
+    _player: MENACE
+    _size: int
+    # how many in a row wins, or None for the whole width of the board
+    _k: int | None
+    # the canonical key of each row, sorted so they can be binary searched
+    keys: np.ndarray
+    # the beads for each cell of each row's board, the same as Matchbox.beads
+    beads: np.ndarray
+
+    def __init__(self, player: MENACE, size: int, k: int | None = None):
+        """
+        :param player: the MENACE whose matchboxes to load
+        :param size: the size of the boards to load matchboxes for
+        :param k: how many in a row wins on those boards; defaults to size
+        """
+        self._player = player
+        self._size = size
+        self._k = k
+        keys: list[int] = []
+        rows: list = []
+        for matchbox in player.matchboxes():
+            if matchbox.size() == size and matchbox.symbol() == player.symbol():
+                keys.append(matchbox.canonicalKey()[0])
+                rows.append(matchbox.beads())
+        keys = np.array(keys, dtype=np.int64)
+        order = np.argsort(keys)
+        self.keys = keys[order]
+        self.beads = np.array(rows, dtype=np.int64).reshape(len(keys), size * size)[order]
+
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Finds the row for each key, creating the matchbox for any key that doesn't have one yet the same way MENACE
+        would the first time it saw the board
+        :param keys: the canonical keys to look up
+        :return: the row for each key
+        """
+        rows = np.searchsorted(self.keys, keys)
+        found = rows < len(self.keys)
+        found[found] = self.keys[rows[found]] == keys[found]
+        if found.all():
+            return rows
+        missing = np.unique(keys[~found])
+        beads = np.array([self._player.matchbox(int(key), self._size, self._k).beads() for key in missing],
+                         dtype=np.int64)
+        allKeys = np.concatenate((self.keys, missing))
+        order = np.argsort(allKeys)
+        self.keys = allKeys[order]
+        self.beads = np.concatenate((self.beads, beads))[order]
+        return np.searchsorted(self.keys, keys)
+
+    def learn(self, keys: np.ndarray, cells: np.ndarray, adjustments: np.ndarray) -> None:
+        """
+        Adds beads for moves, then writes the changes back to the MENACE's matchboxes. Like Matchbox._adjust, a cell
+        can't go below 0 beads, and once a cell runs out, the moves after it don't change it any more, since it
+        couldn't have been played again; like Matchbox.merge, matchboxes with no beads left are reset
+        :param keys: the canonical key of the board each move was made on, in the order MENACE.learn would learn them
+        :param cells: the cell of each move, in the board's canonical orientation
+        :param adjustments: the number of beads to add for each move
+        """
+        rows = self.lookup(keys)
+        before = self.beads.copy()
+        # group the moves by the cell they change, keeping them in order within each cell
+        flat = rows * self.beads.shape[1] + cells
+        order = np.argsort(flat, kind="stable")
+        flat = flat[order]
+        total = np.cumsum(adjustments[order])
+        starts = np.flatnonzero(np.concatenate(([True], flat[1:] != flat[:-1])))
+        ends = np.concatenate((starts[1:], [len(flat)])) - 1
+        # the beads in each cell after each of its moves, had nothing been skipped
+        offsets = np.repeat(total[starts] - adjustments[order][starts], ends - starts + 1)
+        running = before.reshape(-1)[flat] + total - offsets
+        emptied = np.logical_or.reduceat(running <= 0, starts)
+        np.put(self.beads, flat[starts], np.where(emptied, 0, running[ends]))
+        changed = np.unique(rows)
+        deltas = self.beads[changed] - before[changed]
+        merged: dict[int: dict[int: int]] = dict()
+        for row, delta in zip(changed.tolist(), deltas):
+            nonzero = np.flatnonzero(delta)
+            if nonzero.size:
+                merged[int(self.keys[row])] = dict(zip(nonzero.tolist(), delta[nonzero].tolist()))
+        self._player.merge(merged, self._size, self._k)
+        # the matchboxes that ran out of beads were reset by Matchbox.merge, so copy their new beads
+        for row in changed[self.beads[changed].sum(axis=1) == 0].tolist():
+            self.beads[row] = self._player.matchbox(int(self.keys[row]), self._size, self._k).beads()
+
+
+class BatchSimulator:
+    """
+    Trains two MENACEs by playing a whole batch of independent games at once with NumPy. The boards are one
+    (batch, size * size) array, winners are found for every game at once by multiplying with a matrix of the winning
+    lines, and each move is drawn for every game at once from the beads of the matchboxes.
+    Each batch samples its moves from the beads as they were at the start of the batch: unlike Trainer, no game learns
+    from the games before it in the same batch. Once the whole batch is over, every move learns the same way it would
+    with MENACE.learn, and the changes are written back to the MENACEs' matchboxes, so the next batch samples from
+    them. With a batch of 1, every game learns from the one before, as with Trainer.
+    """
+    _players: tuple[MENACE, MENACE]
+    _size: int
+    # how many in a row wins
+    _k: int
+    # the number of games to play at once
+    _batch: int
+    _random: np.random.Generator
+    # each MENACE's matchboxes, as arrays
+    _tables: tuple[_BeadTable, _BeadTable]
+    # each MENACE's Checkpointer, if it should be saved as it trains
+    _checkpointers: Sequence[Checkpointer]
+    # (lines, cells) matrix with a 1 where each winning line (see BitBoard.lineMasks) covers each cell
+    _lines: np.ndarray
+    # (symmetries, cells) array of Symmetry.sources, to gather each board under every symmetry at once
+    _sources: np.ndarray
+    # the value of each cell's digit in a canonical key
+    _powers: np.ndarray
+
+    def __init__(self, player1: MENACE, player2: MENACE, size: int = 3, batch: int = 4096, seed: int | None = None,
+                 checkpointers: Sequence[Checkpointer] = (), k: int | None = None):
+        """
+        :param player1: the MENACE that goes first; it will play X
+        :param player2: the MENACE that goes second; it will play O
+        :param size: the size of the board to play on, up to MAX_SIZE; defaults to 3
+        :param batch: the number of games to play at once; defaults to 4096
+        :param seed: the seed for the random number generator; defaults to a random one
+        :param checkpointers: a Checkpointer for each MENACE that should be saved during and after training
+        :param k: how many in a row wins; defaults to size
+        """
+        if size > MAX_SIZE:
+            raise ValueError(f"Boards bigger than {MAX_SIZE}x{MAX_SIZE} can't be simulated")
+        player1.setSymbol(Move.CROSS)
+        player2.setSymbol(Move.NOUGHT)
+        self._players = (player1, player2)
+        self._size = size
+        self._k = size if k is None else k
+        self._batch = batch
+        self._random = np.random.default_rng(seed)
+        self._tables = (_BeadTable(player1, size, self._k), _BeadTable(player2, size, self._k))
+        self._checkpointers = checkpointers
+        cells = size * size
+        masks = lineMasks(size, self._k)
+        self._lines = np.array([[(mask >> cell) & 1 for cell in range(cells)] for mask in masks], dtype=np.int16)
+        self._sources = np.array(Symmetry.sources(size), dtype=np.intp)
+        self._powers = 3 ** np.arange(cells - 1, -1, -1, dtype=np.int64)
+
+    def train(self, games: int | None = None, seconds: float | None = None) -> TrainingResults:
+        """
+        Plays batches of games until one of the stop conditions is met, teaching both MENACEs after each batch. At
+        least one stop condition must be given. Every Checkpointer does a full save once training stops.
+        :param games: the number of games to play; the last batch is shortened to play exactly this many
+        :param seconds: how long to train for, in seconds; checked between batches
+        :return: the results of the games
+        :raises ValueError: if no stop condition is given
+        """
+        if games is None and seconds is None:
+            raise ValueError("Training needs at least one stop condition: games or seconds")
+        results = TrainingResults()
+        start = perf_counter()
+        try:
+            while True:
+                played = results.games()
+                if games is not None and played >= games:
+                    break
+                if seconds is not None and perf_counter() - start >= seconds:
+                    break
+                count = self._batch if games is None else min(self._batch, games - played)
+                winners = self._playBatch(count)
+                outcomes = np.bincount(winners, minlength=3)
+                for winner in range(3):
+                    for i in range(int(outcomes[winner])):
+                        results.record(_SYMBOLS[winner])
+                for checkpointer in self._checkpointers:
+                    checkpointer.gameFinished(count)
+        finally:
+            results.stop(perf_counter() - start)
+            for checkpointer in self._checkpointers:
+                checkpointer.close()
+        return results
+
+    def _canonicalKeys(self, boards: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized Board.canonicalKey
+        :param boards: (games, cells) array of boards
+        :return: the canonical key of each board, and the number of the symmetry that turns it into the board with
+        that key
+        """
+        # (games, symmetries) keys of every board under every symmetry
+        keys = boards[:, self._sources].astype(np.int64) @ self._powers
+        symmetries = keys.argmin(axis=1)
+        return keys[np.arange(len(boards)), symmetries], symmetries
+
+    def _playBatch(self, count: int) -> np.ndarray:
+        """
+        Plays count games at once, then teaches both MENACEs
+        :param count: the number of games
+        :return: the number of the symbol that won each game (see _SYMBOLS), with 0 for a draw
+        """
+        size = self._size
+        cells = size * size
+        boards = np.zeros((count, cells), dtype=np.int8)
+        playing = np.ones(count, dtype=bool)
+        winners = np.zeros(count, dtype=np.int8)
+        # for each turn: the games still playing, and the canonical key and canonical cell of each of their moves
+        turns: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        for turn in range(cells):
+            games = np.flatnonzero(playing)
+            if games.size == 0:
+                break
+            # every game starts together, so the same player moves in every game that's still going
+            table = self._tables[turn % 2]
+            symbol = _CROSS if turn % 2 == 0 else _NOUGHT
+            keys, symmetries = self._canonicalKeys(boards[games])
+            # look the rows up first, since creating matchboxes replaces table.beads
+            rows = table.lookup(keys)
+            beads = table.beads[rows]
+            # pick a cell for each game with chances proportional to its beads, like Matchbox._sample
+            totals = np.cumsum(beads, axis=1)
+            targets = self._random.integers(0, totals[:, -1])
+            chosen = (totals > targets[:, None]).argmax(axis=1)
+            # the beads are for the canonical board, so move the chosen cell back onto the game's board
+            boards[games, self._sources[symmetries, chosen]] = symbol
+            turns.append((games, keys, chosen))
+            # count how many cells of each line the player holds; a full line wins
+            held = (boards[games] == symbol).astype(np.int16) @ self._lines.T
+            won = games[(held == self._k).any(axis=1)]
+            winners[won] = symbol
+            playing[won] = False
+        for player, table in enumerate(self._tables):
+            symbol = _CROSS if player == 0 else _NOUGHT
+            # the same adjustments as MENACE.learn, for each game
+            adjustment = np.full(count, Matchbox.lossAdjustment, dtype=np.int64)
+            adjustment[winners == symbol] = Matchbox.winAdjustment
+            adjustment[winners == 0] = Matchbox.drawAdjustment
+            moves = turns[player::2]
+            if moves:
+                # learn game by game, the way MENACE.learn would have after each game
+                order = np.argsort(np.concatenate([games for games, keys, chosen in moves]), kind="stable")
+                table.learn(np.concatenate([keys for games, keys, chosen in moves])[order],
+                            np.concatenate([chosen for games, keys, chosen in moves])[order],
+                            np.concatenate([adjustment[games] for games, keys, chosen in moves])[order])
+        return winners
+
+
+def testCanonicalKeys(size: int = 3, boards: int = 500) -> None:
+    """
+    Tests that the vectorized canonical keys and symmetries match Board.canonicalKey for random boards
+    :param size: the size of board to test
+    :param boards: the number of random boards to test
+    """
+    from Board import Board
+    simulator = BatchSimulator(MENACE("Test 1"), MENACE("Test 2"), size, seed=0)
+    grids = np.random.default_rng(size).integers(0, 3, (boards, size * size)).astype(np.int8)
+    keys, symmetries = simulator._canonicalKeys(grids)
+    for grid, key, symmetry in zip(grids, keys, symmetries):
+        board = Board.fromKey(int(grid.astype(np.int64) @ simulator._powers), size)
+        expected, expectedSymmetry = board.canonicalKey()
+        assert int(key) == expected
+        board.applySymmetry(int(symmetry))
+        assert board.canonicalKey() == (expected, 0)
+
+
+def testLearn(size: int = 3) -> None:
+    """
+    Tests that a cell that runs out of beads partway through a batch stays empty, the way it would if each game were
+    learned from one at a time, while the other cells keep learning
+    :param size: the size of board to test
+    """
+    player = MENACE("Test")
+    beads = list(player.matchbox(0, size).beads())
+    table = _BeadTable(player, size)
+    # enough losses to empty cell 0, then some wins; cell 1 only wins
+    losses = beads[0] // -Matchbox.lossAdjustment + 1
+    adjustments = [Matchbox.lossAdjustment] * losses + [Matchbox.winAdjustment] * 3
+    cells = [0] * len(adjustments) + [1] * 3
+    adjustments += [Matchbox.winAdjustment] * 3
+    table.learn(np.zeros(len(cells), dtype=np.int64), np.array(cells), np.array(adjustments, dtype=np.int64))
+    expected = beads[:]
+    expected[0] = 0
+    expected[1] += 3 * Matchbox.winAdjustment
+    assert list(table.beads[0]) == expected and list(player.matchbox(0, size).beads()) == expected
+
+
+def testTraining(size: int = 3, k: int | None = None) -> None:
+    """
+    Tests that training plays exactly the games asked for, and leaves the bead tables and the MENACEs' matchboxes
+    agreeing, with every matchbox still holding beads and playing by the same rules
+    :param size: the size of board to test
+    :param k: how many in a row wins; defaults to size
+    """
+    players = (MENACE("Test 1"), MENACE("Test 2"))
+    simulator = BatchSimulator(players[0], players[1], size, batch=256, seed=1, k=k)
+    results = simulator.train(games=1000)
+    assert results.games() == 1000
+    assert results.wins(Move.CROSS) + results.wins(Move.NOUGHT) + results.draws() == 1000
+    for player, table in zip(players, simulator._tables):
+        matchboxes = [matchbox for matchbox in player.matchboxes() if matchbox.symbol() == player.symbol()]
+        assert len(matchboxes) == len(table.keys)
+        for matchbox in matchboxes:
+            row = np.searchsorted(table.keys, matchbox.canonicalKey()[0])
+            assert list(table.beads[row]) == list(matchbox.beads())
+            assert sum(matchbox.beads()) > 0 and min(matchbox.beads()) >= 0
+            assert matchbox._board.k() == simulator._k
+    try:
+        simulator.train()
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Training without a stop condition should raise ValueError")
+
+
+def main():
+    testCanonicalKeys()
+    testCanonicalKeys(4)
+    testLearn()
+    testTraining()
+    testTraining(4)
+    testTraining(4, 3)
+    simulator = BatchSimulator(MENACE("Menace 1"), MENACE("Menace 2"), seed=0)
+    print(simulator.train(games=100000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+#
+# BitBoard.py
+# 18 October 2026
+#
+
+from __future__ import annotations
+from typing import Sequence
+from Board import Board, _permutation
+from Move import Move
+from Rules import Rules
+from util import IllegalMoveError
+
+# the symbols a grid can hold for its masks to be built by translating it into binary digits
+_PLAIN = frozenset((Move.CROSS, Move.NOUGHT, Move.BLANK))
+_CROSS_BITS = str.maketrans({Move.CROSS: "1", Move.NOUGHT: "0", Move.BLANK: "0"})
+_NOUGHT_BITS = str.maketrans({Move.CROSS: "0", Move.NOUGHT: "1", Move.BLANK: "0"})
+
+
+def lineMasks(size: int, k: int | None = None) -> tuple[int, ...]:
+    """
+    Looks up a bitmask for each line that wins the game on a board of the given size.
+    Bit i of a mask is set if cell i (row i // size, column i % size) is part of the line.
+    :param size: the number of cells across the board
+    :param k: how many in a row wins; defaults to size
+    :return: the masks for each line, in the same order as Rules.lines
+    """
+    return Rules(size, size, size if k is None else k).masks()
+
+
+def _swapBits(mask: int, pos1: int, pos2: int) -> int:
+    """
+    :param mask: the bitmask to change
+    :param pos1: the first bit to swap
+    :param pos2: the second bit to swap
+    :return: the mask with bits pos1 and pos2 exchanged
+    """
+    # if the bits are different, flipping both of them swaps them
+    if ((mask >> pos1) ^ (mask >> pos2)) & 1:
+        mask ^= (1 << pos1) | (1 << pos2)
+    return mask
+
+
+class BitBoard(Board):
+    """
+    A Board that also keeps track of where each symbol is using integer bitmasks, and answers winner, isOver, and sum
+    from them instead of counting the symbols in each line: a line is full if its mask is inside a symbol's mask, and
+    the number of moves is the number of bits set. Works anywhere a Board does.
+    """
+    # bit i is set if cell i holds Move.CROSS
+    _crosses: int
+    # bit i is set if cell i holds Move.NOUGHT
+    _noughts: int
+    # bit i is set if cell i holds any other symbol
+    _others: int
+    # the mask of each winning line (see lineMasks), and the mask with every cell set
+    _lineMasks: tuple[int, ...]
+    _allCells: int
+
+    def reset(self) -> None:
+        """
+        Resets the board to an empty state. Board's counts of the symbols in each line aren't kept, since the masks
+        answer everything they would
+        """
+        self._grid = [Move.BLANK for i in range(self._size * self._size)]
+        self._history = []
+        self._linesThrough = self._rules.allLinesThrough()
+        self._lineMasks = self._rules.masks()
+        self._allCells = (1 << (self._size * self._size)) - 1
+        self._winner = None
+        self._crosses = 0
+        self._noughts = 0
+        self._others = 0
+
+    def makeMove(self, move: Move) -> None:
+        """
+        Mutates this Board to contain the given Move
+        :param move: The Move to make
+        :raises IllegalMoveError: If the move to be made was illegal
+        """
+        if not self.legalMove(move):
+            raise IllegalMoveError(f"Move {move} is illegal with game state: \n{self}")
+        row, column = move.position()
+        cell = column + row * self._size
+        symbol = move.symbol()
+        # a blank "move" leaves the cell empty, the same as for a Board
+        if symbol == Move.BLANK:
+            return
+        self._grid[cell] = symbol
+        self._history.append(cell)
+        bit = 1 << cell
+        if symbol == Move.CROSS:
+            self._crosses |= bit
+            mask = self._crosses
+        elif symbol == Move.NOUGHT:
+            self._noughts |= bit
+            mask = self._noughts
+        else:
+            self._others |= bit
+            return
+        # only the lines through this cell can have been completed
+        lineMasks = self._lineMasks
+        for line in self._linesThrough[cell]:
+            if mask & lineMasks[line] == lineMasks[line]:
+                if self._winner is None:
+                    self._winner = symbol
+                elif self._winner != symbol:
+                    # both symbols have a full line, which can't happen in a game, so fall back to the order
+                    # _scanWinner checks the lines in
+                    self._winner = self._findWinner()
+                return
+
+    def sum(self) -> int:
+        """
+        Calculates the number of turns that have been taken on this Board
+        :return: The number of non-empty cells on the board (i.e. the number of cells that aren't Move.BLANK)
+        """
+        return (self._crosses | self._noughts | self._others).bit_count()
+
+    def winner(self) -> str | None:
+        """
+        Determines if there is a winner of the game
+        :return: Which symbol won (one of Move.NOUGHT or Move.CROSS), or None if there is no winner or there's a draw
+        """
+        # the masks only say which lines X and O fill, so other symbols need the whole board checked
+        if self._others:
+            return self._scanWinner()
+        return self._winner
+
+    def isOver(self) -> bool:
+        """
+        Determines if the game is over
+        :return: True if there is a winner or it's a draw, False otherwise
+        """
+        if self._crosses | self._noughts | self._others == self._allCells:
+            return True
+        return self.winner() is not None
+
+    def _findWinner(self) -> str | None:
+        """
+        Finds a full line from the masks, checking the lines in the same order as _scanWinner
+        :return: the symbol that fills the line, or None if no line is full
+        """
+        crosses = self._crosses
+        noughts = self._noughts
+        for mask in self._lineMasks:
+            if crosses & mask == mask:
+                return Move.CROSS
+            if noughts & mask == mask:
+                return Move.NOUGHT
+        return None
+
+    def pop(self) -> Move:
+        """
+        Takes back the last move made, clearing its bit and updating the winner in place
+        :return: the Move that was taken back
+        :raises IllegalMoveError: If no moves have been made
+        """
+        if not self._history:
+            raise IllegalMoveError(f"There is no move to take back with game state: \n{self}")
+        cell = self._history.pop()
+        symbol = self._grid[cell]
+        self._grid[cell] = Move.BLANK
+        keep = ~(1 << cell)
+        self._crosses &= keep
+        self._noughts &= keep
+        self._others &= keep
+        # the move may have completed a line; another full line may still be there, but usually none is
+        if self._winner is not None:
+            self._winner = self._findWinner()
+        return Move(cell // self._size, cell % self._size, symbol)
+
+    def _swap(self, pos1: int, pos2: int) -> None:
+        grid = self._grid
+        grid[pos1], grid[pos2] = grid[pos2], grid[pos1]
+        self._history = [pos2 if cell == pos1 else pos1 if cell == pos2 else cell for cell in self._history]
+        self._crosses = _swapBits(self._crosses, pos1, pos2)
+        self._noughts = _swapBits(self._noughts, pos1, pos2)
+        self._others = _swapBits(self._others, pos1, pos2)
+        self._winner = self._findWinner()
+
+    def _permute(self, source: Sequence[int]) -> None:
+        """
+        Moves every symbol on the board at once; there are no line counts to move, so only the masks are rebuilt
+        :param source: source[cell] is the cell whose symbol should end up in cell
+        """
+        grid = [self._grid[i] for i in source]
+        destination = _permutation(self._rules, source)[0]
+        self._history = [destination[cell] for cell in self._history]
+        self._grid = grid
+        self._setMasks(grid)
+        # the same symbols are on the board, so only the order of the lines can affect the winner
+        if self._winner is not None:
+            self._winner = self._findWinner()
+
+    def _setGrid(self, grid: list[str], lineCounts: tuple[list[int], list[int]] | None = None) -> None:
+        """
+        Replaces every cell on the board at once, rebuilding the masks and the winner from grid
+        :param grid: the symbol for each cell, in the same order as _grid
+        :param lineCounts: ignored, since a BitBoard doesn't count the symbols in each line
+        """
+        self._grid = grid
+        self._setMasks(grid)
+        self._winner = self._findWinner()
+
+    def _setMasks(self, grid: list[str]) -> None:
+        """
+        Rebuilds the masks from the symbol in each cell
+        """
+        if _PLAIN.issuperset(grid):
+            # the last cell is the most significant bit
+            cells = "".join(reversed(grid))
+            self._crosses = int(cells.translate(_CROSS_BITS), 2)
+            self._noughts = int(cells.translate(_NOUGHT_BITS), 2)
+            self._others = 0
+        else:
+            crosses = noughts = others = 0
+            bit = 1
+            for symbol in grid:
+                if symbol == Move.CROSS:
+                    crosses |= bit
+                elif symbol == Move.NOUGHT:
+                    noughts |= bit
+                elif symbol != Move.BLANK:
+                    others |= bit
+                bit <<= 1
+            self._crosses = crosses
+            self._noughts = noughts
+            self._others = others
+
+    def __eq__(self, other: Board) -> bool:
+        """
+        Compares the two boards to determine if they match exactly
+        :param other: the Board to compare to this one
+        :return: True if the boards are exactly the same; False otherwise
+        """
+        # only symbols other than X and O need the cells to be compared one at a time
+        if isinstance(other, BitBoard) and not self._others and not other._others:
+            return self._crosses == other._crosses and self._noughts == other._noughts
+        return super().__eq__(other)
+
+    def __copy__(self) -> BitBoard:
+        """
+        :return: An independent copy of the board
+        """
+        duplicate = BitBoard(self._size, self._k)
+        duplicate._grid = self._grid[:]
+        duplicate._history = self._history[:]
+        duplicate._winner = self._winner
+        duplicate._crosses = self._crosses
+        duplicate._noughts = self._noughts
+        duplicate._others = self._others
+        return duplicate
+
+
+def _checkMasks(b: BitBoard) -> None:
+    """
+    Checks that the masks of the given BitBoard agree with its cells
+    """
+    for cell in range(b.size() ** 2):
+        symbol = b._grid[cell]
+        bit = 1 << cell
+        assert bool(b._crosses & bit) == (symbol == Move.CROSS)
+        assert bool(b._noughts & bit) == (symbol == Move.NOUGHT)
+        assert bool(b._others & bit) == (symbol not in (Move.CROSS, Move.NOUGHT, Move.BLANK))
+
+
+def testAgainstBoard(size: int = 3, k: int | None = None, games: int = 200) -> None:
+    """
+    Tests that a BitBoard behaves exactly like a Board through random games, including after copying and applying each
+    symmetry, and while taking the moves back again
+    :param size: the size of board to test
+    :param k: how many in a row wins; defaults to size
+    :param games: the number of random games to play
+    """
+    from copy import copy
+    from random import Random
+    import Symmetry
+    generator = Random(size)
+    for game in range(games):
+        board = Board(size, k)
+        bitBoard = BitBoard(size, k)
+        cells = list(range(size * size))
+        generator.shuffle(cells)
+        for turn, cell in enumerate(cells):
+            if board.isOver():
+                break
+            move = Move(cell // size, cell % size, (Move.CROSS, Move.NOUGHT)[turn % 2])
+            board.makeMove(move)
+            bitBoard.makeMove(move)
+            _checkMasks(bitBoard)
+            assert bitBoard.winner() == board.winner() and bitBoard.isOver() == board.isOver()
+            assert bitBoard.sum() == board.sum() and bitBoard.history() == board.history()
+            assert bitBoard.canonicalKey() == board.canonicalKey()
+            assert bitBoard == board and board == bitBoard
+            assert copy(bitBoard) == bitBoard
+            for symmetry in range(Symmetry.SYMMETRIES):
+                rotated, bitRotated = copy(board), copy(bitBoard)
+                rotated.applySymmetry(symmetry)
+                bitRotated.applySymmetry(symmetry)
+                _checkMasks(bitRotated)
+                assert bitRotated == rotated and bitRotated.winner() == rotated.winner()
+        # take every move back again
+        while bitBoard.history():
+            assert bitBoard.pop() == board.pop()
+            _checkMasks(bitBoard)
+            assert bitBoard == board and bitBoard.winner() == board.winner() and bitBoard.sum() == board.sum()
+            assert bitBoard.isOver() == board.isOver()
+        assert bitBoard == BitBoard(size, k)
+
+
+def testFromKey(size: int = 3) -> None:
+    """
+    Tests that a BitBoard built from a key, including one with blank cells, has the same masks and key as the Board
+    """
+    for key in (0, 1, 3 ** (size * size) - 1, int("12" * (size * size // 2) + "0" * (size * size % 2), 3)):
+        board = Board.fromKey(key, size)
+        bitBoard = BitBoard.fromKey(key, size)
+        _checkMasks(bitBoard)
+        assert bitBoard == board and bitBoard.sum() == board.sum()
+
+
+def testOtherSymbols(size: int = 3) -> None:
+    """
+    Tests that a BitBoard holding symbols other than X and O finds the same winner, sum, and end of game as a Board
+    """
+    for symbol in ("Y", "1"):
+        board = Board(size)
+        bitBoard = BitBoard(size)
+        for cell in range(size):
+            move = Move(0, cell, symbol)
+            assert bitBoard.winner() == board.winner() and bitBoard.isOver() == board.isOver()
+            board.makeMove(move)
+            bitBoard.makeMove(move)
+            _checkMasks(bitBoard)
+            assert bitBoard.sum() == board.sum() and bitBoard == board
+        assert bitBoard.winner() == board.winner() == symbol
+        bitBoard.applySymmetry(1)
+        board.applySymmetry(1)
+        _checkMasks(bitBoard)
+        assert bitBoard == board and bitBoard.winner() == symbol
+
+
+def main():
+    testAgainstBoard()
+    testAgainstBoard(4)
+    testAgainstBoard(5, games=50)
+    testAgainstBoard(5, 4, games=50)
+    testFromKey()
+    testFromKey(4)
+    testOtherSymbols()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,25 +7,79 @@
 from __future__ import annotations
 from copy import copy
 from Move import Move
-from typing import List
+from typing import List, Sequence
 from Transformation import Transformation, Rotation, Reflection, Translation
+import Symmetry
+from Rules import Rules
+from Instrumentation import instruments
 from util import IllegalMoveError
 
 
+# maps each symbol to its digit in Board.canonicalKey
+_DIGITS = str.maketrans({Move.BLANK: "0", Move.CROSS: "1", Move.NOUGHT: "2"})
+# the symbol for each digit in Board.canonicalKey
+_SYMBOLS = (Move.BLANK, Move.CROSS, Move.NOUGHT)
+
+# for each permutation of the cells that Board._permute has seen, with the Rules of the board it was applied to, where
+# each cell goes and which line each line's cells come from (see Rules.lineSource)
+_permutations: dict[tuple[Rules, tuple[int, ...]], tuple[tuple[int, ...], tuple[int, ...] | None]] = dict()
+
+
+def _permutation(rules: Rules, source: Sequence[int]) -> tuple[tuple[int, ...], tuple[int, ...] | None]:
+    """
+    Works out (or looks up) how a permutation of the cells moves each cell and each winning line; every symmetry of
+    the board moves each line onto another line, so line counts can be moved instead of counted again
+    :param rules: the Rules of the board being permuted
+    :param source: source[cell] is the cell whose symbol ends up in cell
+    :return: destination, where destination[cell] is where cell's symbol ends up; and for each line, the line whose
+    symbols end up in it, or None if some line's symbols don't all come from one line
+    """
+    if not isinstance(source, tuple):
+        source = tuple(source)
+    try:
+        return _permutations[(rules, source)]
+    except KeyError:
+        pass
+    destination = [0] * len(source)
+    for cell, origin in enumerate(source):
+        destination[origin] = cell
+    _permutations[(rules, source)] = (tuple(destination), rules.lineSource(source))
+    return _permutations[(rules, source)]
+
+
 class Board:
     # this Board is a _size by _size grid
     _size: int
+    # how many in a row wins, and the winning lines for a board this size with that many in a row
+    _k: int
+    _rules: Rules
     # a list containing the state of each of the _size x _size cells in the board.
     # element 0 is row 1, column 1; the first _size elements form row 1, and each _size elements thereafter are the
     # next row.
     _grid: List[str]
-
-    def __init__(self, size: int = 3):
+    # the cell each move was made in, in the order they were made
+    _history: List[int]
+    # for each winning line (see Rules.lines), how many of its cells hold Move.CROSS and how many hold Move.NOUGHT
+    _crossLines: List[int]
+    _noughtLines: List[int]
+    # the lines through each cell
+    _linesThrough: tuple[tuple[int, ...], ...]
+    # the number of cells that aren't blank, and how many of those hold something other than Move.CROSS or Move.NOUGHT
+    _filled: int
+    _otherCells: int
+    # the symbol with a full line (see _findWinner if both have one), or None if no line is full
+    _winner: str | None
+
+    def __init__(self, size: int = 3, k: int | None = None):
         """
         Creates a new Tic-Tac-Toe Board of the given size
         :param size: the number of cells across the board; defaults to 3 (the usual board size) if not provided.
+        :param k: how many in a row wins; defaults to size (a whole row, column, or diagonal) if not provided.
+        :raises InvalidDimensionsError: if k doesn't fit on the board
         """
         self._size = size
+        self._k = size if k is None else k
+        self._rules = Rules(size, size, self._k)
         self.reset()
 
     def reset(self) -> None:
@@ -33,6 +87,33 @@ class Board:
         Resets the board to an empty state
         """
         self._grid = [Move.BLANK for i in range(self._size * self._size)]
+        self._history = []
+        self._linesThrough = self._rules.allLinesThrough()
+        self._crossLines = [0] * len(self._rules.lines())
+        self._noughtLines = [0] * len(self._rules.lines())
+        self._filled = 0
+        self._otherCells = 0
+        self._winner = None
+
+    @classmethod
+    def fromKey(cls, key: int, size: int, k: int | None = None) -> Board:
+        """
+        Constructs the Board with the given key, as described in canonicalKey
+        :param key: the base 3 encoding of the board
+        :param size: the number of cells across the board
+        :param k: how many in a row wins; defaults to size
+        :return: the Board that key encodes
+        """
+        grid = [Move.BLANK] * (size * size)
+        # the last cell is the least significant digit
+        for cell in range(size * size - 1, -1, -1):
+            key, digit = divmod(key, 3)
+            grid[cell] = _SYMBOLS[digit]
+        board = cls(size, k)
+        board._setGrid(grid)
+        # the key doesn't say what order the moves were made in, so pretend they were made in order
+        board._history = [cell for cell, symbol in enumerate(grid) if symbol != Move.BLANK]
+        return board
 
     def size(self) -> int:
         """
@@ -40,6 +121,25 @@ class Board:
         """
         return self._size
 
+    def k(self) -> int:
+        """
+        :return: how many of the same symbol in a row wins the game on this Board
+        """
+        return self._k
+
+    def rules(self) -> Rules:
+        """
+        :return: the winning lines for this Board
+        """
+        return self._rules
+
+    def history(self) -> tuple[int, ...]:
+        """
+        :return: the cell each move on this board was made in, in the order they were made, counting across each row
+        from the top left; cells move along with their symbols when the board is rotated or reflected
+        """
+        return tuple(self._history)
+
     def legalMove(self, move: Move) -> bool:
         """
         :param move: The move to check
@@ -59,73 +159,89 @@ class Board:
         """
         if self.legalMove(move):
             row, column = move.position()
-            self._grid[column + row * self._size] = move.symbol()
+            cell = column + row * self._size
+            symbol = move.symbol()
+            # a blank "move" (e.g. from Matchbox.fromString filling in every cell) leaves the cell empty, so it isn't
+            # counted or remembered
+            if symbol == Move.BLANK:
+                return
+            self._grid[cell] = symbol
+            self._history.append(cell)
+            self._filled += 1
+            # only the lines through this cell can have changed
+            if symbol == Move.CROSS:
+                counts = self._crossLines
+            elif symbol == Move.NOUGHT:
+                counts = self._noughtLines
+            else:
+                self._otherCells += 1
+                return
+            for line in self._linesThrough[cell]:
+                counts[line] += 1
+                if counts[line] == self._k:
+                    if self._winner is None:
+                        self._winner = symbol
+                    elif self._winner != symbol:
+                        # both symbols have a full line, which can't happen in a game, so fall back to the order
+                        # _scanWinner checks the lines in
+                        self._winner = self._findWinner()
         else:
             raise IllegalMoveError(f"Move {move} is illegal with game state: \n{self}")
 
+    def push(self, move: Move) -> None:
+        """
+        Makes a move that can be taken back with pop; every move is remembered in the history, so this is the same as
+        makeMove, and any move can be taken back no matter how it was made
+        :param move: The Move to make
+        :raises IllegalMoveError: If the move to be made was illegal
+        """
+        self.makeMove(move)
+
+    def pop(self) -> Move:
+        """
+        Takes back the last move made, updating the line counts and the winner in place, so positions can be explored
+        without copying the Board
+        :return: the Move that was taken back
+        :raises IllegalMoveError: If no moves have been made
+        """
+        if not self._history:
+            raise IllegalMoveError(f"There is no move to take back with game state: \n{self}")
+        cell = self._history.pop()
+        symbol = self._grid[cell]
+        self._grid[cell] = Move.BLANK
+        self._filled -= 1
+        if symbol == Move.CROSS or symbol == Move.NOUGHT:
+            self._adjustLines(cell, symbol, -1)
+            # the move may have completed a line; another full line may still be there, but usually none is
+            if self._winner is not None:
+                self._winner = self._findWinner()
+        else:
+            self._otherCells -= 1
+        return Move(cell // self._size, cell % self._size, symbol)
+
     def sum(self) -> int:
         """
         Calculates the number of turns that have been taken on this Board
         :return: The number of non-empty cells on the board (i.e. the number of cells that aren't Move.BLANK)
         """
-        total = 0
-        for symbol in self._grid:
-            if symbol != Move.BLANK:
-                total += 1
-        return total
+        return self._filled
 
     def winner(self) -> str | None:
         """
         Determines if there is a winner of the game
         :return: Which symbol won (one of Move.NOUGHT or Move.CROSS), or None if there is no winner or there's a draw
         """
-        # check for a winner in the rows
-        for row in range(self._size):
-            # if there's a winner, they have to match the first symbol in the row
-            winner = self._grid[row * self._size]
-            won = True
-            # if the first cell is blank, we can skip this row
-            if winner != Move.BLANK:
-                # check each cell in this row to see if it's the same as the first entry
-                for column in range(1, self._size):
-                    won = won and self._grid[column + self._size * row] == winner
-                # if every cell matched, we have a winner
-                if won:
-                    return winner
-
-        # check for a winner in the columns
-        for column in range(self._size):
-            # essentially just the same as above but with the rows and columns flipped
-            winner = self._grid[column]
-            won = True
-            if winner != Move.BLANK:
-                for row in range(1, self._size):
-                    won = won and self._grid[column + self._size * row] == winner
-                if won:
-                    return winner
-
-        # check for a winner in the diagonals
-        # grab the first entry of the diagonal
-        mainDiagonalWinner = self._grid[0]
-        alternateDiagonalWinner = self._grid[(self._size - 1) * self._size]
-        # we can only have won if the first cell isn't blank
-        mainDiagonalWon = mainDiagonalWinner != Move.BLANK
-        alternateDiagonalWon = alternateDiagonalWinner != Move.BLANK
-        # check each of the remaining cells
-        for i in range(1, self._size):
-            # to go from one cell in the main diagonal (top left to bottom right) to the next, add self._size + 1
-            mainDiagonalWon = mainDiagonalWon and self._grid[i * (self._size + 1)] == mainDiagonalWinner
-            # to go from one cell in the alternate diagonal (bottom left to top right) to the next,
-            # subtract self._size - 1
-            alternateDiagonalWon = alternateDiagonalWon and self._grid[(self._size - 1) * self._size -
-                                                                       i * (self._size - 1)] == alternateDiagonalWinner
-        # see if either diagonal won
-        if mainDiagonalWon:
-            return mainDiagonalWinner
-        elif alternateDiagonalWon:
-            return alternateDiagonalWinner
-        # if there was no winner anywhere, there is no winner
-        return None
+        # the line counts only keep track of Move.CROSS and Move.NOUGHT, so other symbols need the whole board checked
+        if self._otherCells:
+            return self._scanWinner()
+        return self._winner
+
+    def _scanWinner(self) -> str | None:
+        """
+        Determines if there is a winner of the game by checking every line on the board, for any symbol
+        :return: Which symbol won, or None if there is no winner or there's a draw
+        """
+        return self._rules.winner(self._grid, Move.BLANK)
 
     def isOver(self) -> bool:
         """
@@ -133,7 +249,7 @@ class Board:
         :return: True if there is a winner or it's a draw, False otherwise
         """
         # a drawn game is over
-        if Move.BLANK not in self._grid:
+        if self._filled == len(self._grid):
             return True
         # if the game isn't drawn, then the game is over if and only if there is a winner
         else:
@@ -144,110 +260,199 @@ class Board:
         Applies the given Transformation to this Board.
         :param t: the Transformation to apply
         """
-        # calculate where each symbol needs to go
-        destinations: list[int] = []
-        for row in range(self._size):
-            for column in range(self._size):
-                # we need to transform from row x column y to coordinate space;
-                # for a 3x3 board, it's (column, 2 - row)
-                x, y = t.transformedPoint((float(column), float(self._size - 1 - row)))
-                # transfer from point space back to row/column space
-                newRow, newColumn = round(self._size - 1 - y), round(x)
-                destinations.append(newColumn + newRow * self._size)
-
-        # convert to cycle form
-        cycles: list[list[int]] = []
-        processed: set[int] = set()
-        for origin, destination in enumerate(destinations):
-            if origin != destination and origin not in processed:
-                cycle = [origin, destination]
-                # while we haven't gotten back to where we started,
-                while destinations[cycle[-1]] != origin:
-                    cycle.append(destinations[cycle[-1]])
-                    processed.add(cycle[-1])
-                cycles.append(cycle)
-            processed.add(origin)
-            processed.add(destination)
-
-        # apply the cycle by using swaps, so self._swap can be overridden to do more things (e.g. update GUI)
-        for cycle in cycles:
-            while len(cycle) > 1:
-                destination = cycle.pop()
-                self._swap(cycle[0], destination)
+        timing = instruments.enabled
+        if timing:
+            start = instruments.clock()
+        # the shared Transformations for each symmetry already have their cells worked out
+        symmetry = Symmetry.symmetryOf(t, self._size)
+        if symmetry is not None:
+            self.applySymmetry(symmetry)
+        else:
+            # calculate where each symbol needs to come from
+            source = [0] * (self._size * self._size)
+            for row in range(self._size):
+                for column in range(self._size):
+                    # we need to transform from row x column y to coordinate space;
+                    # for a 3x3 board, it's (column, 2 - row)
+                    x, y = t.transformedPoint((float(column), float(self._size - 1 - row)))
+                    # transfer from point space back to row/column space
+                    newRow, newColumn = round(self._size - 1 - y), round(x)
+                    source[newColumn + newRow * self._size] = column + row * self._size
+            self._permute(source)
+        if timing:
+            instruments.stop("Board.applyTransformation", start)
+
+    def applySymmetry(self, symmetry: int) -> None:
+        """
+        Rotates or reflects this Board using one of its precomputed symmetries.
+        :param symmetry: the number of the symmetry to apply, as described in Symmetry, or a DihedralTransformation
+        """
+        self._permute(Symmetry.sources(self._size)[symmetry])
+
+    def _permute(self, source: Sequence[int]) -> None:
+        """
+        Moves every symbol on the board at once, so subclasses can override this to move more things (e.g. update GUI)
+        :param source: source[cell] is the cell whose symbol should end up in cell
+        """
+        grid = self._grid
+        destination, lineSource = _permutation(self._rules, source)
+        self._history = [destination[cell] for cell in self._history]
+        if lineSource is None:
+            self._setGrid([grid[i] for i in source])
+            return
+        crossLines = self._crossLines
+        noughtLines = self._noughtLines
+        self._setGrid([grid[i] for i in source],
+                      ([crossLines[line] for line in lineSource], [noughtLines[line] for line in lineSource]))
+
+    def _setGrid(self, grid: List[str], lineCounts: tuple[List[int], List[int]] | None = None) -> None:
+        """
+        Replaces every cell on the board at once, so subclasses can override this to keep track of more things
+        :param grid: the symbol for each cell, in the same order as _grid
+        :param lineCounts: the new counts of Move.CROSS and Move.NOUGHT in each line, if the caller already knows them
+        (e.g. because the cells were only rotated or reflected); otherwise they're counted from grid
+        """
+        self._grid = grid
+        if lineCounts is None:
+            self._countLines()
+            return
+        self._crossLines, self._noughtLines = lineCounts
+        # the same symbols are on the board, so only the order of the lines can affect the winner
+        if self._winner is not None:
+            self._winner = self._findWinner()
+
+    def _countLines(self) -> None:
+        """
+        Recomputes the line counts and the winner from _grid
+        """
+        crossLines = [0] * len(self._crossLines)
+        noughtLines = [0] * len(self._noughtLines)
+        filled = 0
+        otherCells = 0
+        for cell, symbol in enumerate(self._grid):
+            if symbol == Move.BLANK:
+                continue
+            filled += 1
+            if symbol == Move.CROSS:
+                counts = crossLines
+            elif symbol == Move.NOUGHT:
+                counts = noughtLines
+            else:
+                otherCells += 1
+                continue
+            for line in self._linesThrough[cell]:
+                counts[line] += 1
+        self._crossLines = crossLines
+        self._noughtLines = noughtLines
+        self._filled = filled
+        self._otherCells = otherCells
+        self._winner = self._findWinner()
+
+    def _findWinner(self) -> str | None:
+        """
+        Finds a full line from the line counts; since we can't tell which line was filled first, the first one in the
+        order _scanWinner checks them wins
+        :return: the symbol that fills the line, or None if no line is full
+        """
+        crossLines = self._crossLines
+        noughtLines = self._noughtLines
+        k = self._k
+        for line in range(len(crossLines)):
+            if crossLines[line] == k:
+                return Move.CROSS
+            if noughtLines[line] == k:
+                return Move.NOUGHT
+        return None
 
     def _swap(self, pos1: int, pos2: int) -> None:
-        self._grid[pos1], self._grid[pos2] = self._grid[pos2], self._grid[pos1]
+        grid = self._grid
+        first, second = grid[pos1], grid[pos2]
+        grid[pos1], grid[pos2] = second, first
+        self._history = [pos2 if cell == pos1 else pos1 if cell == pos2 else cell for cell in self._history]
+        # move each symbol's line counts along with it
+        self._adjustLines(pos1, first, -1)
+        self._adjustLines(pos2, first, 1)
+        self._adjustLines(pos2, second, -1)
+        self._adjustLines(pos1, second, 1)
+        self._winner = self._findWinner()
+
+    def _adjustLines(self, cell: int, symbol: str, change: int) -> None:
+        """
+        Adds change to the count of symbol in every line through cell; does nothing for symbols other than Move.CROSS
+        and Move.NOUGHT
+        """
+        if symbol == Move.CROSS:
+            counts = self._crossLines
+        elif symbol == Move.NOUGHT:
+            counts = self._noughtLines
+        else:
+            return
+        for line in self._linesThrough[cell]:
+            counts[line] += change
 
-    def transformationTo(self, other: Board) -> Transformation | None:
+    def symmetryTo(self, other: Board) -> int | None:
         """
-        Determines the Transformation that would take this Board to the given Board, if one exists.
+        Determines which of the precomputed symmetries would take this Board to the given Board, if one exists.
         :param other: the Board that we should get to
-        :return: The Transformation that would take us to the Board, or None if no such transformation exists.
+        :return: The number of the symmetry that would take us to the Board, or None if no such symmetry exists.
         """
-        # with the bottom left at (0, 0) and the top right at (size - 1, size - 1), the center is just their midpoint
-        center = ((self._size - 1) / 2, (self._size - 1) / 2)
-        # these transformations are needed for the rotations and reflections
-        translateToOrigin = Translation(-center[0], -center[1])
-        translateBack = Translation(center[0], center[1])
-        # check rotations for equivalence
-        for i in range(4):
-            duplicate = copy(self)
-            pureRotation = Rotation((0, 0), 90 * i)
-            combinedRotation = translateBack * pureRotation * translateToOrigin
-            # check if the rotation would make the board states equivalent
-            duplicate.applyTransformation(combinedRotation)
-            if duplicate == other:
-                return combinedRotation
-
-        # check the reflections
-        for i in range(4):
-            duplicate = copy(self)
-            # to reflect about the right line, we need to move the center to (0, 0), then flip, then move back
-            reflection = Reflection(45 * i)
-            # combine the transformations
-            combinedTransformation = translateBack * reflection * translateToOrigin
-            # apply the transformation
-            duplicate.applyTransformation(combinedTransformation)
-            # check to see if they're the same
-            if duplicate == other:
-                return combinedTransformation
-
-        # if none of the transformations were equivalent, then no transformation exists
+        grid = self._grid
+        for symmetry, source in enumerate(Symmetry.sources(self._size)):
+            if [grid[i] for i in source] == other._grid:
+                return symmetry
         return None
 
+    def stabilizer(self) -> tuple[int, ...]:
+        """
+        :return: the number of each symmetry that leaves this Board exactly the same, always including Symmetry.IDENTITY
+        """
+        grid = self._grid
+        return tuple(symmetry for symmetry, source in enumerate(Symmetry.sources(self._size))
+                     if [grid[i] for i in source] == grid)
+
+    def canonicalKey(self) -> tuple[int, int]:
+        """
+        Encodes this Board as a base 3 integer (blank = 0, Move.CROSS = 1, Move.NOUGHT = 2, with the first cell as the
+        most significant digit) under each of its symmetries, and picks the smallest, so every board that's equivalent
+        to this one up to rotations and reflections gets the same key.
+        :return: the smallest key, and the number of the symmetry that turns this Board into the board with that key
+        """
+        digits = "".join(self._grid).translate(_DIGITS)
+        bestKey = -1
+        bestSymmetry = Symmetry.IDENTITY
+        for symmetry, source in enumerate(Symmetry.sources(self._size)):
+            key = int("".join([digits[i] for i in source]), 3)
+            if key < bestKey or bestKey < 0:
+                bestKey = key
+                bestSymmetry = symmetry
+        return bestKey, bestSymmetry
+
+    def transformationTo(self, other: Board) -> Transformation | None:
+        """
+        Determines the Transformation that would take this Board to the given Board, if one exists.
+        :param other: the Board that we should get to
+        :return: The Transformation that would take us to the Board, or None if no such transformation exists. It's
+        shared with every other caller (see Symmetry.transformation), so it must not be changed.
+        """
+        timing = instruments.enabled
+        if timing:
+            start = instruments.clock()
+        symmetry = self.symmetryTo(other)
+        result = None if symmetry is None else Symmetry.transformation(self._size, symmetry)
+        if timing:
+            instruments.stop("Board.transformationTo", start)
+        return result
+
     def equivalentBoards(self) -> tuple[Board]:
         """
         :return: a tuple of all boards equivalent to this one
         """
         boards: list[Board] = []
-
-        # with the bottom left at (0, 0) and the top right at (size - 1, size - 1), the center is just their midpoint
-        center = ((self._size - 1) / 2, (self._size - 1) / 2)
-        # these transformations are needed for the rotations and reflections
-        translateToOrigin = Translation(-center[0], -center[1])
-        translateBack = Translation(center[0], center[1])
-        # calculate the total 90 degree rotation
-        pureRotation = Rotation((0, 0), 90)
-        combinedRotation = translateBack * pureRotation * translateToOrigin
-        # check rotations for equivalence
-        for i in range(4):
-            # check if the rotation would make the board states equivalent
-            self.applyTransformation(combinedRotation)
-            if self not in boards:
-                boards.append(copy(self))
-
-        # check the reflections
-        for i in range(4):
+        for symmetry in range(Symmetry.SYMMETRIES):
             duplicate = copy(self)
-            # to reflect about the right line, we need to move the center to (0, 0), then flip, then move back
-            reflection = Reflection(45 * i)
-            # combine the transformations
-            combinedTransformation = translateBack * reflection * translateToOrigin
-            # apply the transformation
-            duplicate.applyTransformation(combinedTransformation)
-            # check to see if they're the same
+            duplicate.applySymmetry(symmetry)
             if duplicate not in boards:
-                boards.append(copy(duplicate))
+                boards.append(duplicate)
         return tuple(boards)
 
     def isEquivalentTo(self, other: Board) -> bool:
@@ -257,7 +462,7 @@ class Board:
         :param other: the Board to compare
         :return: True if the boards are equivalent up to symmetry, False otherwise
         """
-        return self.transformationTo(other) is not None
+        return self.symmetryTo(other) is not None
 
     def __eq__(self, other: Board) -> bool:
         """
@@ -279,10 +484,22 @@ class Board:
         """
         :return: An independent copy of the board
         """
-        duplicate = Board(self._size)
-        duplicate._grid = self._grid[:]
+        duplicate = Board(self._size, self._k)
+        self._copyInto(duplicate)
         return duplicate
 
+    def _copyInto(self, duplicate: Board) -> None:
+        """
+        Makes duplicate's cells, history, and line counts independent copies of this Board's
+        """
+        duplicate._grid = self._grid[:]
+        duplicate._history = self._history[:]
+        duplicate._crossLines = self._crossLines[:]
+        duplicate._noughtLines = self._noughtLines[:]
+        duplicate._filled = self._filled
+        duplicate._otherCells = self._otherCells
+        duplicate._winner = self._winner
+
     def __repr__(self) -> str:
         """
         :return: the string representation of this Board
@@ -440,8 +657,58 @@ def testWinner(size: int = 3, verbose: bool = False):
         assert b.winner() == Move.CROSS
 
 
+def testKInARow(size: int = 5, k: int = 4) -> None:
+    """
+    Tests that a Board that only needs k in a row finds short lines anywhere on the board, and that they're still
+    found after the board is rotated
+    :param size: the size of board to test
+    :param k: how many in a row wins
+    """
+    for line in Rules(size, size, k).lines():
+        b = Board(size, k)
+        for cell in line:
+            assert b.winner() is None
+            b.makeMove(Move(cell // size, cell % size, Move.NOUGHT))
+        assert b.winner() == Move.NOUGHT
+        for symmetry in range(Symmetry.SYMMETRIES):
+            rotated = copy(b)
+            rotated.applySymmetry(symmetry)
+            assert rotated.winner() == Move.NOUGHT
+    # k - 1 in a row isn't enough
+    b = Board(size, k)
+    for column in range(k - 1):
+        b.makeMove(Move(0, column, Move.CROSS))
+    assert not b.isOver()
+
+
+def testPushPop(size: int = 3, games: int = 100) -> None:
+    """
+    Tests that pop takes back every move of random games exactly, including the line counts and the winner
+    :param size: the size of board to test
+    :param games: the number of random games to play
+    """
+    from random import Random
+    generator = Random(size)
+    for game in range(games):
+        b = Board(size)
+        cells = list(range(size * size))
+        generator.shuffle(cells)
+        before: list[Board] = []
+        for turn, cell in enumerate(cells):
+            before.append(copy(b))
+            b.push(Move(cell // size, cell % size, (Move.CROSS, Move.NOUGHT)[turn % 2]))
+        for turn in range(len(cells) - 1, -1, -1):
+            b.pop()
+            expected = before[turn]
+            assert b == expected and b.history() == expected.history() and b.winner() == expected.winner()
+            assert b._crossLines == expected._crossLines and b._noughtLines == expected._noughtLines
+            assert b.sum() == expected.sum() and b.isOver() == expected.isOver()
+
+
 def main():
     testTransformations(3, True)
+    testKInARow()
+    testPushPop()
 
 
 if __name__ == "__main__":
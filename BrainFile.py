@@ -0,0 +1,312 @@
+#
+# BrainFile.py
+# 18 October 2026
+#
+
+from __future__ import annotations
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator
+from Board import Board
+from Matchbox import Matchbox
+from util import BrainFormatError
+
+# A binary brain file is laid out as follows, with every number little endian:
+#   header: MAGIC, format version, symbol, length of the name, number of sections, then the name in UTF-8
+#   one section per board size and matchbox symbol: board size, symbol, key width in bytes, number of matchboxes, then
+#   that many records
+#   record: the canonical key of the matchbox's board (big endian, key width bytes), then the beads for each cell as
+#           unsigned 32 bit integers
+# records in a section are sorted by key, and every record in a section is the same width, so a matchbox can be found
+# with a binary search right in the memory-mapped file without reading anything else.
+
+# the first bytes of every binary brain file
+MAGIC = b"\x89MENACE\n"
+# the version of the format written by writeBrain; bump it whenever the layout changes
+VERSION = 1
+# the file extension that MENACE.save uses to pick the binary format
+EXTENSION = ".brain"
+_HEADER = struct.Struct("<8sHcHH")
+_SECTION = struct.Struct("<HcBI")
+# the number of bytes for each bead count
+_BEAD_WIDTH = 4
+
+
+def keyWidth(size: int) -> int:
+    """
+    :param size: the number of cells across the board
+    :return: the number of bytes needed to hold any canonical key for a board of the given size
+    """
+    return max(1, ((3 ** (size * size) - 1).bit_length() + 7) // 8)
+
+
+def isBinaryBrain(filename: str) -> bool:
+    """
+    :param filename: the file to check
+    :return: True if the file starts like a binary brain, False otherwise
+    :raises FileNotFoundError: if the file doesn't exist
+    """
+    with open(filename, "rb") as infile:
+        return infile.read(len(MAGIC)) == MAGIC
+
+
+def writeBrain(filename: str, name: str, symbol: str, matchboxes: Iterable[tuple[int, Matchbox]]) -> None:
+    """
+    Saves the given matchboxes in the binary format. The file is written next to the destination and then moved into
+    place, so a brain that's currently memory-mapped by a BrainReader can be overwritten safely.
+    :param filename: the file to write to
+    :param name: the name of the MENACE the matchboxes belong to
+    :param symbol: the symbol that MENACE plays
+    :param matchboxes: every matchbox to save, each with the canonical key of its board (e.g. from
+    MatchboxIndex.items), so the keys don't have to be worked out again
+    """
+    # group the records by board size and symbol, keyed by the canonical keys so they can be sorted
+    sections: dict[tuple[int, str], dict[int, bytes]] = dict()
+    for key, matchbox in matchboxes:
+        beads = array("I", matchbox.beads())
+        if sys.byteorder == "big":
+            beads.byteswap()
+        size = matchbox.size()
+        sections.setdefault((size, matchbox.symbol()), dict())[key] = key.to_bytes(keyWidth(size), "big") + beads.tobytes()
+
+    encodedName = name.encode("utf-8")
+    temporary = filename + ".tmp"
+    with open(temporary, "wb") as outfile:
+        outfile.write(_HEADER.pack(MAGIC, VERSION, symbol.encode("ascii"), len(encodedName), len(sections)))
+        outfile.write(encodedName)
+        for size, matchboxSymbol in sorted(sections):
+            records = sections[(size, matchboxSymbol)]
+            outfile.write(_SECTION.pack(size, matchboxSymbol.encode("ascii"), keyWidth(size), len(records)))
+            for key in sorted(records):
+                outfile.write(records[key])
+    os.replace(temporary, filename)
+
+
+class BrainReader:
+    """
+    Reads matchboxes out of a memory-mapped binary brain one at a time, as they're needed
+    """
+    # the name and symbol of the MENACE the brain belongs to
+    _name: str
+    _symbol: str
+    # the open file and its memory map; None once closed
+    _file: object | None
+    _map: mmap.mmap | None
+    # for each board size and symbol: where the section's records start, how many records there are, the key width,
+    # and the width of each record, all in bytes
+    _sections: dict[tuple[int, str], tuple[int, int, int, int]]
+
+    def __init__(self, filename: str):
+        """
+        Opens and memory-maps the given brain, reading only its header
+        :param filename: the binary brain to read
+        :raises BrainFormatError: if the file isn't a binary brain this version can read
+        """
+        self._map = None
+        self._file = open(filename, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._readHeader(filename)
+        except (ValueError, struct.error, UnicodeDecodeError) as error:
+            self.close()
+            raise BrainFormatError(f"{filename} is not a valid binary brain: {error}") from None
+        except BrainFormatError:
+            self.close()
+            raise
+
+    def _readHeader(self, filename: str) -> None:
+        """
+        Reads the header and the location of each section
+        :param filename: the name of the file, for error messages
+        """
+        magic, version, symbol, nameLength, sectionCount = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise BrainFormatError(f"{filename} is not a binary brain")
+        if version != VERSION:
+            raise BrainFormatError(f"{filename} is version {version}, but only version {VERSION} can be read")
+        offset = _HEADER.size
+        self._name = self._map[offset:offset + nameLength].decode("utf-8")
+        self._symbol = symbol.decode("ascii")
+        offset += nameLength
+        self._sections = dict()
+        for i in range(sectionCount):
+            size, matchboxSymbol, width, count = _SECTION.unpack_from(self._map, offset)
+            offset += _SECTION.size
+            recordWidth = width + size * size * _BEAD_WIDTH
+            self._sections[(size, matchboxSymbol.decode("ascii"))] = (offset, count, width, recordWidth)
+            offset += count * recordWidth
+        if offset > len(self._map):
+            raise BrainFormatError(f"{filename} is truncated")
+
+    def name(self) -> str:
+        """
+        :return: the name of the MENACE this brain belongs to
+        """
+        return self._name
+
+    def symbol(self) -> str:
+        """
+        :return: the symbol the MENACE this brain belongs to plays
+        """
+        return self._symbol
+
+    def find(self, key: int, size: int, symbol: str) -> Matchbox | None:
+        """
+        Loads the matchbox for the given canonical key, if the brain has one
+        :param key: the canonical key of the board to find (see Board.canonicalKey)
+        :param size: the size of the board
+        :param symbol: the symbol the matchbox plays
+        :return: the Matchbox, or None if the brain doesn't have one for that board
+        """
+        if self._map is None or (size, symbol) not in self._sections:
+            return None
+        start, count, width, recordWidth = self._sections[(size, symbol)]
+        if key.bit_length() > width * 8:
+            return None
+        target = key.to_bytes(width, "big")
+        # since the keys are big endian and fixed width, comparing the bytes compares the keys
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            offset = start + middle * recordWidth
+            found = self._map[offset:offset + width]
+            if found < target:
+                low = middle + 1
+            elif found > target:
+                high = middle
+            else:
+                return self._matchboxAt(offset, size, symbol, key, width, recordWidth)
+        return None
+
+    def _matchboxAt(self, offset: int, size: int, symbol: str, key: int, width: int, recordWidth: int) -> Matchbox:
+        """
+        Builds the Matchbox for the record at the given offset
+        :return: the Matchbox for the record
+        """
+        beads = array("I")
+        beads.frombytes(self._map[offset + width:offset + recordWidth])
+        if sys.byteorder == "big":
+            beads.byteswap()
+        return Matchbox.fromBeads(Board.fromKey(key, size), symbol, beads)
+
+    def __iter__(self) -> Iterator[tuple[int, Matchbox]]:
+        """
+        :return: every matchbox in the brain, loading each one, along with the canonical key of its board
+        """
+        if self._map is None:
+            return
+        for (size, symbol), (start, count, width, recordWidth) in self._sections.items():
+            for i in range(count):
+                offset = start + i * recordWidth
+                key = int.from_bytes(self._map[offset:offset + width], "big")
+                yield key, self._matchboxAt(offset, size, symbol, key, width, recordWidth)
+
+    def __len__(self) -> int:
+        """
+        :return: the number of matchboxes in the brain
+        """
+        return sum(count for start, count, width, recordWidth in self._sections.values())
+
+    def close(self) -> None:
+        """
+        Unmaps and closes the file; no more matchboxes can be loaded afterwards
+        """
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def convert(textFile: str, binaryFile: str | None = None) -> None:
+    """
+    Converts a MENACE saved in the text format to the binary format
+    :param textFile: the text file to read
+    :param binaryFile: the file to write; defaults to textFile with its extension replaced by EXTENSION
+    """
+    from MENACE import MENACE
+    if binaryFile is None:
+        binaryFile = os.path.splitext(textFile)[0] + EXTENSION
+    MENACE.fromFile(textFile).save(binaryFile)
+
+
+def testRoundTrip(size: int = 3) -> None:
+    """
+    Tests that a MENACE saved as text, converted to a binary brain, and loaded again (lazily or not) finds every
+    matchbox with the same beads, and that a brain can be saved over while it's still memory-mapped
+    :param size: the size of board to test
+    """
+    import tempfile
+    from MENACE import MENACE, _playedMenace, _checkLookups
+    original = _playedMenace(size)
+    with tempfile.TemporaryDirectory() as directory:
+        textFile = os.path.join(directory, "brain.txt")
+        original.save(textFile)
+        convert(textFile)
+        binaryFile = os.path.join(directory, "brain" + EXTENSION)
+        assert isBinaryBrain(binaryFile) and not isBinaryBrain(textFile)
+        for lazy in (True, False):
+            loaded = MENACE.fromBinary(binaryFile, lazy)
+            assert loaded.name() == original.name() and loaded.symbol() == original.symbol()
+            _checkLookups(original, loaded)
+        # loaded is still reading the old file, which the new one replaces
+        lazy = MENACE.fromBinary(binaryFile)
+        MENACE("Other").save(binaryFile)
+        _checkLookups(original, lazy)
+        assert len(list(MENACE.fromFile(binaryFile).matchboxes())) == 0
+
+
+def testReader() -> None:
+    """
+    Tests that a BrainReader finds exactly the matchboxes it was given, and rejects files that aren't binary brains
+    """
+    import tempfile
+    from MENACE import _playedMenace
+    matchboxes = list(_playedMenace().matchboxes())
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "brain" + EXTENSION)
+        writeBrain(filename, "Test", "X", ((box.canonicalKey()[0], box) for box in matchboxes))
+        reader = BrainReader(filename)
+        assert len(reader) == len(matchboxes) and reader.name() == "Test" and reader.symbol() == "X"
+        keys = set()
+        for matchbox in matchboxes:
+            key = matchbox.canonicalKey()[0]
+            keys.add(key)
+            found = reader.find(key, matchbox.size(), matchbox.symbol())
+            assert list(found.beads()) == list(matchbox.beads())
+        missing = next(key for key in range(3 ** 9) if key not in keys)
+        assert reader.find(missing, 3, "X") is None
+        assert reader.find(0, 3, "O") is None and reader.find(0, 4, "X") is None
+        assert reader.find(3 ** 25, 3, "X") is None
+        assert sorted(key for key, box in reader) == sorted(keys)
+        assert all(box.canonicalKey()[0] == key for key, box in reader)
+        reader.close()
+        assert reader.find(0, 3, "X") is None
+        for contents in (b"", b"MENACE 1", MAGIC + b"\x02\x00"):
+            with open(filename, "wb") as outfile:
+                outfile.write(contents)
+            try:
+                BrainReader(filename)
+            except BrainFormatError:
+                pass
+            else:
+                raise AssertionError(f"{contents} isn't a binary brain")
+
+
+def main():
+    if len(sys.argv) == 1:
+        testReader()
+        testRoundTrip(3)
+        testRoundTrip(4)
+    elif len(sys.argv) in (2, 3):
+        convert(*sys.argv[1:])
+    else:
+        print(f"usage: python {sys.argv[0]} [textFile [binaryFile]]")
+
+
+if __name__ == "__main__":
+    main()
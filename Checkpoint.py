@@ -0,0 +1,165 @@
+#
+# Checkpoint.py
+# 18 October 2026
+#
+
+from __future__ import annotations
+from time import monotonic
+from MENACE import MENACE
+
+
+class CheckpointPolicy:
+    """
+    Decides how often a MENACE that's being trained should be checkpointed (see MENACE.checkpoint), and how many
+    checkpoints can pile up in the journal before it's compacted with a full save.
+    """
+    # checkpoint after this many games, or never count games if None
+    _everyGames: int | None
+    # checkpoint after this many seconds, or never check the time if None
+    _everySeconds: float | None
+    # do a full save instead of every compactEvery-th checkpoint, or never compact if None
+    _compactEvery: int | None
+
+    def __init__(self, everyGames: int | None = 1, everySeconds: float | None = None, compactEvery: int | None = 100):
+        """
+        :param everyGames: the number of games between checkpoints; defaults to 1. None to ignore the number of games
+        :param everySeconds: the number of seconds between checkpoints; None (the default) to ignore the time
+        :param compactEvery: the number of checkpoints between full saves; defaults to 100. None to only do a full save
+        when training finishes
+        """
+        self._everyGames = everyGames
+        self._everySeconds = everySeconds
+        self._compactEvery = compactEvery
+
+    def checkpointDue(self, games: int, seconds: float) -> bool:
+        """
+        :param games: the number of games played since the last checkpoint
+        :param seconds: the number of seconds since the last checkpoint
+        :return: True if it's time for another checkpoint, False otherwise
+        """
+        return (self._everyGames is not None and games >= self._everyGames) or \
+            (self._everySeconds is not None and seconds >= self._everySeconds)
+
+    def compactionDue(self, checkpoints: int) -> bool:
+        """
+        :param checkpoints: the number of checkpoints in the journal, including the one about to be made
+        :return: True if the journal should be compacted into a full save instead, False otherwise
+        """
+        return self._compactEvery is not None and checkpoints >= self._compactEvery
+
+
+class Checkpointer:
+    """
+    Checkpoints one MENACE to one file as it's trained, following a CheckpointPolicy.
+    """
+    _menace: MENACE
+    _filename: str
+    _policy: CheckpointPolicy
+    # the number of games played since the last checkpoint
+    _games: int
+    # when the last checkpoint happened, from time.monotonic
+    _lastCheckpoint: float
+    # the number of checkpoints in the journal since the last full save
+    _checkpoints: int
+
+    def __init__(self, menace: MENACE, filename: str, policy: CheckpointPolicy | None = None):
+        """
+        :param menace: the MENACE to checkpoint
+        :param filename: the file the MENACE is saved to
+        :param policy: how often to checkpoint; defaults to CheckpointPolicy()
+        """
+        self._menace = menace
+        self._filename = filename
+        self._policy = policy if policy is not None else CheckpointPolicy()
+        self._games = 0
+        self._lastCheckpoint = monotonic()
+        self._checkpoints = 0
+
+    def gameFinished(self, games: int = 1) -> None:
+        """
+        Lets the Checkpointer know the MENACE finished learning from a game, and checkpoints it if the policy says to
+        :param games: the number of games that finished; defaults to 1
+        """
+        self._games += games
+        if self._policy.checkpointDue(self._games, monotonic() - self._lastCheckpoint):
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """
+        Checkpoints the MENACE now, compacting the journal with a full save if the policy says to
+        """
+        if self._policy.compactionDue(self._checkpoints + 1):
+            self._menace.save(self._filename)
+            self._checkpoints = 0
+        else:
+            self._menace.checkpoint(self._filename)
+            self._checkpoints += 1
+        self._games = 0
+        self._lastCheckpoint = monotonic()
+
+    def close(self) -> None:
+        """
+        Does a full save of the MENACE, compacting the journal; call when training finishes
+        """
+        self._menace.save(self._filename)
+        self._games = 0
+        self._checkpoints = 0
+        self._lastCheckpoint = monotonic()
+
+
+def testPolicy() -> None:
+    """
+    Tests that CheckpointPolicy counts games and seconds, and compacts on every compactEvery-th checkpoint
+    """
+    policy = CheckpointPolicy(everyGames=10, everySeconds=None, compactEvery=3)
+    assert not policy.checkpointDue(9, 1e9) and policy.checkpointDue(10, 0)
+    assert not policy.compactionDue(2) and policy.compactionDue(3)
+    policy = CheckpointPolicy(everyGames=None, everySeconds=5, compactEvery=None)
+    assert not policy.checkpointDue(10 ** 9, 4.9) and policy.checkpointDue(0, 5)
+    assert not policy.compactionDue(10 ** 9)
+
+
+def testReplay(extension: str = ".txt") -> None:
+    """
+    Tests that a MENACE loaded after training stopped without a full save, i.e. from its last full save plus the
+    checkpoints in the journal since then, matches the MENACE as of its last checkpoint
+    :param extension: the extension of the file to save to, which picks the format of the full saves
+    """
+    import os
+    import random
+    import tempfile
+    from Game import Game
+    from MENACE import JOURNAL_EXTENSION, _checkLookups
+    random.seed(0)
+    players = (MENACE("Test 1"), MENACE("Test 2"))
+    game = Game(players[0], players[1])
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "brain" + extension)
+        checkpointer = Checkpointer(players[0], filename, CheckpointPolicy(everyGames=10, compactEvery=5))
+        # 7 checkpoints: the 5th is a full save, so the journal has the last 2
+        for i in range(70):
+            winner = game.playGame(None)
+            for player in players:
+                player.learn(winner)
+            checkpointer.gameFinished()
+        assert os.path.exists(filename + JOURNAL_EXTENSION)
+        _checkLookups(players[0], MENACE.fromFile(filename))
+        # games after the last checkpoint aren't saved until close
+        for i in range(5):
+            winner = game.playGame(None)
+            for player in players:
+                player.learn(winner)
+            checkpointer.gameFinished()
+        checkpointer.close()
+        assert not os.path.exists(filename + JOURNAL_EXTENSION)
+        _checkLookups(players[0], MENACE.fromFile(filename))
+
+
+def main():
+    testPolicy()
+    testReplay(".txt")
+    testReplay(".brain")
+
+
+if __name__ == "__main__":
+    main()
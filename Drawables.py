@@ -5,6 +5,7 @@
 #
 
 from __future__ import annotations
+from typing import Sequence
 from graphics import *
 from Move import Move
 from Board import Board
@@ -12,6 +13,7 @@ from Player import Player
 from MENACE import MENACE
 from Human import Human
 from Game import Game
+from Checkpoint import CheckpointPolicy, Checkpointer
 
 class Button:
     """
@@ -112,10 +114,21 @@ class BoardUI(Board):
         row, column = move.position()
         self._cells[column + self._size * row].setText(move.symbol())
 
+    def pop(self) -> Move:
+        move = super().pop()
+        row, column = move.position()
+        self._cells[column + self._size * row].setText("")
+        return move
+
     def _swap(self, pos1: int, pos2: int) -> None:
         super()._swap(pos1, pos2)
         self._cells[pos1], self._cells[pos2] = self._cells[pos2], self._cells[pos1]
 
+    def _permute(self, source: Sequence[int]) -> None:
+        super()._permute(source)
+        cells = self._cells
+        self._cells = [cells[i] for i in source]
+
 
     def moveFromClick(self, click: Point, symbol: str) -> Move | None:
         # how much space is between cells
@@ -243,8 +256,15 @@ class GameUI(Game):
     _playAgain: Button
     _returnToMenu: Button
     _train: SwitchButton
+    # how often MENACE players are checkpointed, and their Checkpointers for the current game
+    _checkpointPolicy: CheckpointPolicy
+    _checkpointers: list[Checkpointer]
 
-    def __init__(self):
+    def __init__(self, checkpointPolicy: CheckpointPolicy | None = None):
+        """
+        :param checkpointPolicy: how often to checkpoint MENACE players; defaults to after every game, with a full save
+        every 100 games
+        """
         # call super's init here to make PyCharm happy; it will be called again from startGame
         super().__init__(Player(), Player(), 1)
         self._window = GraphWin("MENACE", 800, 600)
@@ -262,6 +282,8 @@ class GameUI(Game):
         self._playAgain = Button(Point(400 - 100, 500), 145, 50, "Play Again")
         self._returnToMenu = Button(Point(400 + 100, 500), 200, 50, "Return to Setup")
         self._train = SwitchButton(Point(400, 550), 250, 35, ["Train", "Press ESC to Stop"])
+        self._checkpointPolicy = checkpointPolicy if checkpointPolicy is not None else CheckpointPolicy()
+        self._checkpointers = []
 
     def winner(self) -> str:
         winner = self._board.winner()
@@ -332,6 +354,10 @@ class GameUI(Game):
 
         self._teachPlayers(results)
     def _returnToSetup(self) -> None:
+        # fold each MENACE's journal back into its file before it can be loaded again
+        for checkpointer in self._checkpointers:
+            checkpointer.close()
+        self._checkpointers = []
         self._board.undraw()
         self._errorMessage.setText("")
 
@@ -340,11 +366,11 @@ class GameUI(Game):
             # i'm not sure how to convince PyCharm that players[0] is a MENACE
             player: MENACE = self._players[0]
             player.learn(results)
-            player.save(player.name() + ".txt")
         if isinstance(self._players[1], MENACE):
             player: MENACE = self._players[1]
             player.learn(results)
-            player.save(player.name() + ".txt")
+        for checkpointer in self._checkpointers:
+            checkpointer.gameFinished()
 
     def _setupGame(self) -> None:
         """
@@ -419,3 +445,5 @@ class GameUI(Game):
         boardY = self._window.getHeight() / 2 - 25
         self._board = BoardUI(Point(boardX, boardY), int(min(boardX, boardY)), boardSize)
         self._board.draw(self._window)
+        self._checkpointers = [Checkpointer(player, player.name() + ".txt", self._checkpointPolicy)
+                               for player in players if isinstance(player, MENACE)]
@@ -4,10 +4,15 @@
 # 13 October 2022
 #
 
+from __future__ import annotations
+from typing import TextIO
 from Board import Board
+from BitBoard import BitBoard
 from Player import Player
 from Human import Human
 from Move import Move
+from GameRecord import GameRecord, GameRecordWriter
+from Instrumentation import instruments
 
 class Game:
     # the Board this game is played on
@@ -15,45 +20,66 @@ class Game:
     # the two players; tuple so alternating turns can be more efficient
     _players: tuple[Player, Player]
 
-    def __init__(self, player1: Player, player2: Player, size: int = 3):
+    def __init__(self, player1: Player, player2: Player, size: int = 3, k: int | None = None):
         """
         Makes a new game with the two given players
         :param player1: The player that will go first; this player will be given X
         :param player2: The player that will go second; this player will be given O
         :param size: The size of Tic-Tac-Toe board to play on, where the board is a size by size grid; defaults to 3.
+        :param k: How many in a row wins; defaults to size.
         """
-        self._board = Board(size)
+        self._board = BitBoard(size, k)
         player1.setSymbol(Move.CROSS)
         player2.setSymbol(Move.NOUGHT)
         self._players = (player1, player2)
 
-    def playGame(self, logfile: str | None = "gameLogs.txt") -> str | None:
+    def playGame(self, logfile: str | TextIO | GameRecordWriter | None = "gameLogs.txt") -> str | None:
         """
         Plays one game with the given players.
         :param logfile: the text file to print logs to; defaults to gameLogs.txt. if None is provided, no logs will be
-        printed.
+        printed. An already open file (or anything else with a write method) can also be provided, in which case the
+        whole game is written with a single call to write. If a GameRecordWriter is provided, a compact GameRecord of
+        the game is written instead of the text logs.
         :return: The symbol that won (one of Board.NOUGHT or Board.CROSS), or None if it was a draw
         """
-        logs: list[str] = [f"{self._players[0]}; {self._players[1]}"]
+        timing = instruments.enabled
+        if timing:
+            start = instruments.clock()
+        # a record only needs the moves, which the board keeps track of anyway
+        recording = isinstance(logfile, GameRecordWriter)
+        # only build the logs if they'll be printed somewhere
+        logging = logfile is not None and not recording
+        if logging:
+            logs: list[str] = [f"{self._players[0]}; {self._players[1]}"]
         self._board.reset()
         turns = 0
         while not self._board.isOver():
-            logs.append(str(self._board))
+            if logging:
+                logs.append(str(self._board))
             self._players[turns % 2].makeMove(self._board)
             turns += 1
-        logs.append(str(self._board))
         # if isinstance(self._players[0], Human) or isinstance(self._players[1], Human):
         #     print(self._board)
         winner = self._board.winner()
-        if winner is not None:
-            # print(f"{self._players[turns % 2 - 1].name()} won playing {winner} in {turns} turns!")
-            logs.append(f"{self._players[turns % 2 - 1].name()} won playing {winner} in {turns} turns!")
-        else:
-            # print(f"Draw in {turns} turns!")
-            logs.append(f"Draw in {turns} turns!")
-        if logfile is not None:
-            with open(logfile, "a") as outfile:
-                print("\n".join(logs), file=outfile)
+        if recording:
+            logfile.writeRecord(GameRecord(self._players[0].name(), self._players[1].name(), self._board.size(),
+                                           self._board.history(), winner, self._board.k()))
+        if logging:
+            logs.append(str(self._board))
+            if winner is not None:
+                # print(f"{self._players[turns % 2 - 1].name()} won playing {winner} in {turns} turns!")
+                logs.append(f"{self._players[turns % 2 - 1].name()} won playing {winner} in {turns} turns!")
+            else:
+                # print(f"Draw in {turns} turns!")
+                logs.append(f"Draw in {turns} turns!")
+            text = "\n".join(logs) + "\n"
+            if isinstance(logfile, str):
+                with open(logfile, "a") as outfile:
+                    outfile.write(text)
+            else:
+                logfile.write(text)
         # else:
             # print(logs)
+        if timing:
+            instruments.stop("Game.playGame", start)
         return winner
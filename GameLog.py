@@ -0,0 +1,294 @@
+#
+# GameLog.py
+# 18 October 2026
+#
+
+from __future__ import annotations
+import bz2
+import gzip
+import lzma
+import os
+import threading
+from queue import SimpleQueue, Empty
+from typing import BinaryIO, TextIO
+
+# the modules that can open each kind of compressed file, keyed by the name of the compression and by file extension
+COMPRESSIONS = {"gzip": gzip, "bz2": bz2, "lzma": lzma}
+EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "lzma", ".lzma": "lzma"}
+
+
+def openLog(filename: str, mode: str = "rt") -> TextIO | BinaryIO:
+    """
+    Opens a log file, decompressing it if its extension says it's compressed
+    :param filename: the file to open
+    :param mode: the mode to open it with; defaults to reading text
+    :return: the open file
+    """
+    compression = EXTENSIONS.get(os.path.splitext(filename)[1])
+    if compression is None:
+        return open(filename, mode.replace("t", ""))
+    return COMPRESSIONS[compression].open(filename, mode)
+
+
+class GameLogWriter:
+    """
+    Writes game logs to a file that stays open across games. Game.playGame hands it one whole game at a time through
+    write, which only queues the game; a background thread does the writing, so games never wait for the disk. The
+    file can be compressed, and once it has enough bytes or games in it, the writer moves on to a new numbered file.
+    """
+    # the first file to write to; later files are numbered (see files)
+    _filename: str
+    # the module that opens the files, or None if they aren't compressed
+    _opener: object | None
+    # start a new file once the current one has this many bytes (before compression) or games, or never if None
+    _maxBytes: int | None
+    _maxGames: int | None
+    # write queued games to the file at least this often, in seconds
+    _flushInterval: float
+    # the games waiting to be written; None asks the thread to stop, and an Event asks it to flush and set the event
+    _queue: SimpleQueue
+    _thread: threading.Thread
+    # the files written to so far, the open file, and how much has been written to it
+    _files: list[str]
+    _file: TextIO | BinaryIO | None
+    _bytes: int
+    _games: int
+    # an error from the background thread, raised again by the next call to write, flush, or close
+    _error: BaseException | None
+    # whether the files hold bytes rather than text; subclasses that write binary logs set this to True
+    _binary: bool = False
+
+    def __init__(self, filename: str, compression: str | None = None, maxBytes: int | None = None,
+                 maxGames: int | None = None, flushInterval: float = 1.0):
+        """
+        :param filename: the file to append logs to
+        :param compression: one of "gzip", "bz2", or "lzma"; defaults to guessing from filename's extension, with no
+        compression for anything else
+        :param maxBytes: start a new file once the current one has this many bytes of logs, before compression;
+        defaults to never
+        :param maxGames: start a new file once the current one has this many games; defaults to never
+        :param flushInterval: how often to write queued games to the file, in seconds; defaults to 1
+        """
+        if compression is None:
+            compression = EXTENSIONS.get(os.path.splitext(filename)[1])
+        self._filename = filename
+        self._opener = COMPRESSIONS[compression] if compression is not None else None
+        self._maxBytes = maxBytes
+        self._maxGames = maxGames
+        self._flushInterval = flushInterval
+        self._queue = SimpleQueue()
+        self._files = []
+        self._file = None
+        self._bytes = 0
+        self._games = 0
+        self._error = None
+        self._open(filename)
+        self._thread = threading.Thread(target=self._run, name=f"GameLogWriter({filename})", daemon=True)
+        self._thread.start()
+
+    def write(self, text: str | bytes) -> None:
+        """
+        Queues the logs for one game to be written
+        :param text: the logs for the game; bytes if this writer writes binary logs
+        :raises ValueError: if the writer has been closed
+        """
+        self._raiseError()
+        self._checkOpen()
+        self._queue.put(text)
+
+    def flush(self) -> None:
+        """
+        Waits until every game queued so far is written to the file
+        :raises ValueError: if the writer has been closed
+        """
+        self._raiseError()
+        self._checkOpen()
+        done = threading.Event()
+        self._queue.put(done)
+        # stop waiting if the thread stops without getting to the event, e.g. if close is called at the same time
+        while not done.wait(self._flushInterval):
+            if not self._thread.is_alive():
+                break
+        self._raiseError()
+
+    def close(self) -> None:
+        """
+        Writes every queued game, closes the file, and stops the background thread
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._raiseError()
+
+    def files(self) -> list[str]:
+        """
+        :return: every file written to, in order; after the first, each is numbered, e.g. gameLogs.1.txt
+        """
+        return list(self._files)
+
+    def __enter__(self) -> GameLogWriter:
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+    def _checkOpen(self) -> None:
+        if not self._thread.is_alive():
+            raise ValueError(f"{self._filename} has already been closed")
+
+    def _raiseError(self) -> None:
+        if self._error is not None:
+            error = self._error
+            self._error = None
+            raise error
+
+    def _open(self, filename: str) -> None:
+        """
+        Opens the given file for appending and makes it the current file
+        """
+        if self._opener is not None:
+            self._file = self._opener.open(filename, "ab" if self._binary else "at")
+        else:
+            self._file = open(filename, "ab" if self._binary else "a")
+        self._files.append(filename)
+        self._bytes = 0
+        self._games = 0
+
+    def _rotate(self) -> None:
+        """
+        Closes the current file and opens the next numbered one that doesn't exist yet
+        """
+        self._file.close()
+        # put the number before the extensions, so e.g. gameLogs.txt.gz becomes gameLogs.1.txt.gz
+        directory, name = os.path.split(self._filename)
+        stem, dot, extensions = name.partition(".")
+        number = len(self._files)
+        while True:
+            filename = os.path.join(directory, f"{stem}.{number}{dot}{extensions}")
+            if not os.path.exists(filename):
+                break
+            number += 1
+        self._open(filename)
+
+    def _run(self) -> None:
+        """
+        Writes queued games until asked to stop; runs on the background thread
+        """
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self._flushInterval)
+            except Empty:
+                # nothing was queued for a while, so make sure what's been written so far reaches the disk
+                self._flushFile()
+                continue
+            waiting: list[threading.Event] = []
+            # take everything that's queued so it can be written all at once
+            while True:
+                if item is None:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiting.append(item)
+                else:
+                    self._writeGame(item)
+                if self._queue.empty():
+                    break
+                item = self._queue.get()
+            if waiting or stopping:
+                self._flushFile()
+            for event in waiting:
+                event.set()
+        try:
+            self._file.close()
+        except BaseException as error:
+            self._error = error
+
+    def _writeGame(self, text: str | bytes) -> None:
+        """
+        Writes one game to the current file, moving on to the next file first if the current one is full
+        """
+        if self._error is not None:
+            return
+        try:
+            if (self._maxBytes is not None and self._bytes >= self._maxBytes) or \
+                    (self._maxGames is not None and self._games >= self._maxGames):
+                self._rotate()
+            self._file.write(text)
+            # maxBytes counts bytes, which text files may have more of than characters
+            self._bytes += len(text.encode(self._file.encoding)) if isinstance(text, str) else len(text)
+            self._games += 1
+        except BaseException as error:
+            self._error = error
+
+    def _flushFile(self) -> None:
+        if self._error is not None:
+            return
+        try:
+            self._file.flush()
+        except BaseException as error:
+            self._error = error
+
+
+def testWriter(compression: str | None = None) -> None:
+    """
+    Tests that a GameLogWriter writes every game in order, moving on to new files when asked, and refuses to write or
+    flush once it's closed
+    :param compression: the compression to test, or None for plain text
+    """
+    import tempfile
+    extension = {None: "", "gzip": ".gz", "bz2": ".bz2", "lzma": ".xz"}[compression]
+    games = [f"Game {i}\nX wins\n" for i in range(25)]
+    with tempfile.TemporaryDirectory() as directory:
+        writer = GameLogWriter(os.path.join(directory, "gameLogs.txt" + extension), maxGames=10)
+        for game in games[:5]:
+            writer.write(game)
+        writer.flush()
+        for game in games[5:]:
+            writer.write(game)
+        writer.close()
+        files = writer.files()
+        assert len(files) == 3
+        text = ""
+        for filename in files:
+            with openLog(filename) as file:
+                text += file.read()
+        assert text == "".join(games)
+        for method, arguments in ((writer.write, (games[0],)), (writer.flush, ())):
+            try:
+                method(*arguments)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"{method.__name__} after close should raise ValueError")
+        # closing again does nothing
+        writer.close()
+
+
+def testMaxBytes() -> None:
+    """
+    Tests that maxBytes counts the bytes written rather than the characters, so each full file holds at most that
+    many bytes
+    """
+    import locale
+    import tempfile
+    game = "Game \u00bd\nX wins \u2014 in 3 moves\n"
+    # the encoding text files are written in
+    gameBytes = len(game.encode(locale.getpreferredencoding(False)))
+    with tempfile.TemporaryDirectory() as directory:
+        writer = GameLogWriter(os.path.join(directory, "gameLogs.txt"), maxBytes=2 * gameBytes)
+        for i in range(6):
+            writer.write(game)
+        writer.close()
+        files = writer.files()
+        assert [os.path.getsize(filename) for filename in files] == [gameBytes * 2] * 3, "each file holds 2 games"
+
+
+def main():
+    testWriter()
+    testMaxBytes()
+    for compression in COMPRESSIONS:
+        testWriter(compression)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+#
+# GameRecord.py
+# 18 October 2026
+#
+
+from __future__ import annotations
+import lzma
+from copy import copy
+import os
+from typing import BinaryIO, Iterator, Sequence
+from Board import Board
+from BitBoard import BitBoard
+from Move import Move
+from GameLog import GameLogWriter, openLog, EXTENSIONS
+from util import GameRecordError
+
+# the first bytes of every game record file, followed by one byte for the version of the format
+MAGIC = b"\x89MGAMES\n"
+VERSION = 1
+# the extension for game record files, before any extension for compression (e.g. gameLogs.games.gz)
+EXTENSION = ".games"
+
+# the result of a game is stored as the same digit Board.canonicalKey uses for the symbol that won, with 0 for a draw
+_RESULTS = (None, Move.CROSS, Move.NOUGHT)
+
+# the first player always plays X and the second always plays O, the same as in Game
+_SYMBOLS = (Move.CROSS, Move.NOUGHT)
+
+
+def encodeVarint(value: int) -> bytes:
+    """
+    Encodes a non-negative integer 7 bits at a time, least significant bits first, with the high bit of each byte set
+    if more bytes follow; small numbers (like every cell on boards up to 11x11) take a single byte
+    :param value: the integer to encode
+    :return: the encoded bytes
+    """
+    if value < 0:
+        raise ValueError(f"Can't encode negative number {value}")
+    result = bytearray()
+    while value > 0x7f:
+        result.append((value & 0x7f) | 0x80)
+        value >>= 7
+    result.append(value)
+    return bytes(result)
+
+
+def decodeVarint(data: bytes, offset: int = 0) -> tuple[int, int]:
+    """
+    Decodes one integer written by encodeVarint
+    :param data: the bytes to decode from
+    :param offset: where in data the integer starts; defaults to 0
+    :return: the integer, and the offset just past it
+    :raises GameRecordError: if data ends in the middle of the integer
+    """
+    value = 0
+    shift = 0
+    while True:
+        try:
+            byte = data[offset]
+        except IndexError:
+            raise GameRecordError("Game record ended in the middle of a number") from None
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _readVarint(infile: BinaryIO) -> int | None:
+    """
+    Reads one integer written by encodeVarint from a file
+    :param infile: the file to read from
+    :return: the integer, or None if the file ended before it started
+    :raises GameRecordError: if the file ends in the middle of the integer
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = infile.read(1)
+        if not byte:
+            if shift == 0:
+                return None
+            raise GameRecordError("Game record file ended in the middle of a number")
+        value |= (byte[0] & 0x7f) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+class GameRecord:
+    """
+    One game, stored as just the names of the players, the size of the board, how many in a row won, the cell of each
+    move, and the result, instead of every board along the way. The boards can be rebuilt exactly by replaying the moves.
+    """
+    # the names of the player that went first (playing X) and the player that went second (playing O)
+    _players: tuple[str, str]
+    # the number of cells across the board
+    _size: int
+    # how many in a row wins
+    _k: int
+    # the cell of each move, in order, counting across each row from the top left
+    _moves: tuple[int, ...]
+    # the symbol that won, or None for a draw
+    _winner: str | None
+
+    def __init__(self, player1: str, player2: str, size: int, moves: Sequence[int], winner: str | None,
+                 k: int | None = None):
+        """
+        :param player1: the name of the player that went first, playing X
+        :param player2: the name of the player that went second, playing O
+        :param size: the number of cells across the board
+        :param moves: the cell of each move, in order (e.g. from Board.history)
+        :param winner: the symbol that won, or None for a draw
+        :param k: how many in a row won; defaults to size
+        """
+        self._players = (player1, player2)
+        self._size = size
+        self._k = k if k is not None else size
+        self._moves = tuple(moves)
+        self._winner = winner
+
+    def players(self) -> tuple[str, str]:
+        """
+        :return: the names of the player that went first and the player that went second
+        """
+        return self._players
+
+    def size(self) -> int:
+        """
+        :return: the number of cells across the board
+        """
+        return self._size
+
+    def k(self) -> int:
+        """
+        :return: how many in a row won
+        """
+        return self._k
+
+    def moves(self) -> tuple[int, ...]:
+        """
+        :return: the cell of each move, in order
+        """
+        return self._moves
+
+    def turns(self) -> int:
+        """
+        :return: the number of moves made in the game
+        """
+        return len(self._moves)
+
+    def winner(self) -> str | None:
+        """
+        :return: the symbol that won, or None for a draw
+        """
+        return self._winner
+
+    def winnerName(self) -> str | None:
+        """
+        :return: the name of the player that won, or None for a draw
+        """
+        if self._winner is None:
+            return None
+        return self._players[_SYMBOLS.index(self._winner)]
+
+    def boards(self) -> Iterator[Board]:
+        """
+        Replays the game, yielding the board before the first move and after each move
+        :return: an iterator over independent copies of each board
+        """
+        board = BitBoard(self._size, self._k)
+        yield copy(board)
+        for turn, cell in enumerate(self._moves):
+            board.makeMove(Move(cell // self._size, cell % self._size, _SYMBOLS[turn % 2]))
+            yield copy(board)
+
+    def board(self, turns: int | None = None) -> Board:
+        """
+        Replays the game up to some point
+        :param turns: how many moves to replay; defaults to all of them
+        :return: the board after that many moves
+        """
+        if turns is None:
+            turns = len(self._moves)
+        board = BitBoard(self._size, self._k)
+        for turn in range(turns):
+            cell = self._moves[turn]
+            board.makeMove(Move(cell // self._size, cell % self._size, _SYMBOLS[turn % 2]))
+        return board
+
+    def encode(self) -> bytes:
+        """
+        Encodes this record as its length followed by: the length and UTF-8 bytes of each name, the size, k, the number
+        of moves, each move, and the result, all as varints
+        :return: the encoded record
+        """
+        body = bytearray()
+        for name in self._players:
+            encoded = name.encode("utf-8")
+            body += encodeVarint(len(encoded))
+            body += encoded
+        body += encodeVarint(self._size)
+        body += encodeVarint(self._k)
+        body += encodeVarint(len(self._moves))
+        for cell in self._moves:
+            body += encodeVarint(cell)
+        body += encodeVarint(_RESULTS.index(self._winner))
+        return encodeVarint(len(body)) + bytes(body)
+
+    @classmethod
+    def decode(cls, data: bytes, offset: int = 0) -> tuple[GameRecord, int]:
+        """
+        Decodes one record written by encode
+        :param data: the bytes to decode from
+        :param offset: where in data the record starts, i.e. where its length is; defaults to 0
+        :return: the record, and the offset just past it
+        :raises GameRecordError: if the record is incomplete or doesn't make sense
+        """
+        length, offset = decodeVarint(data, offset)
+        end = offset + length
+        if end > len(data):
+            raise GameRecordError("Game record ended early")
+        return cls._decodeBody(data[offset:end]), end
+
+    @classmethod
+    def _decodeBody(cls, body: bytes) -> GameRecord:
+        """
+        Decodes everything in a record after its length
+        """
+        offset = 0
+        names: list[str] = []
+        for i in range(2):
+            length, offset = decodeVarint(body, offset)
+            names.append(body[offset:offset + length].decode("utf-8"))
+            offset += length
+        size, offset = decodeVarint(body, offset)
+        k, offset = decodeVarint(body, offset)
+        if not 0 < k <= size:
+            raise GameRecordError(f"Can't need {k} in a row on a {size}x{size} board")
+        count, offset = decodeVarint(body, offset)
+        moves: list[int] = []
+        for i in range(count):
+            cell, offset = decodeVarint(body, offset)
+            if cell >= size * size:
+                raise GameRecordError(f"Move to cell {cell} doesn't fit on a {size}x{size} board")
+            moves.append(cell)
+        result, offset = decodeVarint(body, offset)
+        if result >= len(_RESULTS):
+            raise GameRecordError(f"Unknown game result {result}")
+        if offset != len(body):
+            raise GameRecordError("Game record has extra bytes at the end")
+        return cls(names[0], names[1], size, moves, _RESULTS[result], k)
+
+    def toText(self) -> str:
+        """
+        :return: the same logs Game.playGame writes to a text log for this game
+        """
+        logs = [f"{self._players[0]}: {_SYMBOLS[0]}; {self._players[1]}: {_SYMBOLS[1]}"]
+        logs.extend(str(board) for board in self.boards())
+        if self._winner is not None:
+            logs.append(f"{self.winnerName()} won playing {self._winner} in {self.turns()} turns!")
+        else:
+            logs.append(f"Draw in {self.turns()} turns!")
+        return "\n".join(logs) + "\n"
+
+    def __eq__(self, other: GameRecord) -> bool:
+        return self._players == other._players and self._size == other._size and self._k == other._k and \
+            self._moves == other._moves and self._winner == other._winner
+
+    def __repr__(self) -> str:
+        result = f"Draw in {self.turns()} turns" if self._winner is None else \
+            f"{self.winnerName()} won playing {self._winner} in {self.turns()} turns"
+        rules = f"{self._size}x{self._size}" if self._k == self._size else f"{self._size}x{self._size}, {self._k} in a row"
+        return f"{self._players[0]} vs {self._players[1]} on {rules}: {list(self._moves)}; {result}"
+
+
+class GameRecordWriter(GameLogWriter):
+    """
+    A GameLogWriter for GameRecords instead of text logs. Game.playGame writes a record instead of text when it's
+    given one of these. Each file starts with MAGIC and VERSION, then has one encoded record per game.
+    """
+    _binary = True
+
+    def writeRecord(self, record: GameRecord) -> None:
+        """
+        Queues a game to be written
+        :param record: the game to write
+        """
+        self.write(record.encode())
+
+    def _open(self, filename: str) -> None:
+        """
+        Opens the given file for appending and makes it the current file, starting it with a header if it's new
+        """
+        new = not os.path.exists(filename) or os.path.getsize(filename) == 0
+        super()._open(filename)
+        if new:
+            self._file.write(MAGIC + bytes([VERSION]))
+
+
+def writerFor(filename: str, **options) -> GameLogWriter:
+    """
+    Picks the right kind of writer for a log file based on its name
+    :param filename: the file to write logs to
+    :param options: any other arguments for the writer
+    :return: a GameRecordWriter if the name ends with EXTENSION (ignoring any compression extension), or a
+    GameLogWriter for text logs otherwise
+    """
+    stem, extension = os.path.splitext(filename)
+    if extension in EXTENSIONS:
+        extension = os.path.splitext(stem)[1]
+    if extension == EXTENSION:
+        return GameRecordWriter(filename, **options)
+    return GameLogWriter(filename, **options)
+
+
+def readRecords(filename: str) -> Iterator[GameRecord]:
+    """
+    Reads the games from a file written by a GameRecordWriter one at a time, so the file never has to fit in memory
+    :param filename: the file to read; it's decompressed if its extension says it's compressed
+    :return: an iterator over each game in the file
+    :raises GameRecordError: if the file isn't a game record file, or is corrupt
+    """
+    with openLog(filename, "rb") as infile:
+        header = infile.read(len(MAGIC) + 1)
+        if len(header) != len(MAGIC) + 1 or header[:len(MAGIC)] != MAGIC:
+            raise GameRecordError(f"{filename} is not a game record file")
+        if header[len(MAGIC)] != VERSION:
+            raise GameRecordError(f"{filename} has unsupported version {header[len(MAGIC)]}")
+        while True:
+            length = _readVarint(infile)
+            if length is None:
+                return
+            body = infile.read(length)
+            if len(body) != length:
+                raise GameRecordError(f"{filename} ended in the middle of a game")
+            yield GameRecord._decodeBody(body)
+
+
+def isGameRecordFile(filename: str) -> bool:
+    """
+    :param filename: the file to check
+    :return: True if the file starts like a file written by a GameRecordWriter, False otherwise
+    """
+    try:
+        with openLog(filename, "rb") as infile:
+            return infile.read(len(MAGIC)) == MAGIC
+    except (OSError, EOFError, lzma.LZMAError):
+        return False
+
+
+def testRoundTrip(extension: str = "") -> None:
+    """
+    Tests that records of games played with Game, written with a GameRecordWriter, read back the same, and replay to the
+    boards that were played, including games that need fewer than the whole width in a row to win
+    :param extension: the compression extension to test, e.g. ".gz", or "" for no compression
+    """
+    import random
+    import tempfile
+    from Game import Game
+    from MENACE import MENACE
+    random.seed(0)
+    games: list[tuple[GameRecord, Board]] = []
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "gameLogs" + EXTENSION + extension)
+        with writerFor(filename, maxGames=25) as writer:
+            for size, k in ((3, None), (4, 3), (5, 4)):
+                game = Game(MENACE("Test 1"), MENACE("Test 2"), size, k)
+                for i in range(20):
+                    winner = game.playGame(None)
+                    board = game._board
+                    record = GameRecord("Test 1", "Test 2", size, board.history(), winner, board.k())
+                    writer.writeRecord(record)
+                    games.append((record, copy(board)))
+        assert isGameRecordFile(filename)
+        records = [record for name in writer.files() for record in readRecords(name)]
+    assert records == [record for record, board in games]
+    for record, (written, board) in zip(records, games):
+        assert record.k() == board.k()
+        replayed = record.board()
+        assert replayed.winner() == board.winner() == record.winner()
+        assert replayed.canonicalKey() == board.canonicalKey()
+        assert list(record.boards())[-1].canonicalKey() == board.canonicalKey()
+        decoded, end = GameRecord.decode(record.encode())
+        assert decoded == record and end == len(record.encode())
+
+
+def main():
+    testRoundTrip()
+    testRoundTrip(".gz")
+    import sys
+    # print each game in the given record files the way Game.playGame would have logged it
+    for filename in sys.argv[1:]:
+        for record in readRecords(filename):
+            print(record.toText(), end="")
+
+
+if __name__ == "__main__":
+    main()
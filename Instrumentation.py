@@ -0,0 +1,201 @@
+#
+# Instrumentation.py
+# 18 October 2026
+#
+
+from __future__ import annotations
+import sys
+from time import perf_counter
+from typing import TextIO
+
+
+class Instruments:
+    """
+    Counters and cumulative timers for the hot paths, which can be turned on and off while the program runs. Each
+    instrumented method checks enabled once and does nothing else while it's False, so this can be left in everywhere:
+        timing = instruments.enabled
+        if timing:
+            start = instruments.clock()
+        ...
+        if timing:
+            instruments.stop("Board.transformationTo", start)
+    """
+    # whether the instrumented methods should record anything; see enable and disable
+    enabled: bool
+    # the number of times each named thing happened (including each timed call)
+    _counts: dict[str, int]
+    # the total seconds spent in each timed method
+    _times: dict[str, float]
+    # how often to print a report while enabled, in seconds, or None to only report when asked
+    _reportEvery: float | None
+    # where to print reports
+    _outfile: TextIO | None
+    # when the last report was printed (or the instruments were enabled)
+    _lastReport: float
+
+    def __init__(self):
+        self.enabled = False
+        self._reportEvery = None
+        self._outfile = None
+        self._lastReport = perf_counter()
+        self.reset()
+
+    def enable(self, reportEvery: float | None = None, outfile: TextIO | None = None) -> None:
+        """
+        Starts recording
+        :param reportEvery: print a report this often while enabled, in seconds; None (the default) to only report
+        when asked
+        :param outfile: where to print reports; defaults to sys.stderr
+        """
+        self._reportEvery = reportEvery
+        self._outfile = outfile
+        self._lastReport = perf_counter()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Stops recording; whatever was recorded so far is kept until reset
+        """
+        self.enabled = False
+
+    def reset(self) -> None:
+        """
+        Forgets everything recorded so far
+        """
+        self._counts = dict()
+        self._times = dict()
+
+    @staticmethod
+    def clock() -> float:
+        """
+        :return: the time to pass to stop once the method being timed is done
+        """
+        return perf_counter()
+
+    def stop(self, name: str, start: float) -> None:
+        """
+        Records one call to a timed method, and prints a report if one is due
+        :param name: the name of the method, e.g. Board.transformationTo
+        :param start: the time the call started, from clock
+        """
+        now = perf_counter()
+        self._times[name] = self._times.get(name, 0.0) + now - start
+        self._counts[name] = self._counts.get(name, 0) + 1
+        if self._reportEvery is not None and now - self._lastReport >= self._reportEvery:
+            self._lastReport = now
+            print(self.report(), file=self._outfile if self._outfile is not None else sys.stderr)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+        Records that something happened
+        :param name: what happened, e.g. MENACE._matchboxFor hit
+        :param amount: how many times it happened; defaults to 1
+        """
+        self._counts[name] = self._counts.get(name, 0) + amount
+
+    def counts(self) -> dict[str, int]:
+        """
+        :return: the number of times each named thing happened, including each timed call
+        """
+        return dict(self._counts)
+
+    def times(self) -> dict[str, float]:
+        """
+        :return: the total seconds spent in each timed method
+        """
+        return dict(self._times)
+
+    def report(self) -> str:
+        """
+        :return: a table of each timed method's calls, total time, and time per call, followed by the other counters
+        """
+        lines = ["Instrumentation:"]
+        for name in sorted(self._times, key=self._times.get, reverse=True):
+            calls = self._counts[name]
+            seconds = self._times[name]
+            lines.append(f"  {name}: {calls} calls, {seconds:.3f} seconds, {seconds / calls * 1e6:.2f} microseconds each")
+        for name in sorted(self._counts):
+            if name not in self._times:
+                lines.append(f"  {name}: {self._counts[name]}")
+        return "\n".join(lines)
+
+
+# the instruments every instrumented method records to
+instruments = Instruments()
+
+
+def testInstruments() -> None:
+    """
+    Tests that counters and timers add up, are reported, and are forgotten on reset
+    """
+    import io
+    test = Instruments()
+    outfile = io.StringIO()
+    test.enable(reportEvery=0, outfile=outfile)
+    for i in range(3):
+        test.stop("timed", test.clock())
+    test.count("counted", 5)
+    test.count("counted")
+    assert test.counts() == {"timed": 3, "counted": 6}
+    assert set(test.times()) == {"timed"} and test.times()["timed"] >= 0
+    # a report was due every time something was timed
+    assert outfile.getvalue().count("Instrumentation:") == 3
+    report = test.report()
+    assert "timed: 3 calls" in report and "counted: 6" in report
+    test.disable()
+    assert not test.enabled and test.counts()["counted"] == 6
+    test.reset()
+    assert test.counts() == {} and test.times() == {}
+
+
+def testHotPaths() -> None:
+    """
+    Tests that playing games records the instrumented methods while enabled, and nothing at all while disabled, and
+    that matchboxes read from a lazily loaded brain are counted as loads rather than hits or misses
+    """
+    import os
+    import tempfile
+    import BrainFile
+    from MENACE import MENACE
+    from Trainer import Trainer
+    # the instruments the other modules import, which aren't this module's globals when it's run as a script
+    from Instrumentation import instruments
+    instruments.reset()
+    players = (MENACE("Test 1"), MENACE("Test 2"))
+    Trainer(players[0], players[1]).train(games=20)
+    assert instruments.counts() == {}
+    with tempfile.TemporaryDirectory() as directory:
+        brain = os.path.join(directory, "brain" + BrainFile.EXTENSION)
+        players[0].save(brain)
+        loaded = MENACE.fromFile(brain)
+        instruments.enable()
+        try:
+            Trainer(loaded, MENACE("Test 2")).train(games=20)
+        finally:
+            instruments.disable()
+        # reading the rest of the brain closes the file, so the directory can be removed
+        assert len(list(loaded.matchboxes())) >= len(list(players[0].matchboxes()))
+    counts = instruments.counts()
+    assert counts["Game.playGame"] == 20
+    lookups = counts["MENACE._matchboxFor"]
+    assert counts["MENACE._matchboxFor load"] > 0
+    assert sum(counts.get(f"MENACE._matchboxFor {outcome}", 0) for outcome in ("hit", "miss", "load")) == lookups
+    assert sum(count for name, count in counts.items() if name.startswith("MENACE._matchboxFor symmetry")) == lookups
+    instruments.reset()
+
+
+def main():
+    testInstruments()
+    testHotPaths()
+    from MENACE import MENACE
+    from Trainer import Trainer
+    from Instrumentation import instruments
+    # train for a few seconds with a report every second
+    instruments.enable(reportEvery=1)
+    Trainer(MENACE("Menace 1"), MENACE("Menace 2")).train(seconds=3)
+    instruments.disable()
+    print(instruments.report())
+
+
+if __name__ == "__main__":
+    main()
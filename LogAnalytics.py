@@ -0,0 +1,419 @@
+#
+# LogAnalytics.py
+# 18 October 2026
+#
+
+from __future__ import annotations
+import os
+from multiprocessing import Pool
+from typing import BinaryIO, Iterator, Sequence
+from Move import Move
+from GameLog import openLog, EXTENSIONS
+from GameRecord import isGameRecordFile, readRecords
+
+# the symbol that goes first and the symbol that goes second, the same as in Game
+_SYMBOLS = (Move.CROSS, Move.NOUGHT)
+
+
+class LogStats:
+    """
+    Statistics about a series of games, gathered one game at a time so that no matter how many games there are, the
+    memory used only depends on how many different pairs of players, game lengths, and openings there are. Two
+    LogStats for consecutive parts of a log can be merged, so a log can be analyzed in pieces.
+    """
+    # [games player 1 won, games player 2 won, draws] for each (player 1, player 2) pair of names
+    _pairs: dict[tuple[str, str]: list[int]]
+    # the number of games that lasted each number of turns
+    _lengths: dict[int: int]
+    # how many games started with each sequence of moves, keyed by (board size, cells)
+    _openings: dict[tuple[int, tuple[int, ...]]: int]
+    # the number of moves at the start of each game that count as its opening
+    _openingMoves: int
+    # [games, X wins, O wins, draws] for each window of consecutive games, oldest first
+    _windows: list[list[int]]
+    # how many games go in each window; doubles whenever there would be more than _maxWindows windows
+    _window: int
+    _maxWindows: int
+
+    def __init__(self, openingMoves: int = 2, window: int = 1000, maxWindows: int = 100):
+        """
+        :param openingMoves: how many moves at the start of each game count as its opening; defaults to 2
+        :param window: how many games to find each rolling win rate over; defaults to 1000
+        :param maxWindows: the most rolling win rates to keep; once there are more, neighboring windows are combined
+        and the window size doubles. defaults to 100
+        """
+        self._pairs = dict()
+        self._lengths = dict()
+        self._openings = dict()
+        self._openingMoves = openingMoves
+        self._windows = []
+        self._window = window
+        self._maxWindows = maxWindows
+
+    def add(self, player1: str, player2: str, size: int, turns: int, winner: str | None,
+            opening: Sequence[int]) -> None:
+        """
+        Adds one game
+        :param player1: the name of the player that went first, playing X
+        :param player2: the name of the player that went second, playing O
+        :param size: the number of cells across the board
+        :param turns: the number of moves made in the game
+        :param winner: the symbol that won, or None for a draw
+        :param opening: the cells of the first moves of the game; only the first openingMoves are used
+        """
+        outcome = 2 if winner is None else _SYMBOLS.index(winner)
+        pair = (player1, player2)
+        try:
+            self._pairs[pair][outcome] += 1
+        except KeyError:
+            self._pairs[pair] = [0, 0, 0]
+            self._pairs[pair][outcome] += 1
+        self._lengths[turns] = self._lengths.get(turns, 0) + 1
+        key = (size, tuple(opening[:self._openingMoves]))
+        self._openings[key] = self._openings.get(key, 0) + 1
+        if not self._windows or self._windows[-1][0] >= self._window:
+            self._windows.append([0, 0, 0, 0])
+            self._compact()
+        window = self._windows[-1]
+        window[0] += 1
+        window[outcome + 1] += 1
+
+    def merge(self, other: LogStats) -> None:
+        """
+        Adds every game from other, as if they were played after the games already added to this
+        :param other: the statistics to add
+        """
+        for pair, outcomes in other._pairs.items():
+            mine = self._pairs.setdefault(pair, [0, 0, 0])
+            for i in range(3):
+                mine[i] += outcomes[i]
+        for turns, count in other._lengths.items():
+            self._lengths[turns] = self._lengths.get(turns, 0) + count
+        for opening, count in other._openings.items():
+            self._openings[opening] = self._openings.get(opening, 0) + count
+        self._window = max(self._window, other._window)
+        for window in other._windows:
+            # windows at the edges of each part are usually partly full, so fill them up before starting a new one
+            if self._windows and self._windows[-1][0] < self._window:
+                last = self._windows[-1]
+                for i in range(4):
+                    last[i] += window[i]
+            else:
+                self._windows.append(window[:])
+        self._compact()
+
+    def _compact(self) -> None:
+        """
+        Combines neighboring windows until there are at most _maxWindows of them
+        """
+        while len(self._windows) > self._maxWindows:
+            combined = []
+            for i in range(0, len(self._windows), 2):
+                pair = self._windows[i:i + 2]
+                combined.append([sum(counts) for counts in zip(*pair)])
+            self._windows = combined
+            self._window *= 2
+
+    def games(self) -> int:
+        """
+        :return: the number of games added
+        """
+        return sum(self._lengths.values())
+
+    def pairs(self) -> dict[tuple[str, str]: tuple[float, float, float]]:
+        """
+        :return: for each (player 1, player 2) pair of names, the fraction of their games player 1 won, drew, and lost
+        """
+        rates = dict()
+        for pair, (wins, losses, draws) in self._pairs.items():
+            games = wins + losses + draws
+            rates[pair] = (wins / games, draws / games, losses / games)
+        return rates
+
+    def lengths(self) -> dict[int: int]:
+        """
+        :return: the number of games that lasted each number of turns, from shortest to longest
+        """
+        return dict(sorted(self._lengths.items()))
+
+    def openings(self, top: int = 10) -> list[tuple[tuple[tuple[int, int], ...], int]]:
+        """
+        :param top: how many openings to return; defaults to 10
+        :return: the most common openings and how many games started with each, most common first; each opening is
+        the (row, column) of each of its moves
+        """
+        best = sorted(self._openings.items(), key=lambda item: item[1], reverse=True)[:top]
+        return [(tuple(divmod(cell, size) for cell in cells), count) for (size, cells), count in best]
+
+    def rollingRates(self) -> list[tuple[int, float, float, float]]:
+        """
+        :return: for each window of consecutive games, oldest first, the number of games before the end of the window
+        and the fraction of the games in the window that X won, that O won, and that were drawn
+        """
+        rates = []
+        played = 0
+        for games, crosses, noughts, draws in self._windows:
+            played += games
+            rates.append((played, crosses / games, noughts / games, draws / games))
+        return rates
+
+    def report(self, top: int = 10) -> str:
+        """
+        :param top: how many openings to include; defaults to 10
+        :return: a summary of every statistic
+        """
+        games = self.games()
+        lines = [f"{games} games"]
+        if games == 0:
+            return lines[0]
+        lines.append("Results for the first player of each pair:")
+        for (player1, player2), (wins, draws, losses) in self.pairs().items():
+            lines.append(f"  {player1 or _SYMBOLS[0]} vs {player2 or _SYMBOLS[1]}: "
+                         f"{sum(self._pairs[(player1, player2)])} games, won {wins:.1%}, drew {draws:.1%}, "
+                         f"lost {losses:.1%}")
+        lines.append("Game lengths:")
+        for turns, count in self.lengths().items():
+            lines.append(f"  {turns} turns: {count} ({count / games:.1%})")
+        lines.append("Most common openings:")
+        for moves, count in self.openings(top):
+            lines.append(f"  {', '.join(str(move) for move in moves) or 'no moves'}: {count} ({count / games:.1%})")
+        lines.append(f"Rolling results ({_SYMBOLS[0]} won / {_SYMBOLS[1]} won / drawn):")
+        start = 0
+        for played, crosses, noughts, draws in self.rollingRates():
+            lines.append(f"  games {start + 1}-{played}: {crosses:.1%} / {noughts:.1%} / {draws:.1%}")
+            start = played
+        return "\n".join(lines)
+
+
+def _isHeader(line: str) -> bool:
+    """
+    :param line: a line from a text log, without its newline
+    :return: True if the line is the first line of a game (the players), False otherwise
+    """
+    # board rows never have a "; " in them, and result lines always end with " turns!"
+    return "; " in line and not line.endswith(" turns!")
+
+
+def _name(player: str) -> str:
+    """
+    :param player: one player from the first line of a game, as written by Player.__repr__
+    :return: the player's name, or "" if they don't have one
+    """
+    name, separator, symbol = player.rpartition(": ")
+    return name
+
+
+def _parseText(infile: BinaryIO, start: int = 0, end: int | None = None,
+               openingMoves: int = 2) -> Iterator[tuple[str, str, int, int, str | None, list[int]]]:
+    """
+    Reads the games in a text log written by Game.playGame. When reading part of a log, the games that belong to the
+    part are the ones whose first line starts in it, so reading consecutive parts reads each game exactly once.
+    :param infile: the log, opened in binary mode
+    :param start: the offset to start reading from; it must be possible to seek to it unless it's 0
+    :param end: the offset where the next part starts; defaults to reading to the end of the file
+    :param openingMoves: how many moves to work out from the boards at the start of each game
+    :return: the names of the players, the size of the board, the number of turns, the winner, and the cells of the
+    opening moves for each game
+    """
+    if start > 0:
+        # skip the end of the line the previous part started
+        infile.seek(start - 1)
+        offset = start - 1 + len(infile.readline())
+    else:
+        offset = 0
+    header: str | None = None
+    boards: list[str] = []
+    rows: list[str] = []
+    for rawLine in infile:
+        lineStart = offset
+        offset += len(rawLine)
+        line = rawLine.decode("utf-8").rstrip("\r\n")
+        if header is None:
+            # look for the start of the next game, as long as it's still in this part
+            if end is not None and lineStart >= end:
+                return
+            if _isHeader(line):
+                header = line
+                boards = []
+                rows = []
+            continue
+        if line.endswith(" turns!"):
+            player1, separator, player2 = header.partition("; ")
+            if line.startswith("Draw in "):
+                winner = None
+                turns = int(line[len("Draw in "):-len(" turns!")])
+            else:
+                name, separator, result = line.rpartition(" won playing ")
+                winner, separator, turns = result.partition(" in ")
+                turns = int(turns[:-len(" turns!")])
+            size = len(boards[0]) if boards else 0
+            size = round(size ** 0.5)
+            opening = []
+            for before, after in zip(boards, boards[1:]):
+                for cell in range(len(before)):
+                    if before[cell] != after[cell]:
+                        opening.append(cell)
+                        break
+            yield _name(player1), _name(player2), size, turns, winner, opening
+            header = None
+        elif line:
+            rows.append(line)
+            if len(rows) == len(line):
+                # only the boards for the opening are needed
+                if len(boards) <= openingMoves:
+                    boards.append("".join(rows))
+                rows = []
+
+
+def _analyzePart(task: tuple[str, int, int | None, int, int, int]) -> LogStats:
+    """
+    Gathers the statistics for one part of one log; runs in a worker process when analyzing in parallel
+    :param task: the name of the log, where the part starts and where the next part starts, and the arguments for
+    LogStats
+    :return: the statistics for the part
+    """
+    filename, start, end, openingMoves, window, maxWindows = task
+    stats = LogStats(openingMoves, window, maxWindows)
+    if isGameRecordFile(filename):
+        for record in readRecords(filename):
+            player1, player2 = record.players()
+            stats.add(player1, player2, record.size(), record.turns(), record.winner(),
+                      record.moves()[:openingMoves])
+    else:
+        with openLog(filename, "rb") as infile:
+            for game in _parseText(infile, start, end, openingMoves):
+                stats.add(*game)
+    return stats
+
+
+def analyzeLogs(filenames: Sequence[str], workers: int | None = 1, partBytes: int = 64 * 1024 * 1024,
+                openingMoves: int = 2, window: int = 1000, maxWindows: int = 100) -> LogStats:
+    """
+    Reads each log once, one game at a time, and gathers statistics about the games in them. Text logs, compressed
+    logs, and game record files all work. Uncompressed text logs are split into parts that can be read at the same
+    time; other files are read in one piece.
+    :param filenames: the logs to read, in the order their games were played
+    :param workers: how many processes to read with; defaults to 1, which reads in this process. None uses one per CPU
+    :param partBytes: about how many bytes of an uncompressed text log each process reads at a time; defaults to 64 MiB
+    :param openingMoves: how many moves at the start of each game count as its opening; defaults to 2
+    :param window: how many games to find each rolling win rate over; defaults to 1000
+    :param maxWindows: the most rolling win rates to keep; defaults to 100
+    :return: the statistics for every game in every log
+    """
+    tasks = []
+    for filename in filenames:
+        if os.path.splitext(filename)[1] in EXTENSIONS or isGameRecordFile(filename):
+            tasks.append((filename, 0, None, openingMoves, window, maxWindows))
+            continue
+        size = os.path.getsize(filename)
+        for start in range(0, max(size, 1), partBytes):
+            end = start + partBytes if start + partBytes < size else None
+            tasks.append((filename, start, end, openingMoves, window, maxWindows))
+    stats = LogStats(openingMoves, window, maxWindows)
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            stats.merge(_analyzePart(task))
+    else:
+        with Pool(workers) as pool:
+            # imap keeps the parts in order, so the rolling win rates stay in the order the games were played
+            for part in pool.imap(_analyzePart, tasks):
+                stats.merge(part)
+    return stats
+
+
+def _readLogsTotals(filename: str) -> tuple[dict[str, int], int]:
+    """
+    Counts wins and draws the way main.readLogs used to, to check LogStats against
+    :param filename: the text log to read
+    :return: the number of games each player won, by name, and the number of draws
+    """
+    wins = dict()
+    draws = 0
+    with open(filename, "r") as infile:
+        for line in infile:
+            if " won playing " in line and " turns!" in line:
+                player = line.split(" won playing ")[0]
+                wins[player] = wins.get(player, 0) + 1
+            elif "Draw in " in line and " turns!" in line:
+                draws += 1
+    return wins, draws
+
+
+def _totals(stats: LogStats) -> tuple[dict[str, int], int]:
+    """
+    :return: the number of games each player won, by name, and the number of draws, in the same form as
+    _readLogsTotals
+    """
+    wins = dict()
+    draws = 0
+    for (player1, player2), (crosses, noughts, drawn) in stats._pairs.items():
+        for player, won in ((player1, crosses), (player2, noughts)):
+            if won:
+                wins[player] = wins.get(player, 0) + won
+        draws += drawn
+    return wins, draws
+
+
+def testAgainstReadLogs(filename: str = "gameLogs.txt") -> None:
+    """
+    Tests that the win and draw totals match what main.readLogs used to count, whether the log is read in one piece,
+    in parts, in parallel, or compressed
+    :param filename: the text log to check
+    """
+    import gzip
+    import shutil
+    import tempfile
+    expected = _readLogsTotals(filename)
+    games = sum(expected[0].values()) + expected[1]
+    for workers, partBytes in ((1, 64 * 1024 * 1024), (1, 4096), (2, 4096)):
+        stats = analyzeLogs([filename], workers=workers, partBytes=partBytes)
+        assert _totals(stats) == expected and stats.games() == games
+        assert sum(stats.lengths().values()) == games
+    with tempfile.TemporaryDirectory() as directory:
+        compressed = os.path.join(directory, "gameLogs.txt.gz")
+        with open(filename, "rb") as infile, gzip.open(compressed, "wb") as outfile:
+            shutil.copyfileobj(infile, outfile)
+        assert _totals(analyzeLogs([compressed])) == expected
+
+
+def testGameRecords(games: int = 300) -> None:
+    """
+    Tests that the same games give the same statistics whether they're logged as GameRecords or as text
+    :param games: the number of games to play
+    """
+    import random
+    import tempfile
+    from Game import Game
+    from MENACE import MENACE
+    from GameRecord import GameRecord, EXTENSION, writerFor
+    random.seed(0)
+    players = (MENACE("Test 1"), MENACE("Test 2"))
+    game = Game(players[0], players[1])
+    with tempfile.TemporaryDirectory() as directory:
+        textLog = os.path.join(directory, "gameLogs.txt")
+        recordLog = os.path.join(directory, "gameLogs" + EXTENSION)
+        with open(textLog, "w") as text, writerFor(recordLog) as records:
+            for i in range(games):
+                winner = game.playGame(None)
+                for player in players:
+                    player.learn(winner)
+                record = GameRecord("Test 1", "Test 2", 3, game._board.history(), winner)
+                records.writeRecord(record)
+                text.write(record.toText())
+        fromText = analyzeLogs([textLog], window=50)
+        fromRecords = analyzeLogs([recordLog], window=50)
+        assert _totals(fromText) == _totals(fromRecords) == _readLogsTotals(textLog)
+        assert fromText.lengths() == fromRecords.lengths()
+        assert fromText.openings() == fromRecords.openings()
+        assert fromText.rollingRates() == fromRecords.rollingRates()
+
+
+def main():
+    testAgainstReadLogs()
+    testGameRecords()
+    import sys
+    print(analyzeLogs(sys.argv[1:] or ["gameLogs.txt"], workers=None).report())
+
+
+if __name__ == "__main__":
+    main()
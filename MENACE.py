@@ -5,16 +5,26 @@
 #
 
 from __future__ import annotations
+import os
+from typing import Iterator
 from Player import Player
 from Board import Board
 from Matchbox import Matchbox
 from Move import Move
-from util import BinarySearchTree
+from util import MatchboxIndex
+from Instrumentation import instruments
+import BrainFile
+
+# the extension added to a saved MENACE's filename for its journal of checkpoints
+JOURNAL_EXTENSION = ".journal"
 
 
 class MENACE(Player):
-    _matchboxes: dict[str: Matchbox]
+    # each Matchbox, indexed by the canonical key of its board (see Board.canonicalKey)
+    _matchboxes: MatchboxIndex
     _movesMade: list[tuple[Move, Matchbox]]
+    # the matchboxes that have learned since the last save or checkpoint, keyed by id since Matchboxes aren't hashable
+    _touched: dict[int: Matchbox]
 
     def __init__(self, name: str = "MENACE", symbol: str = Move.CROSS) -> None:
         """
@@ -23,62 +33,138 @@ class MENACE(Player):
         :param symbol: the symbol MENACE will play; defaults to Move.CROSS
         """
         super().__init__(name, symbol)
-        self._matchboxes = dict()
+        self._matchboxes = MatchboxIndex()
         self._movesMade = []
+        self._touched = dict()
 
     @classmethod
     def fromFile(cls, filename: str) -> MENACE:
+        """
+        Loads a MENACE saved with save, in either the text or the binary format
+        :param filename: the file to load
+        :return: the MENACE saved in the file, or a new MENACE named after the file if it doesn't exist
+        """
         try:
+            if BrainFile.isBinaryBrain(filename):
+                return cls.fromBinary(filename)
             with open(filename, "r") as infile:
                 # the first line is 'name: symbol'
-                name, symbol = infile.readline().split(": ")
+                name, symbol = infile.readline().strip().split(": ")
                 menace = MENACE(name, symbol)
                 # the rest is one line per matchbox
                 for line in infile:
                     if len(line) > 2:
-                        matchbox = Matchbox.fromString(line)
-                        menace._matchboxes[matchbox.label()] = matchbox
+                        menace._matchboxes.append(Matchbox.fromString(line))
         except FileNotFoundError:
-            menace = MENACE(filename[:-4])
+            menace = MENACE(os.path.splitext(filename)[0])
+        menace._replayJournal(filename)
+        return menace
+
+    @classmethod
+    def fromBinary(cls, filename: str, lazy: bool = True) -> MENACE:
+        """
+        Loads a MENACE saved in the binary format (see BrainFile)
+        :param filename: the file to load
+        :param lazy: if True, the file is memory-mapped and each matchbox is only read the first time it's needed;
+        otherwise every matchbox is read right away
+        :return: the MENACE saved in the file
+        """
+        reader = BrainFile.BrainReader(filename)
+        menace = MENACE(reader.name(), reader.symbol())
+        menace._matchboxes = MatchboxIndex(reader)
+        menace._replayJournal(filename)
+        if not lazy:
+            menace.loadAll()
         return menace
 
+    def _replayJournal(self, filename: str) -> None:
+        """
+        Applies every matchbox saved by checkpoint since the last full save, in order, so the latest version of each
+        matchbox wins
+        :param filename: the file MENACE was saved to; the journal is next to it
+        """
+        try:
+            with open(filename + JOURNAL_EXTENSION, "r") as infile:
+                for line in infile:
+                    if len(line) > 2:
+                        self._matchboxes.append(Matchbox.fromString(line))
+        except FileNotFoundError:
+            pass
+
     def makeMove(self, board: Board) -> None:
         """
         Makes a move on the given Board
         :param board: the Board to make a move on
         """
         # find or create the matchbox for this board state
-        correctMatchbox = self._matchboxFor(board)
+        correctMatchbox, symmetry = self._matchboxFor(board)
 
         # make whichever move the matchbox gives us
-        move = correctMatchbox.makeMove(board)
+        move = correctMatchbox.makeMove(board, symmetry)
         # remember the move and matchbox so we can learn later
         self._movesMade.append((move, correctMatchbox))
 
-    def _matchboxFor(self, board: Board) -> Matchbox:
+    def _matchboxFor(self, board: Board) -> tuple[Matchbox, int]:
         """
         Finds or creates the matchbox for this board state
         :param board: the board state to find
-        :return: the existing matchbox in _matchboxes, or creates and adds one if there isn't one
-        """
-        # see if we have an equivalent board already
-        for equivalentBoard in board.equivalentBoards():
-            try:
-                # if the lookup succeeds, we've found the correct board
-                return self._matchboxes[str(equivalentBoard)]
-            except KeyError:
-                # if the lookup fails, try the next board
-                pass
-        # if we get to this point, we don't; create one
-        box = Matchbox(board, self._symbol)
-        self._matchboxes[box.label()] = box
-        return box
+        :return: the existing matchbox in _matchboxes, or creates and adds one if there isn't one, along with the number
+        of the symmetry that turns the given board into the matchbox's board
+        """
+        if instruments.enabled:
+            start = instruments.clock()
+            loaded = self._matchboxes.loaded()
+            created = self._matchboxes.created()
+            result = self._matchboxes.find(board, self._symbol)
+            instruments.stop("MENACE._matchboxFor", start)
+            # a miss had to create the matchbox, and a load had to read it from a lazily loaded brain
+            if self._matchboxes.created() > created:
+                instruments.count("MENACE._matchboxFor miss")
+            elif self._matchboxes.loaded() > loaded:
+                instruments.count("MENACE._matchboxFor load")
+            else:
+                instruments.count("MENACE._matchboxFor hit")
+            instruments.count(f"MENACE._matchboxFor symmetry {result[1]}")
+            return result
+        return self._matchboxes.find(board, self._symbol)
+
+    def matchbox(self, key: int, size: int, k: int | None = None) -> Matchbox:
+        """
+        Finds or creates the matchbox for the board with the given canonical key
+        :param key: the canonical key of the board (see Board.canonicalKey)
+        :param size: the size of the board
+        :param k: how many in a row wins on the board; defaults to size
+        :return: the matchbox, whose board is in the orientation the key describes
+        """
+        return self._matchboxes.findKey(key, size, self._symbol, k)
+
+    def addMatchbox(self, matchbox: Matchbox) -> None:
+        """
+        Gives MENACE a matchbox, replacing any it already has for an equivalent board
+        :param matchbox: the matchbox to add; it plays MENACE's symbol
+        """
+        self._matchboxes.append(matchbox)
+
+    def loadAll(self) -> None:
+        """
+        Reads every matchbox that hasn't been read from a lazily loaded brain yet (see fromBinary), so MENACE no longer
+        needs the file, e.g. before it's copied to another process
+        """
+        len(self._matchboxes)
+
+    def matchboxes(self) -> Iterator[Matchbox]:
+        """
+        :return: each of MENACE's matchboxes, smaller boards first, with earlier turns before later ones
+        """
+        return iter(self._matchboxes)
 
     def learn(self, winner: str | None) -> None:
         """
         Updates each matchbox to hold more or less beads depending on if we won, drew, or lost
         :param winner: the winner of the game; one of Move.NOUGHT, Move.CROSS, or None if there was no winner
         """
+        for move, matchbox in self._movesMade:
+            self._touched[id(matchbox)] = matchbox
         if winner is None:
             for move, matchbox in self._movesMade:
                 matchbox.learnFromDraw(move)
@@ -91,12 +177,157 @@ class MENACE(Player):
         # prepare for a new game
         self._movesMade = []
 
+    def movesMade(self) -> tuple[tuple[Move, Matchbox], ...]:
+        """
+        :return: each move MENACE has made since it last learned, along with the matchbox it was made from
+        """
+        return tuple(self._movesMade)
+
+    def forget(self) -> None:
+        """
+        Forgets the moves made since MENACE last learned without learning from them, e.g. to replay a game against the
+        same beads
+        """
+        self._movesMade = []
+
+    def merge(self, deltas: dict[int: dict[int: int]], size: int, k: int | None = None) -> None:
+        """
+        Adds beads learned somewhere else (e.g. by a copy of this MENACE in another process) to the matchboxes,
+        creating any matchboxes that don't exist yet
+        :param deltas: for the canonical key of each matchbox's board, the beads to add to each cell (see Matchbox.merge)
+        :param size: the size of the boards
+        :param k: how many in a row wins on the boards; defaults to size
+        """
+        for key, cells in deltas.items():
+            matchbox = self.matchbox(key, size, k)
+            matchbox.merge(cells)
+            self._touched[id(matchbox)] = matchbox
+
     def save(self, filename: str) -> None:
         """
         Saves MENACE's progress to the given file
-        :param filename: The directory to the file to write to
+        :param filename: The directory to the file to write to; if it ends with BrainFile.EXTENSION, the binary format
+        is used, and otherwise the text format is used
+        """
+        if filename.endswith(BrainFile.EXTENSION):
+            BrainFile.writeBrain(filename, self._name, self._symbol, self._matchboxes.items())
+        else:
+            with open(filename, "w") as outfile:
+                print(self, file=outfile)
+                for matchbox in self._matchboxes:
+                    print(matchbox, file=outfile)
+        # everything in the journal is in the file now
+        try:
+            os.remove(filename + JOURNAL_EXTENSION)
+        except FileNotFoundError:
+            pass
+        self._touched = dict()
+
+    def checkpoint(self, filename: str) -> None:
+        """
+        Saves MENACE's progress without rewriting the whole file, by appending only the matchboxes that have learned
+        since the last save or checkpoint to a journal next to the file. fromFile applies the journal when loading, and
+        save folds it back into the file.
+        :param filename: The directory to the file MENACE is saved to; if it doesn't exist yet, a full save is done
         """
-        with open(filename, "w") as outfile:
-            print(self, file=outfile)
-            for matchbox in self._matchboxes.values():
+        if not os.path.exists(filename):
+            self.save(filename)
+            return
+        with open(filename + JOURNAL_EXTENSION, "a") as outfile:
+            for matchbox in self._touched.values():
                 print(matchbox, file=outfile)
+        self._touched = dict()
+
+
+def _playedMenace(size: int = 3, games: int = 200, seed: int = 0) -> MENACE:
+    """
+    :param size: the size of the board to play on
+    :param games: the number of games to play
+    :param seed: the seed for the random number generator
+    :return: a MENACE playing X that has learned from some games against another MENACE
+    """
+    import random
+    from Game import Game
+    random.seed(seed)
+    players = (MENACE("Test 1"), MENACE("Test 2"))
+    game = Game(players[0], players[1], size)
+    for i in range(games):
+        winner = game.playGame(None)
+        for player in players:
+            player.learn(winner)
+    return players[0]
+
+
+def _checkLookups(original: MENACE, loaded: MENACE) -> None:
+    """
+    Checks that looking up each of original's boards, in every orientation, finds a matchbox in loaded with the same
+    beads, without loaded having to make any new matchboxes
+    """
+    boxes = list(original.matchboxes())
+    assert len(list(loaded.matchboxes())) == len(boxes)
+    for box in boxes:
+        for board in Board.fromKey(box.canonicalKey()[0], box.size()).equivalentBoards():
+            found, symmetry = loaded._matchboxFor(board)
+            assert found.sum() == board.sum() and found.size() == board.size()
+            assert list(found.beads()) == list(box.beads())
+    assert len(list(loaded.matchboxes())) == len(boxes)
+
+
+def testTextBrain(size: int = 3) -> None:
+    """
+    Tests that a MENACE saved in the text format loads with every matchbox findable, including the empty board's
+    :param size: the size of board to test
+    """
+    import tempfile
+    original = _playedMenace(size)
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "brain.txt")
+        original.save(filename)
+        loaded = MENACE.fromFile(filename)
+    _checkLookups(original, loaded)
+
+
+def testMixedSizes() -> None:
+    """
+    Tests that a MENACE with matchboxes for boards of different sizes keeps them apart, even though e.g. the empty
+    boards of every size have the same canonical key, both in memory and after saving and loading in either format
+    """
+    import tempfile
+    small = list(_playedMenace(3).matchboxes())
+    menace = _playedMenace(5, games=20)
+    large = len(list(menace.matchboxes()))
+    for box in small:
+        menace.addMatchbox(box)
+    assert len(list(menace.matchboxes())) == len(small) + large
+    assert menace._matchboxFor(Board(3))[0].size() == 3 and menace._matchboxFor(Board(5))[0].size() == 5
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in (".txt", BrainFile.EXTENSION):
+            filename = os.path.join(directory, "brain" + extension)
+            menace.save(filename)
+            _checkLookups(menace, MENACE.fromFile(filename))
+
+
+def testForget() -> None:
+    """
+    Tests that forgetting a game's moves leaves every matchbox's beads as they were, and nothing for learn to undo
+    """
+    from Game import Game
+    players = (_playedMenace(), MENACE("Test 2"))
+    beads = {id(box): list(box.beads()) for box in players[0].matchboxes()}
+    Game(players[0], players[1]).playGame(None)
+    assert players[0].movesMade()
+    players[0].forget()
+    assert players[0].movesMade() == ()
+    players[0].learn(Move.CROSS)
+    assert all(list(box.beads()) == beads[id(box)] for box in players[0].matchboxes() if id(box) in beads)
+
+
+def main():
+    testTextBrain(3)
+    testTextBrain(4)
+    testMixedSizes()
+    testForget()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,34 @@
 
 from __future__ import annotations
 from Board import Board
-# found random.choice here: https://www.geeksforgeeks.org/how-to-get-weighted-random-choice-in-python/
-from random import choices
+from array import array
+from typing import Sequence
+from random import randrange
 from util import InvalidMoveError
 from copy import copy
 from Move import Move
+import Symmetry
+from Instrumentation import instruments
+
+
+# the Move for each cell of each board size and symbol we've seen, so Matchboxes can share them
+_cellMoves: dict[tuple[int, str], tuple[Move, ...]] = dict()
+
+
+def cellMoves(size: int, symbol: str) -> tuple[Move, ...]:
+    """
+    :param size: the number of cells across the board
+    :param symbol: the symbol for the moves
+    :return: a tuple where element i is the Move with the given symbol in cell i of a board of the given size
+    """
+    try:
+        return _cellMoves[(size, symbol)]
+    except KeyError:
+        pass
+    moves = tuple(Move(cell // size, cell % size, symbol) for cell in range(size * size))
+    _cellMoves[(size, symbol)] = moves
+    return moves
+
 
 class Matchbox:
     """
@@ -29,8 +52,17 @@ class Matchbox:
     _board: Board
     # the symbol this matchbox will play; one of Move.NOUGHT or Move.CROSS
     _symbol: str
-    # each legal move and the beads remaining
-    _moves: dict[Move: int]
+    # the beads remaining for each cell of the board, where 0 means the move isn't in the matchbox
+    _beads: array
+    # a Fenwick tree (binary indexed tree) over _beads, so moves can be chosen in O(log n); _tree[i] holds the sum of
+    # _beads[i - (i & -i)] through _beads[i - 1]
+    _tree: array
+    # the total number of beads in the matchbox
+    _total: int
+    # the largest power of 2 that's at most the number of cells; where searching _tree starts
+    _step: int
+    # the Move for each cell, with this matchbox's symbol
+    _cellMoves: tuple[Move, ...]
 
     def __init__(self, board: Board, symbol: str, generateMoves: bool = True):
         """
@@ -42,7 +74,12 @@ class Matchbox:
         """
         self._board = copy(board)
         self._symbol = symbol
-        self._moves = dict()
+        cells = board.size() * board.size()
+        self._beads = array("l", [0]) * cells
+        self._tree = array("l", [0]) * (cells + 1)
+        self._total = 0
+        self._step = 1 << (cells.bit_length() - 1) if cells > 0 else 0
+        self._cellMoves = cellMoves(board.size(), symbol)
         if generateMoves:
             self._generateLegalMoves()
 
@@ -64,7 +101,7 @@ class Matchbox:
             board.makeMove(Move(row, column, moveSymbol))
         # at this point we have enough information to make the matchbox
         box = cls(board, symbol, generateMoves=False)
-        # reconstruct _moves
+        # reconstruct _beads
         # remove the outer curly brackets
         movesString = movesString.lstrip("{").rstrip("}")
         # split each entry of the dictionary
@@ -80,29 +117,76 @@ class Matchbox:
             # split up the row and column, and convert to an integer
             row, column = moveString.split(", ")
             row, column = int(row), int(column)
-            # create the move and add it to _moves
-            move = Move(row, column, moveSymbol)
-            box._moves[move] = int(beads)
+            # add the beads for the move's cell
+            box._beads[column + row * board.size()] = int(beads)
+        box._rebuildTree()
         # since this is a class method, we need to return the box we constructed
         return box
 
-    def makeMove(self, board: Board) -> Move:
+    @classmethod
+    def fromBeads(cls, board: Board, symbol: str, beads: Sequence[int]) -> Matchbox:
+        """
+        Constructs and returns a Matchbox with the given number of beads for each cell
+        :param board: The Board to put on the matchbox
+        :param symbol: The move MENACE will make on this board; one of Move.NOUGHT or Move.CROSS
+        :param beads: the beads for each cell of the board, in the same order as beads(); 0 for cells that aren't moves
+        :return: the Matchbox that is created
+        """
+        box = cls(board, symbol, generateMoves=False)
+        box._beads = array("l", beads)
+        box._rebuildTree()
+        return box
+
+    def makeMove(self, board: Board, symmetry: int | None = None) -> Move:
         """
         Makes a random move on the given board, with the weights of each option dictated by the beads for each move
         :param board: the Board to make a move on
+        :param symmetry: the number of the symmetry that turns the given board into this Matchbox's board, if the
+        caller already knows it (e.g. from Board.canonicalKey); if not provided, it's looked up with Board.symmetryTo
+        :return: the move, in this Matchbox's orientation (the given board is never rotated or reflected)
         """
         # get a random move
-        move = choices(tuple(self._moves.keys()), tuple(self._moves.values()))[0]
-
-        # make the move
-        # transform the given board so the move is legal
-        transformation = board.transformationTo(self._board)
-        board.applyTransformation(transformation)
-        board.makeMove(move)
-        # undo the transformation so it looks like it did before
-        board.applyTransformation(transformation.getInverse())
-        # report the move we made so we can learn from it later
-        return move
+        cell = self._sample()
+
+        # the move is for this Matchbox's board, so find the cell it's in on the given board; the symmetry moves the
+        # symbol in cell sources[symmetry][cell] of the given board into cell of ours
+        if symmetry is None:
+            symmetry = board.symmetryTo(self._board)
+        board.makeMove(self._cellMoves[Symmetry.sources(self._board.size())[symmetry][cell]])
+        # report the move in this Matchbox's orientation so we can learn from it later
+        return self._cellMoves[cell]
+
+    def beads(self) -> array:
+        """
+        :return: a copy of the number of beads for each cell of the board, counting across each row from the top left;
+        cells that aren't moves in this matchbox have 0 beads
+        """
+        return array("l", self._beads)
+
+    def symbol(self) -> str:
+        """
+        :return: the symbol this matchbox plays
+        """
+        return self._symbol
+
+    def size(self) -> int:
+        """
+        :return: the size of this matchbox's board
+        """
+        return self._board.size()
+
+    def merge(self, deltas: dict[int: int]) -> None:
+        """
+        Adds or removes beads for several cells at once, e.g. to merge what a copy of this Matchbox learned elsewhere.
+        Cells can't go below 0 beads, and if no beads are left at all, the matchbox is reset.
+        :param deltas: the number of beads to add to each cell, keyed by the cell's index; negative values remove beads
+        """
+        beads = self._beads
+        for cell, delta in deltas.items():
+            beads[cell] = max(0, beads[cell] + delta)
+        self._rebuildTree()
+        if self._total == 0:
+            self._generateLegalMoves()
 
     def sum(self) -> int:
         """
@@ -110,6 +194,23 @@ class Matchbox:
         """
         return self._board.sum()
 
+    def canonicalKey(self) -> tuple[int, int]:
+        """
+        :return: the canonical key of this Matchbox's board, and the symmetry that takes the board to it, as described
+        in Board.canonicalKey
+        """
+        return self._board.canonicalKey()
+
+    def applySymmetry(self, symmetry: int) -> None:
+        """
+        Rotates or reflects this Matchbox's board, moving the beads for each move along with it
+        :param symmetry: the number of the symmetry to apply, as described in Symmetry
+        """
+        self._board.applySymmetry(symmetry)
+        beads = self._beads
+        self._beads = array("l", [beads[i] for i in Symmetry.sources(self._board.size())[symmetry]])
+        self._rebuildTree()
+
     def learnFromWin(self, move: Move) -> None:
         """
         Adjusts the Matchbox to reflect that we won, making the given move more likely to be chosen in the future
@@ -154,16 +255,56 @@ class Matchbox:
         :param adjustment: the number of beads to add; negative values remove beads
         :return:
         """
-        try:
-            self._moves[move] += adjustment
-            # if this bead has no moves left, remove it
-            if self._moves[move] <= 0:
-                self._moves.pop(move)
-            # if there are no moves left at all, reset the matchbox
-            if len(self._moves) == 0:
-                self._generateLegalMoves()
-        except KeyError:
-            raise InvalidMoveError(f"Move {move} is illegal on board state \n{self._board}!") from None
+        row, column = move.position()
+        size = self._board.size()
+        cell = column + row * size
+        if move.symbol() != self._symbol or not 0 <= row < size or not 0 <= column < size or self._beads[cell] <= 0:
+            raise InvalidMoveError(f"Move {move} is illegal on board state \n{self._board}!")
+        # if this move has no beads left, remove it
+        adjustment = max(adjustment, -self._beads[cell])
+        self._beads[cell] += adjustment
+        self._total += adjustment
+        # update every node in the tree that covers this cell
+        tree = self._tree
+        i = cell + 1
+        while i < len(tree):
+            tree[i] += adjustment
+            i += i & -i
+        # if there are no moves left at all, reset the matchbox
+        if self._total == 0:
+            self._generateLegalMoves()
+
+    def _sample(self) -> int:
+        """
+        Picks a random cell, with the chance of each cell proportional to its beads
+        :return: the index of the cell that was picked
+        """
+        # find the first cell where the running total of beads passes target, by walking down the tree
+        target = randrange(self._total)
+        tree = self._tree
+        position = 0
+        step = self._step
+        while step:
+            node = position + step
+            if node < len(tree) and tree[node] <= target:
+                position = node
+                target -= tree[node]
+            step >>= 1
+        return position
+
+    def _rebuildTree(self) -> None:
+        """
+        Recomputes _tree and _total from _beads
+        """
+        tree = self._tree
+        tree[0] = 0
+        tree[1:] = self._beads
+        # push each node's sum up to its parent
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._total = sum(self._beads)
 
     def label(self) -> str:
         """
@@ -181,39 +322,29 @@ class Matchbox:
         return tuple(labels)
     def _generateLegalMoves(self) -> None:
         """
-        Populates self._moves with every legal move
+        Populates self._beads with every distinct legal move. Two moves are the same if a symmetry that leaves the board
+        alone takes one to the other, so the empty cells are split into orbits under the board's stabilizer (see
+        Board.stabilizer) and the first cell of each orbit gets beads.
         """
+        timing = instruments.enabled
+        if timing:
+            start = instruments.clock()
         board = self._board
-        # add an entry in _moves for each legal move
-        # keep track of which possible moves are legal
-        legalMoves = []
-        for row in range(board.size()):
-            for column in range(board.size()):
-                # check that the move is legal
-                move = Move(row, column, self._symbol)
-                if board.legalMove(move):
-                    legalMoves.append(move)
-
-        # check that each move we add is distinct
-        # keep track of which moves we've added so we can only add distinct moves
-        addedMoves = []
-        for move in legalMoves:
-            distinct = True
-            # make the move we're checking
-            currentBoard = copy(board)
-            currentBoard.makeMove(move)
-            # make each move we've added and see if the boards are equivalent;
-            # if the boards are equivalent, so are the moves
-            for addedMove in addedMoves:
-                addedBoard = copy(board)
-                addedBoard.makeMove(addedMove)
-                distinct = distinct and not currentBoard.isEquivalentTo(addedBoard)
-                if not distinct:
-                    break
-            # if the legal move is distinct, add it
-            if distinct:
-                self._moves[move] = Matchbox.BEADS
-                addedMoves.append(move)
+        destinations = Symmetry.destinations(board.size())
+        stabilizer = [destinations[symmetry] for symmetry in board.stabilizer()]
+        beads = self._beads
+        # the cells in the orbit of a cell that already has beads
+        covered = [False] * len(beads)
+        for cell in range(len(beads)):
+            beads[cell] = 0
+            if covered[cell] or not board.legalMove(self._cellMoves[cell]):
+                continue
+            beads[cell] = Matchbox.BEADS
+            for permutation in stabilizer:
+                covered[permutation[cell]] = True
+        self._rebuildTree()
+        if timing:
+            instruments.stop("Matchbox._generateLegalMoves", start)
 
     def __repr__(self) -> str:
         """
@@ -221,7 +352,8 @@ class Matchbox:
         """
         board = str(self._board)
         board = "".join(board.split("\n"))
-        return f"{board}; {self._symbol}; {self._moves}"
+        moves = ", ".join([f"{self._cellMoves[cell]}: {beads}" for cell, beads in enumerate(self._beads) if beads > 0])
+        return f"{board}; {self._symbol}; {{{moves}}}"
 
     def __eq__(self, other: Matchbox) -> bool:
         """
@@ -237,7 +369,7 @@ class Matchbox:
         :param other: The matchbox to compare against
         :return: True if this matchbox has more symbols than the other, False otherwise
         """
-        return self._board > other._board
+        return self.sum() > other.sum()
 
     def __ge__(self, other: Matchbox) -> bool:
         """
@@ -245,7 +377,7 @@ class Matchbox:
         :param other: the matchbox to compare against
         :return: True if this matchbox is at least as far into the game as the other, False otherwise
         """
-        return self._board >= other._board
+        return self.sum() >= other.sum()
 
     def __lt__(self, other: Matchbox) -> bool:
         """
@@ -253,7 +385,7 @@ class Matchbox:
         :param other: the matchbox to compare against
         :return: True if this matchbox has fewer symbols than the other, False otherwise
         """
-        return self._board < other._board
+        return self.sum() < other.sum()
 
     def __le__(self, other: Matchbox) -> bool:
         """
@@ -261,7 +393,7 @@ class Matchbox:
         :param other: the matchbox to compare against
         :return: True if this matchbox has at most as many symbols as the other, False otherwise
         """
-        return self._board <= other._board
+        return self.sum() <= other.sum()
 
     def __ne__(self, other: Matchbox) -> bool:
         """
@@ -272,7 +404,27 @@ class Matchbox:
         return self._board != other._board
 
 
+def testDistinctMoves(size: int = 3) -> None:
+    """
+    Checks that the moves each matchbox starts with are the same as keeping one move for each distinct board the moves
+    lead to, for every position in a game on a board of the given size
+    :param size: the size of board to test
+    """
+    from StateSpace import enumeratePositions
+    for key, board in enumeratePositions(size):
+        symbol = Move.CROSS if board.sum() % 2 == 0 else Move.NOUGHT
+        expected: list[Board] = []
+        for move in cellMoves(size, symbol):
+            if board.legalMove(move):
+                board.push(move)
+                if not any(board.isEquivalentTo(other) for other in expected):
+                    expected.append(copy(board))
+                board.pop()
+        assert sum(1 for beads in Matchbox(board, symbol).beads() if beads > 0) == len(expected)
+
+
 def main():
+    testDistinctMoves()
     b1 = Board()
     b2 = Board()
     for i in range(9):
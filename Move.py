@@ -9,6 +9,11 @@ from typing import Tuple
 
 
 class Move:
+    """
+    An immutable move: there is only ever one Move for each row, column, and symbol, so Moves can be shared between
+    Matchboxes, compared by value, and used as dictionary keys.
+    """
+    __slots__ = ("_row", "_column", "_symbol", "_hash")
     # class variables that determine the character to be used for O, X, and nothing
     NOUGHT = "O"
     CROSS = "X"
@@ -18,17 +23,31 @@ class Move:
     _column: int
     # the symbol of the move to make: one of Board.X or Board.O
     _symbol: str
+    # the hash of this Move's position, computed once since it never changes
+    _hash: int
+    # the one Move for each (row, column, symbol) that's been created so far
+    _moves: dict[tuple[int, int, str], Move] = dict()
 
-    def __init__(self, row: int, column: int, symbol: str):
+    def __new__(cls, row: int, column: int, symbol: str) -> Move:
         """
-        Creates a Move
+        Creates a Move, or returns the existing one if a Move with the same position and symbol was already created
         :param row: the row number of the move, with the top being row 0 and increasing by 1 for each row down
         :param column: the column of the move, with the left being column 0 and increasing by 1 for each column right
         :param symbol: the symbol of the player that made this move; should be one of Move.NOUGHT or Move.CROSS
         """
-        self._row = row
-        self._column = column
-        self._symbol = symbol
+        key = (row, column, symbol)
+        try:
+            return Move._moves[key]
+        except KeyError:
+            pass
+        move = super().__new__(cls)
+        # __setattr__ is disabled to keep Moves immutable, so set the attributes directly
+        object.__setattr__(move, "_row", row)
+        object.__setattr__(move, "_column", column)
+        object.__setattr__(move, "_symbol", symbol)
+        object.__setattr__(move, "_hash", hash((row, column)))
+        Move._moves[key] = move
+        return move
 
     def position(self) -> Tuple[int, int]:
         """
@@ -42,9 +61,75 @@ class Move:
         """
         return self._symbol
 
+    def index(self, size: int) -> int:
+        """
+        :param size: the number of cells across the board
+        :return: the index of this move's cell on a board of the given size, counting across each row from the top left
+        """
+        return self._column + self._row * size
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"Move {self} can't be changed")
+
+    def __eq__(self, other: Move) -> bool:
+        """
+        :param other: the Move to compare against
+        :return: True if the moves have the same position and symbol, False otherwise
+        """
+        if self is other:
+            return True
+        if not isinstance(other, Move):
+            return NotImplemented
+        return self._row == other._row and self._column == other._column and self._symbol == other._symbol
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __copy__(self) -> Move:
+        # Moves never change, so there's no need to copy them
+        return self
+
+    def __deepcopy__(self, memo: dict) -> Move:
+        return self
+
+    def __reduce__(self) -> tuple:
+        # rebuild through __new__ so unpickled Moves are shared like any other
+        return Move, (self._row, self._column, self._symbol)
+
     def __repr__(self) -> str:
         """
         :return: A string of the format '(row, column): symbol'
         """
         return f"{self.position()}: {self.symbol()}"
 
+
+def testMoves() -> None:
+    """
+    Tests that Moves are shared, compare and hash by value, can't be changed, and stay shared through copying and
+    pickling
+    """
+    import pickle
+    from copy import copy, deepcopy
+    move = Move(1, 2, Move.CROSS)
+    assert Move(1, 2, Move.CROSS) is move
+    assert Move(1, 2, Move.NOUGHT) is not move and Move(1, 2, Move.NOUGHT) != move
+    assert Move(2, 1, Move.CROSS) != move
+    assert {move: True}[Move(1, 2, Move.CROSS)]
+    assert move.position() == (1, 2) and move.symbol() == Move.CROSS and move.index(3) == 5
+    assert copy(move) is move and deepcopy([move])[0] is move
+    assert pickle.loads(pickle.dumps(move)) is move
+    try:
+        move._row = 0
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("Moves shouldn't be changeable")
+    assert move.position() == (1, 2)
+
+
+def main():
+    testMoves()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+#
+# ParallelTrainer.py
+# 18 October 2026
+#
+
+from __future__ import annotations
+import multiprocessing
+import os
+import pickle
+import random
+from multiprocessing.connection import Connection
+from time import perf_counter
+from typing import Sequence
+from Game import Game
+from MENACE import MENACE
+from Move import Move
+from Checkpoint import Checkpointer
+from Trainer import TrainingResults, Convergence
+
+
+def _work(connection: Connection, player1: MENACE, player2: MENACE, size: int, k: int | None) -> None:
+    """
+    Runs in a worker process for the whole of training, keeping its own copies of both MENACEs from round to round.
+    Each round, it's sent every worker's deltas from the round before (see _playRound), which it merges into its copies
+    the same way the parent merges them into the originals, so its copies start every round the same as the originals.
+    It replies with the results of _playRound, or the exception that stopped it; None tells it to stop.
+    :param connection: the worker's end of a pipe to the parent
+    :param player1: the worker's copy of the MENACE that goes first
+    :param player2: the worker's copy of the MENACE that goes second
+    :param size: the size of the board to play on
+    :param k: how many in a row wins, or None for the whole width of the board
+    """
+    game = Game(player1, player2, size, k)
+    # the canonical key of each matchbox, by id, so each is only worked out once for the whole of training
+    keys: dict[int, int] = dict()
+    while True:
+        task = connection.recv()
+        if task is None:
+            return
+        games, seed, merged = task
+        try:
+            for deltas1, deltas2 in pickle.loads(merged):
+                player1.merge(deltas1, size, k)
+                player2.merge(deltas2, size, k)
+            result = _playRound(game, (player1, player2), games, seed, keys)
+        except Exception as error:
+            result = error
+        connection.send(result)
+
+
+def _playRound(game: Game, players: tuple[MENACE, MENACE], games: int, seed: str | None,
+               keys: dict[int, int]) -> tuple[list[str | None], dict, dict]:
+    """
+    Plays the given number of games in a worker, with both MENACEs learning after each one as usual, and keeps track of
+    how many beads each matchbox gained or lost along the way; then takes all of that learning back out of the
+    matchboxes, so the MENACEs are as they were at the start of the round
+    :param game: the game to play, between the two MENACEs
+    :param players: the MENACE that goes first and the MENACE that goes second
+    :param games: the number of games to play
+    :param seed: the seed for the random number generator, or None to leave it alone
+    :param keys: the canonical key of each matchbox seen so far, by id; new ones are added
+    :return: the winner of each game, and how many more (or fewer) beads each MENACE ended up with in each cell of each
+    of its matchboxes, keyed by the canonical key of the matchbox's board and then by cell. These are the differences
+    between the bead counts before and after the games, so they include any beads that couldn't be removed and any
+    matchboxes that were reset.
+    """
+    if seed is not None:
+        random.seed(seed)
+    winners: list[str | None] = []
+    # each matchbox that was played from and the beads it had before the round, keyed by id
+    initial: tuple[dict, dict] = (dict(), dict())
+    for i in range(games):
+        winner = game.playGame(None)
+        winners.append(winner)
+        for player, playerInitial in zip(players, initial):
+            for move, matchbox in player.movesMade():
+                if id(matchbox) not in playerInitial:
+                    playerInitial[id(matchbox)] = (matchbox, matchbox.beads().tolist())
+            player.learn(winner)
+    deltas: tuple[dict, dict] = (dict(), dict())
+    for playerInitial, playerDeltas in zip(initial, deltas):
+        for boxId, (matchbox, before) in playerInitial.items():
+            cells = {cell: after - start for cell, (start, after) in enumerate(zip(before, matchbox.beads()))
+                     if after != start}
+            if cells:
+                key = keys.get(boxId)
+                if key is None:
+                    key = keys[boxId] = matchbox.canonicalKey()[0]
+                playerDeltas[key] = cells
+                # every bead count was at least 0 before, so this puts back exactly what the matchbox had
+                matchbox.merge({cell: -change for cell, change in cells.items()})
+    return winners, deltas[0], deltas[1]
+
+
+class ParallelTrainer:
+    """
+    Trains two MENACEs on several processes at once. Each worker process starts with a copy of both MENACEs. Each round,
+    every worker plays its share of games with its copies learning as usual, and sends back how many beads each matchbox
+    gained or lost. Then those are merged back into the original MENACEs, in worker order, and sent on to every worker
+    with its next share, so the copies catch up without the whole MENACEs being sent again. With one worker, this trains
+    the MENACEs exactly as Trainer would.
+    """
+    _players: tuple[MENACE, MENACE]
+    _size: int
+    # how many in a row wins, or None for the whole width of the board
+    _k: int | None
+    # the number of worker processes
+    _workers: int
+    # the number of games each worker plays between merges
+    _syncEvery: int
+    # the seed for the random number generators, or None if runs don't need to be reproducible
+    _seed: int | None
+    _checkpointers: Sequence[Checkpointer]
+
+    def __init__(self, player1: MENACE, player2: MENACE, size: int = 3, workers: int | None = None,
+                 syncEvery: int = 1000, seed: int | None = None, checkpointers: Sequence[Checkpointer] = (),
+                 k: int | None = None):
+        """
+        :param player1: the MENACE that goes first; it will play X
+        :param player2: the MENACE that goes second; it will play O
+        :param size: the size of the board to play on; defaults to 3
+        :param workers: the number of worker processes; defaults to the number of CPUs
+        :param syncEvery: the number of games each worker plays before its beads are merged; defaults to 1000
+        :param seed: if provided, each worker seeds its random number generator from this, the round, and its number, so
+        the same seed, workers, and syncEvery always train the MENACEs the same way
+        :param checkpointers: a Checkpointer for each MENACE that should be saved during and after training
+        :param k: how many in a row wins; defaults to size
+        """
+        player1.setSymbol(Move.CROSS)
+        player2.setSymbol(Move.NOUGHT)
+        self._players = (player1, player2)
+        self._size = size
+        self._k = k
+        self._workers = workers if workers is not None else os.cpu_count() or 1
+        self._syncEvery = syncEvery
+        self._seed = seed
+        self._checkpointers = checkpointers
+
+    def train(self, games: int | None = None, seconds: float | None = None, convergence: Convergence | None = None,
+              reportEvery: float | None = None) -> TrainingResults:
+        """
+        Plays rounds of games until one of the stop conditions is met. At least one stop condition must be given.
+        Every Checkpointer does a full save once training stops.
+        :param games: the number of games to play
+        :param seconds: how long to train for, in seconds; checked between rounds
+        :param convergence: stops training once the results converge; checked between rounds
+        :param reportEvery: print the number of games played and the games per second this often, in seconds
+        :return: the results of the games
+        :raises ValueError: if no stop condition is given
+        """
+        if games is None and seconds is None and convergence is None:
+            raise ValueError("Training needs at least one stop condition: games, seconds, or convergence")
+        results = TrainingResults()
+        player1, player2 = self._players
+        # the copies sent to the workers can't read from a brain file, so read everything before starting
+        player1.loadAll()
+        player2.loadAll()
+        # fork starts workers faster than spawn, and lets them share the parent's MENACEs until they change instead
+        # of pickling them, where it's available
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+        else:
+            context = multiprocessing.get_context()
+        start = perf_counter()
+        lastReport = start
+        converged = False
+        syncs = 0
+        connections: list[Connection] = []
+        workers: list[multiprocessing.Process] = []
+        try:
+            for i in range(self._workers):
+                connection, workerConnection = context.Pipe()
+                worker = context.Process(target=_work, args=(workerConnection, player1, player2, self._size, self._k),
+                                         name=f"ParallelTrainer worker {i}", daemon=True)
+                worker.start()
+                workerConnection.close()
+                connections.append(connection)
+                workers.append(worker)
+            # every worker's deltas from the last round, pickled once for all of them
+            merged = pickle.dumps([])
+            while not converged:
+                now = perf_counter()
+                if games is not None and results.games() >= games:
+                    break
+                if seconds is not None and now - start >= seconds:
+                    break
+                if reportEvery is not None and now - lastReport >= reportEvery:
+                    print(f"{results.games()} games, {results.games() / (now - start):.1f} games/second")
+                    lastReport = now
+                # split this round's games between the workers
+                remaining = self._workers * self._syncEvery
+                if games is not None:
+                    remaining = min(remaining, games - results.games())
+                shares = [remaining // self._workers + (1 if i < remaining % self._workers else 0)
+                          for i in range(self._workers)]
+                # workers without any games still need the deltas to stay in step
+                for i, (connection, share) in enumerate(zip(connections, shares)):
+                    connection.send((share, None if self._seed is None else f"{self._seed}:{syncs}:{i}", merged))
+                rounds = []
+                for connection in connections:
+                    result = connection.recv()
+                    if isinstance(result, Exception):
+                        raise result
+                    rounds.append(result)
+                # merge in worker order so seeded runs are reproducible
+                for winners, deltas1, deltas2 in rounds:
+                    player1.merge(deltas1, self._size, self._k)
+                    player2.merge(deltas2, self._size, self._k)
+                    for winner in winners:
+                        results.record(winner)
+                        if convergence is not None and not converged:
+                            converged = convergence.update(winner)
+                merged = pickle.dumps([(deltas1, deltas2) for winners, deltas1, deltas2 in rounds])
+                for checkpointer in self._checkpointers:
+                    checkpointer.gameFinished(remaining)
+                syncs += 1
+        finally:
+            for connection in connections:
+                try:
+                    connection.send(None)
+                except OSError:
+                    pass
+                connection.close()
+            for worker in workers:
+                worker.join(1)
+                if worker.is_alive():
+                    worker.terminate()
+                    worker.join()
+            results.stop(perf_counter() - start, converged)
+            for checkpointer in self._checkpointers:
+                checkpointer.close()
+        return results
+
+
+def _beads(player: MENACE) -> dict[tuple[int, int], list[int]]:
+    """
+    :return: the beads in each of the player's matchboxes, keyed by board size and canonical key
+    """
+    return {(box.size(), box.canonicalKey()[0]): list(box.beads()) for box in player.matchboxes()}
+
+
+def testOneWorker() -> None:
+    """
+    Tests that one worker playing one round trains the MENACEs exactly as Trainer does with the same random numbers,
+    including matchboxes that ran out of beads and were reset
+    """
+    from Trainer import Trainer
+    parallel = (MENACE("Test 1"), MENACE("Test 2"))
+    ParallelTrainer(parallel[0], parallel[1], workers=1, syncEvery=2000, seed=1).train(games=2000)
+    serial = (MENACE("Test 1"), MENACE("Test 2"))
+    random.seed("1:0:0")
+    Trainer(serial[0], serial[1]).train(games=2000)
+    for p, s in zip(parallel, serial):
+        parallelBeads = _beads(p)
+        serialBeads = _beads(s)
+        # the serial MENACEs also have matchboxes they looked at but never learned in, which still have their
+        # starting beads; everything else must match
+        assert set(parallelBeads) <= set(serialBeads)
+        for key, beads in serialBeads.items():
+            assert parallelBeads.get(key, beads) == beads
+
+
+def testRounds() -> None:
+    """
+    Tests that a worker's copies stay in step with the original MENACEs from round to round: one worker playing several
+    rounds trains the MENACEs exactly as Trainer does when reseeded the same way each round
+    """
+    from Trainer import Trainer
+    parallel = (MENACE("Test 1"), MENACE("Test 2"))
+    ParallelTrainer(parallel[0], parallel[1], workers=1, syncEvery=300, seed=3).train(games=1500)
+    serial = (MENACE("Test 1"), MENACE("Test 2"))
+    trainer = Trainer(serial[0], serial[1])
+    for syncs in range(5):
+        random.seed(f"3:{syncs}:0")
+        trainer.train(games=300)
+    for p, s in zip(parallel, serial):
+        parallelBeads = _beads(p)
+        for key, beads in _beads(s).items():
+            assert parallelBeads.get(key, beads) == beads
+
+
+def testLazyBrain() -> None:
+    """
+    Tests that MENACEs loaded lazily from binary brains can be trained on several workers, and end up with every
+    matchbox from their files
+    """
+    import tempfile
+    from Trainer import Trainer
+    players = (MENACE("Test 1"), MENACE("Test 2"))
+    Trainer(players[0], players[1]).train(games=200)
+    with tempfile.TemporaryDirectory() as directory:
+        loaded = []
+        for i, player in enumerate(players):
+            filename = os.path.join(directory, f"brain{i}.brain")
+            player.save(filename)
+            loaded.append(MENACE.fromBinary(filename))
+        results = ParallelTrainer(loaded[0], loaded[1], workers=2, syncEvery=100, seed=2).train(games=1000)
+    assert results.games() == 1000
+    for player, trained in zip(players, loaded):
+        assert set(_beads(player)) <= set(_beads(trained))
+
+
+def measureSpeed(games: int = 100000, workers: Sequence[int] | None = None) -> None:
+    """
+    Prints how many games per second Trainer and ParallelTrainer play, from fresh MENACEs, for each number of workers
+    :param games: the number of games to play each time
+    :param workers: the numbers of workers to try; defaults to 1, 2, 4, ... up to the number of CPUs
+    """
+    from Trainer import Trainer
+    if workers is None:
+        cpus = os.cpu_count() or 1
+        workers = [1 << i for i in range(cpus.bit_length()) if 1 << i <= cpus]
+    random.seed(0)
+    serial = Trainer(MENACE("Menace 1"), MENACE("Menace 2")).train(games=games)
+    print(f"Trainer: {serial.gamesPerSecond():.0f} games/second")
+    for count in workers:
+        results = ParallelTrainer(MENACE("Menace 1"), MENACE("Menace 2"), workers=count, seed=0).train(games=games)
+        print(f"ParallelTrainer, {count} worker{'s' if count != 1 else ''}: {results.gamesPerSecond():.0f} "
+              f"games/second ({results.gamesPerSecond() / serial.gamesPerSecond():.2f}x Trainer)")
+
+
+def main():
+    testOneWorker()
+    testRounds()
+    testLazyBrain()
+    measureSpeed()
+
+
+if __name__ == "__main__":
+    main()
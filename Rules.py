@@ -0,0 +1,193 @@
+#
+# Rules.py
+# 18 October 2026
+#
+
+from __future__ import annotations
+from typing import Sequence
+from util import InvalidDimensionsError
+
+# the direction of each kind of line, as (rows down, columns right) per cell: across, down, diagonally down and to the
+# right, and diagonally up and to the right
+_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (-1, 1))
+
+
+class Rules:
+    """
+    The rules for winning an m,n,k game: a board with rows rows and columns columns, where the first player to get k
+    of their symbols in a row across, down, or diagonally wins. Regular Tic-Tac-Toe is 3,3,3. Every winning line is
+    worked out once, when the Rules for a configuration are first made, and the same Rules are handed out for the same
+    configuration after that.
+    """
+    # every Rules made so far, keyed by (rows, columns, k), so each configuration is only worked out once
+    _rules: dict[tuple[int, int, int], Rules] = dict()
+
+    _rows: int
+    _columns: int
+    _k: int
+    # the cells in each winning line, counting across each row from the top left: every stretch of k cells across,
+    # then down, then diagonally down and to the right, then diagonally up and to the right. when k is the whole width
+    # of a square board, that's each row, each column, the main diagonal, then the alternate diagonal.
+    _lines: tuple[tuple[int, ...], ...]
+    # for each line, a bitmask with bit i set if cell i is in it
+    _masks: tuple[int, ...]
+    # for each cell, the number of each line through it
+    _linesThrough: tuple[tuple[int, ...], ...]
+    # for each permutation of the cells that lineSource has seen, which line each line's cells come from
+    _lineSources: dict[tuple[int, ...], tuple[int, ...] | None]
+
+    def __new__(cls, rows: int, columns: int, k: int | None = None) -> Rules:
+        """
+        :param rows: the number of rows on the board
+        :param columns: the number of columns on the board
+        :param k: how many in a row wins; defaults to the smaller of rows and columns
+        :raises InvalidDimensionsError: if the board is empty, or k is less than 1 or doesn't fit on the board
+        """
+        if k is None:
+            k = min(rows, columns)
+        try:
+            return cls._rules[(rows, columns, k)]
+        except KeyError:
+            pass
+        if rows < 1 or columns < 1:
+            raise InvalidDimensionsError(f"A board can't have {rows} rows and {columns} columns")
+        if not 1 <= k <= max(rows, columns):
+            raise InvalidDimensionsError(f"{k} in a row can't fit on a {rows}x{columns} board")
+        rules = super().__new__(cls)
+        rules._rows = rows
+        rules._columns = columns
+        rules._k = k
+        lines: list[tuple[int, ...]] = []
+        for rowStep, columnStep in _DIRECTIONS:
+            for row in range(rows):
+                for column in range(columns):
+                    endRow = row + rowStep * (k - 1)
+                    endColumn = column + columnStep * (k - 1)
+                    if 0 <= endRow < rows and endColumn < columns:
+                        lines.append(tuple((column + columnStep * i) + columns * (row + rowStep * i)
+                                           for i in range(k)))
+        # a single cell is a line in every direction at once, so only keep one of each
+        rules._lines = tuple(dict.fromkeys(lines)) if k == 1 else tuple(lines)
+        rules._masks = tuple(sum(1 << cell for cell in line) for line in rules._lines)
+        rules._linesThrough = tuple(tuple(number for number, line in enumerate(rules._lines) if cell in line)
+                                    for cell in range(rows * columns))
+        rules._lineSources = dict()
+        cls._rules[(rows, columns, k)] = rules
+        return rules
+
+    def rows(self) -> int:
+        """
+        :return: the number of rows on the board
+        """
+        return self._rows
+
+    def columns(self) -> int:
+        """
+        :return: the number of columns on the board
+        """
+        return self._columns
+
+    def k(self) -> int:
+        """
+        :return: how many in a row wins
+        """
+        return self._k
+
+    def lines(self) -> tuple[tuple[int, ...], ...]:
+        """
+        :return: the cells in each winning line, as described in _lines
+        """
+        return self._lines
+
+    def masks(self) -> tuple[int, ...]:
+        """
+        :return: a bitmask for each winning line, in the same order as lines, with bit i set if cell i is in the line
+        """
+        return self._masks
+
+    def linesThrough(self, cell: int) -> tuple[int, ...]:
+        """
+        :param cell: the cell, counting across each row from the top left
+        :return: the number of each line that goes through the cell; only these lines can be completed by a move there
+        """
+        return self._linesThrough[cell]
+
+    def allLinesThrough(self) -> tuple[tuple[int, ...], ...]:
+        """
+        :return: linesThrough for every cell, in order
+        """
+        return self._linesThrough
+
+    def winner(self, grid: Sequence[str], blank: str) -> str | None:
+        """
+        Checks every line on a board for a winner, for any symbol
+        :param grid: the symbol in each cell, counting across each row from the top left
+        :param blank: the symbol for an empty cell
+        :return: the symbol that fills the first full line, or None if no line is full
+        """
+        for line in self._lines:
+            symbol = grid[line[0]]
+            if symbol != blank and all(grid[cell] == symbol for cell in line):
+                return symbol
+        return None
+
+    def lineSource(self, source: tuple[int, ...]) -> tuple[int, ...] | None:
+        """
+        Works out (or looks up) how a permutation of the cells moves the winning lines; every symmetry of a square
+        board moves each line onto another line, so e.g. counts for each line can be moved instead of counted again
+        :param source: source[cell] is the cell whose symbol ends up in cell
+        :return: for each line, the line whose symbols end up in it, or None if some line's symbols don't all come
+        from one line
+        """
+        try:
+            return self._lineSources[source]
+        except KeyError:
+            pass
+        numbers = {frozenset(line): number for number, line in enumerate(self._lines)}
+        result: list[int] | None = []
+        for line in self._lines:
+            number = numbers.get(frozenset(source[cell] for cell in line))
+            if number is None:
+                result = None
+                break
+            result.append(number)
+        self._lineSources[source] = tuple(result) if result is not None else None
+        return self._lineSources[source]
+
+    def __reduce__(self):
+        """
+        :return: how to pickle these Rules, so unpickling hands out the shared Rules for the configuration
+        """
+        return Rules, (self._rows, self._columns, self._k)
+
+    def __repr__(self) -> str:
+        return f"Rules({self._rows}, {self._columns}, {self._k})"
+
+
+def testRules() -> None:
+    """
+    Checks that full-width lines on square boards match the rows, columns, and diagonals Board.winner used to check,
+    and counts the lines for a few m,n,k games
+    """
+    for size in range(1, 7):
+        rows = [tuple(column + size * row for column in range(size)) for row in range(size)]
+        columns = [tuple(column + size * row for row in range(size)) for column in range(size)]
+        diagonals = [tuple(i * (size + 1) for i in range(size)),
+                     tuple((size - 1) * size - i * (size - 1) for i in range(size))]
+        expected = rows + columns + diagonals
+        if size == 1:
+            expected = expected[:1]
+        assert [set(line) for line in Rules(size, size).lines()] == [set(line) for line in expected]
+    # 5x5 with 4 in a row: 2 per row and column, 4 diagonals each way
+    assert len(Rules(5, 5, 4).lines()) == 2 * 5 + 2 * 5 + 4 + 4
+    # Connect Four's board: 69 ways to win
+    assert len(Rules(6, 7, 4).lines()) == 69
+    assert Rules(5, 5, 4) is Rules(5, 5, 4)
+
+
+def main():
+    testRules()
+
+
+if __name__ == "__main__":
+    main()
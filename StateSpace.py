@@ -0,0 +1,122 @@
+#
+# StateSpace.py
+# 18 October 2026
+#
+
+from __future__ import annotations
+from typing import Iterator
+from BitBoard import BitBoard
+from MENACE import MENACE
+from Matchbox import Matchbox
+from Move import Move
+
+
+def enumeratePositions(size: int = 3, k: int | None = None) -> Iterator[tuple[int, BitBoard]]:
+    """
+    Walks every position that can come up in a game on a board of the given size, one turn at a time, with X going
+    first. Only one position out of each set that are equivalent up to rotations and reflections is visited, since
+    they all lead to equivalent positions.
+    :param size: the number of cells across the board; defaults to 3
+    :param k: how many in a row wins; defaults to size
+    :return: an iterator over the canonical key (see Board.canonicalKey) and the board in its canonical orientation of
+    every position where the game isn't over yet, earlier turns first
+    """
+    symbols = (Move.CROSS, Move.NOUGHT)
+    # the canonical key of every position with the current number of moves
+    turn = 0
+    positions = {BitBoard(size, k).canonicalKey()[0]}
+    while positions:
+        children: set[int] = set()
+        symbol = symbols[turn % 2]
+        for key in sorted(positions):
+            board = BitBoard.fromKey(key, size, k)
+            if board.isOver():
+                continue
+            yield key, board
+            for cell in range(size * size):
+                move = Move(cell // size, cell % size, symbol)
+                if board.legalMove(move):
+                    board.push(move)
+                    children.add(board.canonicalKey()[0])
+                    board.pop()
+        positions = children
+        turn += 1
+
+
+def buildBrain(size: int = 3, symbol: str = Move.CROSS, name: str = "MENACE", skipForced: bool = False,
+               k: int | None = None) -> MENACE:
+    """
+    Makes a MENACE with a matchbox for every position it could ever have to move in, so it never has to make one while
+    playing
+    :param size: the number of cells across the board; defaults to 3
+    :param symbol: the symbol MENACE plays; X moves when an even number of moves have been made and O otherwise.
+    defaults to Move.CROSS
+    :param name: the name to give MENACE; defaults to MENACE
+    :param skipForced: if True, leave out positions with only one distinct move, since MENACE has no choice to learn
+    about there (like Donald Michie's original 304 matchboxes for X); defaults to False
+    :param k: how many in a row wins; defaults to size
+    :return: the new MENACE
+    """
+    menace = MENACE(name, symbol)
+    parity = 0 if symbol == Move.CROSS else 1
+    for key, board in enumeratePositions(size, k):
+        if board.sum() % 2 != parity:
+            continue
+        matchbox = Matchbox(board, symbol)
+        if skipForced and sum(1 for beads in matchbox.beads() if beads > 0) == 1:
+            continue
+        menace.addMatchbox(matchbox)
+    return menace
+
+
+def testCounts() -> None:
+    """
+    Tests the number of positions on a 3x3 board against the well-known counts: 765 positions up to rotations and
+    reflections, 138 of them finished, and Donald Michie's 304 matchboxes for X
+    """
+    assert sum(1 for position in enumeratePositions()) == 765 - 138
+    assert len(list(buildBrain(skipForced=True).matchboxes())) == 304
+    assert len(list(buildBrain().matchboxes())) == 338
+
+
+def testComplete(size: int = 3, k: int | None = None, games: int = 200) -> None:
+    """
+    Tests that MENACEs built from the state space never need a new matchbox, however the games go
+    :param size: the size of board to test
+    :param k: how many in a row wins; defaults to size
+    :param games: the number of games to play
+    """
+    import random
+    from Game import Game
+    random.seed(size)
+    players = (buildBrain(size, Move.CROSS, k=k), buildBrain(size, Move.NOUGHT, k=k))
+    counts = [len(list(player.matchboxes())) for player in players]
+    game = Game(players[0], players[1], size, k)
+    for i in range(games):
+        winner = game.playGame(None)
+        for player in players:
+            player.learn(winner)
+    assert [len(list(player.matchboxes())) for player in players] == counts
+
+
+def main():
+    import sys
+    arguments = [argument for argument in sys.argv[1:] if argument != "--skip-forced"]
+    if len(sys.argv) == 1:
+        testCounts()
+        testComplete()
+        testComplete(3, 2)
+    elif 1 <= len(arguments) <= 3 and arguments[0].isdigit():
+        # e.g. python StateSpace.py 3 X "MENACE.brain" --skip-forced
+        size = int(arguments[0])
+        symbol = arguments[1] if len(arguments) > 1 else Move.CROSS
+        filename = arguments[2] if len(arguments) > 2 else f"{size}x{size} {symbol}.brain"
+        menace = buildBrain(size, symbol, filename.rsplit(".", 1)[0], "--skip-forced" in sys.argv)
+        menace.save(filename)
+        print(f"Saved {len(list(menace.matchboxes()))} matchboxes to {filename}")
+    else:
+        print(f"usage: python {sys.argv[0]} [size [symbol [filename]] [--skip-forced]]")
+
+
+if __name__ == "__main__":
+    main()
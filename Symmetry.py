@@ -0,0 +1,232 @@
+#
+# Symmetry.py
+# 18 October 2026
+#
+
+from __future__ import annotations
+from Transformation import Transformation, DihedralTransformation
+
+# the number of ways to rotate or reflect a square board onto itself
+SYMMETRIES = 8
+# the symmetry that leaves the board alone
+IDENTITY = 0
+
+# the symmetries are numbered in the same order that Board.transformationTo tries them:
+# 0-3 rotate clockwise by 0, 90, 180, and 270 degrees; 4-7 reflect about a line rotated clockwise from the y-axis by
+# 0, 45, 90, and 135 degrees
+# every reflection is its own inverse, and rotating by 90 and 270 degrees undo each other
+_inverses: tuple[int, ...] = (0, 3, 2, 1, 4, 5, 6, 7)
+
+# the permutations for each board size we've seen, so they only need to be computed once per size
+_destinations: dict[int, tuple[tuple[int, ...], ...]] = dict()
+_sources: dict[int, tuple[tuple[int, ...], ...]] = dict()
+
+# the Transformation for each symmetry of each board size we've been asked about, and the inverse of each, built once
+# and shared by everyone who asks for them afterwards
+_transformations: dict[int, tuple[tuple[Transformation, ...], tuple[Transformation, ...]]] = dict()
+# the size and symmetry of every shared Transformation, keyed by id, so they can be recognized when they come back
+_registered: dict[int, tuple[int, int]] = dict()
+# the number of Transformations handed out from _transformations instead of being built again
+_constructionsAvoided: int = 0
+
+
+def inverse(symmetry: int) -> int:
+    """
+    :param symmetry: the number of the symmetry to undo
+    :return: the number of the symmetry that undoes the given one
+    """
+    return _inverses[symmetry]
+
+
+def _destination(symmetry: int, row: int, column: int, last: int) -> tuple[int, int]:
+    """
+    :param symmetry: the number of the symmetry to apply
+    :param row: the row of the cell to move
+    :param column: the column of the cell to move
+    :param last: the number of the last row and column (i.e. size - 1)
+    :return: the row and column that the symmetry moves the cell to
+    """
+    if symmetry == 0:
+        return row, column
+    elif symmetry == 1:
+        return column, last - row
+    elif symmetry == 2:
+        return last - row, last - column
+    elif symmetry == 3:
+        return last - column, row
+    elif symmetry == 4:
+        return row, last - column
+    elif symmetry == 5:
+        return last - column, last - row
+    elif symmetry == 6:
+        return last - row, column
+    else:
+        return column, row
+
+
+def destinations(size: int) -> tuple[tuple[int, ...], ...]:
+    """
+    Computes (or looks up) where each symmetry sends each cell of a board of the given size.
+    :param size: the number of cells across the board
+    :return: a tuple with one permutation per symmetry, where permutation[cell] is the cell that cell moves to
+    """
+    try:
+        return _destinations[size]
+    except KeyError:
+        pass
+    permutations: list[tuple[int, ...]] = []
+    for symmetry in range(SYMMETRIES):
+        permutation = []
+        for row in range(size):
+            for column in range(size):
+                newRow, newColumn = _destination(symmetry, row, column, size - 1)
+                permutation.append(newColumn + newRow * size)
+        permutations.append(tuple(permutation))
+    _destinations[size] = tuple(permutations)
+    return _destinations[size]
+
+
+def sources(size: int) -> tuple[tuple[int, ...], ...]:
+    """
+    Computes (or looks up) where each cell of a board of the given size comes from under each symmetry; this is the
+    inverse of each permutation from destinations, which lets a symmetry be applied as a single gather:
+    transformed = [cells[i] for i in sources(size)[symmetry]]
+    :param size: the number of cells across the board
+    :return: a tuple with one permutation per symmetry, where permutation[cell] is the cell that ends up at cell
+    """
+    try:
+        return _sources[size]
+    except KeyError:
+        pass
+    permutations: list[tuple[int, ...]] = []
+    for permutation in destinations(size):
+        source = [0] * len(permutation)
+        for origin, destination in enumerate(permutation):
+            source[destination] = origin
+        permutations.append(tuple(source))
+    _sources[size] = tuple(permutations)
+    return _sources[size]
+
+
+def compose(second: int, first: int) -> int:
+    """
+    :param second: the number of the symmetry to apply second
+    :param first: the number of the symmetry to apply first
+    :return: the number of the symmetry that applies first, then second
+    """
+    return (DihedralTransformation(second) * DihedralTransformation(first)).element()
+
+
+def _registry(size: int) -> tuple[tuple[Transformation, ...], tuple[Transformation, ...]]:
+    """
+    Builds (or looks up) the shared Transformations for every symmetry of a board of the given size and their inverses
+    """
+    try:
+        return _transformations[size]
+    except KeyError:
+        pass
+    transformations = tuple(DihedralTransformation(symmetry).toTransformation(size) for symmetry in range(SYMMETRIES))
+    inverses = tuple(t.getInverse() for t in transformations)
+    for symmetry in range(SYMMETRIES):
+        _registered[id(transformations[symmetry])] = (size, symmetry)
+        _registered[id(inverses[symmetry])] = (size, inverse(symmetry))
+    _transformations[size] = (transformations, inverses)
+    return _transformations[size]
+
+
+def transformation(size: int, symmetry: int) -> Transformation:
+    """
+    Looks up the Transformation in the plane that matches the given symmetry of a board of the given size. It's built
+    the first time it's asked for and shared after that, so it must not be changed.
+    :param size: the number of cells across the board
+    :param symmetry: the number of the symmetry
+    :return: the Transformation that rotates or reflects the board about its center
+    """
+    global _constructionsAvoided
+    if size in _transformations:
+        _constructionsAvoided += 1
+    return _registry(size)[0][symmetry]
+
+
+def inverseTransformation(size: int, symmetry: int) -> Transformation:
+    """
+    Looks up the inverse of transformation(size, symmetry), the same as its getInverse, but shared like it is
+    :param size: the number of cells across the board
+    :param symmetry: the number of the symmetry to undo
+    :return: the Transformation that undoes the symmetry
+    """
+    global _constructionsAvoided
+    if size in _transformations:
+        _constructionsAvoided += 1
+    return _registry(size)[1][symmetry]
+
+
+def symmetryOf(t: Transformation, size: int) -> int | None:
+    """
+    :param t: a Transformation
+    :param size: the size of the board it's for
+    :return: the number of the symmetry if t is one of the shared Transformations for a board of the given size (from
+    transformation or inverseTransformation), or None otherwise
+    """
+    registered = _registered.get(id(t))
+    if registered is None or registered[0] != size:
+        return None
+    return registered[1]
+
+
+def constructionsAvoided() -> int:
+    """
+    :return: how many times transformation and inverseTransformation handed out a shared Transformation instead of
+    building a new one, for profiling
+    """
+    return _constructionsAvoided
+
+
+def testPermutations(size: int = 3) -> None:
+    """
+    Checks that each permutation moves cells the same way as the matching Transformation, and that sources undoes
+    destinations
+    :param size: the size of board to test
+    """
+    for symmetry in range(SYMMETRIES):
+        t = transformation(size, symmetry)
+        for row in range(size):
+            for column in range(size):
+                # transform from row/column space to point space and back, the same way Board.applyTransformation does
+                x, y = t.transformedPoint((float(column), float(size - 1 - row)))
+                newRow, newColumn = round(size - 1 - y), round(x)
+                assert destinations(size)[symmetry][column + row * size] == newColumn + newRow * size
+        for cell in range(size * size):
+            assert sources(size)[symmetry][destinations(size)[symmetry][cell]] == cell
+            assert destinations(size)[inverse(symmetry)][destinations(size)[symmetry][cell]] == cell
+        assert DihedralTransformation(symmetry).getInverse().element() == inverse(symmetry)
+        for other in range(SYMMETRIES):
+            composed = destinations(size)[compose(other, symmetry)]
+            assert all(composed[cell] == destinations(size)[other][destinations(size)[symmetry][cell]]
+                       for cell in range(size * size))
+
+
+def testRegistry(size: int = 3) -> None:
+    """
+    Checks that the shared Transformations match newly built ones and are recognized by symmetryOf
+    :param size: the size of board to test
+    """
+    for symmetry in range(SYMMETRIES):
+        t = transformation(size, symmetry)
+        assert t is transformation(size, symmetry)
+        assert t == DihedralTransformation(symmetry).toTransformation(size)
+        assert inverseTransformation(size, symmetry) == t.getInverse()
+        assert symmetryOf(t, size) == symmetry
+        assert symmetryOf(inverseTransformation(size, symmetry), size) == inverse(symmetry)
+        assert symmetryOf(t.getInverse(), size) is None
+
+
+def main():
+    for size in range(1, 7):
+        testPermutations(size)
+        testRegistry(size)
+    print(f"{constructionsAvoided()} Transformation constructions avoided")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#
+# Trainer.py
+# 18 October 2026
+#
+
+from __future__ import annotations
+from collections import deque
+from time import perf_counter
+from typing import Sequence
+from Game import Game
+from MENACE import MENACE
+from Move import Move
+from Checkpoint import Checkpointer
+from GameLog import GameLogWriter
+from GameRecord import writerFor
+
+
+class TrainingResults:
+    """
+    Keeps track of how a training session went: how many games each symbol won, how many were drawn, and how fast
+    they were played.
+    """
+    # the number of games won by each symbol, with None for draws
+    _outcomes: dict[str | None: int]
+    # how long the games took, in seconds
+    _seconds: float
+    # whether training stopped because the results converged
+    _converged: bool
+
+    def __init__(self):
+        self._outcomes = {Move.CROSS: 0, Move.NOUGHT: 0, None: 0}
+        self._seconds = 0.0
+        self._converged = False
+
+    def record(self, winner: str | None) -> None:
+        """
+        Adds the result of a game
+        :param winner: the symbol that won, or None for a draw
+        """
+        self._outcomes[winner] += 1
+
+    def stop(self, seconds: float, converged: bool = False) -> None:
+        """
+        Records that training has stopped
+        :param seconds: how long the games took, in seconds
+        :param converged: whether training stopped because the results converged
+        """
+        self._seconds = seconds
+        self._converged = converged
+
+    def games(self) -> int:
+        """
+        :return: the number of games played
+        """
+        return sum(self._outcomes.values())
+
+    def wins(self, symbol: str) -> int:
+        """
+        :param symbol: one of Move.CROSS or Move.NOUGHT
+        :return: the number of games the player with that symbol won
+        """
+        return self._outcomes[symbol]
+
+    def draws(self) -> int:
+        """
+        :return: the number of games that were drawn
+        """
+        return self._outcomes[None]
+
+    def seconds(self) -> float:
+        """
+        :return: how long the games took, in seconds
+        """
+        return self._seconds
+
+    def gamesPerSecond(self) -> float:
+        """
+        :return: the average number of games played each second
+        """
+        if self._seconds == 0:
+            return 0.0
+        return self.games() / self._seconds
+
+    def converged(self) -> bool:
+        """
+        :return: True if training stopped because the results converged, False otherwise
+        """
+        return self._converged
+
+    def __repr__(self) -> str:
+        """
+        :return: a summary of the results
+        """
+        return f"{self.games()} games in {self._seconds:.2f} seconds ({self.gamesPerSecond():.1f} games/second): " \
+               f"{Move.CROSS} won {self.wins(Move.CROSS)}, {Move.NOUGHT} won {self.wins(Move.NOUGHT)}, " \
+               f"{self.draws()} draws{' (converged)' if self._converged else ''}"
+
+
+class Convergence:
+    """
+    Decides when training has converged: when the fraction of games won by X, won by O, and drawn each change by at
+    most tolerance from one window of games to the next.
+    """
+    # the number of games in each window
+    _window: int
+    # the largest change in any rate that still counts as converged
+    _tolerance: float
+    # the outcomes of the games in the current window
+    _current: deque[str | None]
+    # the rates from the last complete window, or None if there hasn't been one yet
+    _previous: dict[str | None: float] | None
+
+    def __init__(self, window: int = 1000, tolerance: float = 0.01):
+        """
+        :param window: the number of games to compare at a time; defaults to 1000
+        :param tolerance: how much the rates can change between windows and still be converged; defaults to 0.01
+        """
+        self._window = window
+        self._tolerance = tolerance
+        self._current = deque()
+        self._previous = None
+
+    def update(self, winner: str | None) -> bool:
+        """
+        Adds the result of a game
+        :param winner: the symbol that won, or None for a draw
+        :return: True if this game completed a window whose rates were within tolerance of the last window's
+        """
+        self._current.append(winner)
+        if len(self._current) < self._window:
+            return False
+        rates = {outcome: self._current.count(outcome) / self._window for outcome in (Move.CROSS, Move.NOUGHT, None)}
+        self._current.clear()
+        previous = self._previous
+        self._previous = rates
+        if previous is None:
+            return False
+        return all(abs(rates[outcome] - previous[outcome]) <= self._tolerance for outcome in rates)
+
+
+class Trainer:
+    """
+    Trains two MENACEs by having them play each other as fast as possible, with no GUI, and with logs either turned off
+    or written in the background by a GameLogWriter that stays open for the whole session.
+    """
+    # the game the MENACEs play
+    _game: Game
+    _players: tuple[MENACE, MENACE]
+    # the file or writer to log games to, or None to not keep logs
+    _logfile: str | GameLogWriter | None
+    # each MENACE's Checkpointer, if it should be saved as it trains
+    _checkpointers: Sequence[Checkpointer]
+
+    def __init__(self, player1: MENACE, player2: MENACE, size: int = 3, logfile: str | GameLogWriter | None = None,
+                 checkpointers: Sequence[Checkpointer] = (), k: int | None = None):
+        """
+        :param player1: the MENACE that goes first; it will play X
+        :param player2: the MENACE that goes second; it will play O
+        :param size: the size of the board to play on; defaults to 3
+        :param logfile: the file to append logs of each game to, through a writer that's open while training (compact
+        GameRecords if the name ends with GameRecord.EXTENSION, e.g. gameLogs.games.gz, or text otherwise); or a
+        GameLogWriter to use (which is left open); defaults to None, which turns logs off
+        :param checkpointers: a Checkpointer for each MENACE that should be saved during and after training
+        :param k: how many in a row wins; defaults to size
+        """
+        self._game = Game(player1, player2, size, k)
+        self._players = (player1, player2)
+        self._logfile = logfile
+        self._checkpointers = checkpointers
+
+    def train(self, games: int | None = None, seconds: float | None = None, convergence: Convergence | None = None,
+              reportEvery: float | None = None) -> TrainingResults:
+        """
+        Plays games until one of the stop conditions is met, teaching both MENACEs after each one. At least one stop
+        condition must be given. Every Checkpointer does a full save once training stops.
+        :param games: the number of games to play
+        :param seconds: how long to train for, in seconds; checked between games
+        :param convergence: stops training once the results converge
+        :param reportEvery: print the number of games played and the games per second this often, in seconds
+        :return: the results of the games
+        :raises ValueError: if no stop condition is given
+        """
+        if games is None and seconds is None and convergence is None:
+            raise ValueError("Training needs at least one stop condition: games, seconds, or convergence")
+        results = TrainingResults()
+        player1, player2 = self._players
+        game = self._game
+        log = self._logfile
+        if isinstance(log, str):
+            log = writerFor(log)
+        start = perf_counter()
+        lastReport = start
+        converged = False
+        try:
+            while True:
+                now = perf_counter()
+                if games is not None and results.games() >= games:
+                    break
+                if seconds is not None and now - start >= seconds:
+                    break
+                if reportEvery is not None and now - lastReport >= reportEvery:
+                    print(f"{results.games()} games, {results.games() / (now - start):.1f} games/second")
+                    lastReport = now
+                winner = game.playGame(log)
+                player1.learn(winner)
+                player2.learn(winner)
+                results.record(winner)
+                for checkpointer in self._checkpointers:
+                    checkpointer.gameFinished()
+                if convergence is not None and convergence.update(winner):
+                    converged = True
+                    break
+        finally:
+            results.stop(perf_counter() - start, converged)
+            if isinstance(self._logfile, str):
+                log.close()
+            for checkpointer in self._checkpointers:
+                checkpointer.close()
+        return results
+
+
+def testStopConditions() -> None:
+    """
+    Tests that training stops after the right number of games, after the time is up, or once the results converge,
+    and that it won't start without a stop condition
+    """
+    players = (MENACE("Test 1"), MENACE("Test 2"))
+    trainer = Trainer(players[0], players[1])
+    results = trainer.train(games=123)
+    assert results.games() == 123 and not results.converged()
+    assert results.wins(Move.CROSS) + results.wins(Move.NOUGHT) + results.draws() == 123
+    results = trainer.train(seconds=0.2)
+    assert results.games() > 0 and results.seconds() >= 0.2
+    results = trainer.train(games=10 ** 6, convergence=Convergence(window=100, tolerance=1.0))
+    # a tolerance of 1 is always met, so the second window converges
+    assert results.converged() and results.games() == 200
+    try:
+        trainer.train()
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Training without a stop condition should raise ValueError")
+
+
+def testLogs() -> None:
+    """
+    Tests that training logs every game, as text or as GameRecords depending on the file name, and saves each MENACE
+    with its Checkpointer when it's done
+    """
+    import os
+    import tempfile
+    from Checkpoint import CheckpointPolicy
+    from GameRecord import EXTENSION, readRecords
+    with tempfile.TemporaryDirectory() as directory:
+        players = (MENACE("Test 1"), MENACE("Test 2"))
+        brain = os.path.join(directory, "brain.txt")
+        checkpointer = Checkpointer(players[0], brain, CheckpointPolicy(everyGames=None, compactEvery=None))
+        textLog = os.path.join(directory, "gameLogs.txt")
+        Trainer(players[0], players[1], logfile=textLog, checkpointers=(checkpointer,)).train(games=50)
+        with open(textLog) as infile:
+            assert infile.read().count(": X; ") == 50
+        saved = MENACE.fromFile(brain)
+        assert len(list(saved.matchboxes())) == len(list(players[0].matchboxes()))
+        recordLog = os.path.join(directory, "gameLogs" + EXTENSION + ".gz")
+        results = Trainer(players[0], players[1], size=4, logfile=recordLog, k=3).train(games=50)
+        records = list(readRecords(recordLog))
+        assert len(records) == 50 and all(record.k() == 3 for record in records)
+        assert sum(record.winner() is None for record in records) == results.draws()
+
+
+def main():
+    testStopConditions()
+    testLogs()
+    player1, player2 = MENACE("Menace 1"), MENACE("Menace 2")
+    print(Trainer(player1, player2).train(seconds=5, reportEvery=1))
+
+
+if __name__ == "__main__":
+    main()
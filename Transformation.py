@@ -5,11 +5,13 @@
 #
 
 from __future__ import annotations
-from typing import Tuple, Sequence
+from typing import Tuple, Sequence, TYPE_CHECKING
 from math import sin, cos
 from util import Matrix, toRadians
-# used only for testing purposes
-from graphics import GraphWin, Point, Circle, color_rgb, Text
+# used only for testing purposes; graphics pulls in tkinter, so it's only imported by the functions that draw, and the
+# rest of this module works without a display
+if TYPE_CHECKING:
+    from graphics import GraphWin, Circle
 
 
 class Transformation:
@@ -205,11 +207,143 @@ class Reflection(Transformation):
         self._inverse = total._inverse
 
 
+def _planeTransformation(element: int) -> Transformation:
+    """
+    :param element: the number of a symmetry of the square, as described in DihedralTransformation
+    :return: the Transformation about (0, 0) for that symmetry
+    """
+    if element < 4:
+        return Rotation((0, 0), 90 * element)
+    return Reflection(45 * (element - 4))
+
+
+# the 2x2 integer matrix for each symmetry of the square; every entry is exactly -1, 0, or 1, so rounding the float
+# matrices once gets rid of any error
+_MATRICES: tuple[tuple[tuple[int, int], tuple[int, int]], ...] = tuple(
+    tuple(tuple(round(value) for value in _planeTransformation(element).transformationMatrix()[row][:2])
+          for row in range(2))
+    for element in range(8))
+
+
+def _compose(first: tuple, second: tuple) -> tuple:
+    """
+    :return: the product of two 2x2 matrices, first * second
+    """
+    return tuple(tuple(sum(first[row][k] * second[k][column] for k in range(2)) for column in range(2))
+                 for row in range(2))
+
+
+# _CAYLEY[a][b] is the symmetry that does b, then a, i.e. a * b
+_CAYLEY: tuple[tuple[int, ...], ...] = tuple(
+    tuple(_MATRICES.index(_compose(_MATRICES[a], _MATRICES[b])) for b in range(8)) for a in range(8))
+# _INVERSES[a] is the symmetry that undoes a
+_INVERSES: tuple[int, ...] = tuple(_CAYLEY[a].index(0) for a in range(8))
+
+
+class DihedralTransformation:
+    """
+    One of the 8 ways to rotate or reflect a square onto itself (the dihedral group D4), stored as a small integer
+    numbered the same way as in Symmetry: 0-3 rotate clockwise by 0, 90, 180, and 270 degrees, and 4-7 reflect about a
+    line rotated clockwise from the y-axis by 0, 45, 90, and 135 degrees. Composing and inverting are table lookups,
+    and equality is exact. Use toTransformation to get a Transformation, e.g. for drawing.
+    """
+    __slots__ = ("_element",)
+    # the number of the symmetry
+    _element: int
+
+    def __init__(self, element: int = 0):
+        """
+        :param element: the number of the symmetry; defaults to 0, the identity
+        """
+        if not 0 <= element < len(_CAYLEY):
+            raise ValueError(f"There is no symmetry number {element}")
+        self._element = element
+
+    def element(self) -> int:
+        """
+        :return: the number of the symmetry
+        """
+        return self._element
+
+    def transformedPoint(self, position: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        Applies the symmetry about (0, 0) to the given x, y values in the plane, exactly
+        :param position: the x, y value to transform
+        :return: the transformed x, y values
+        """
+        (a, b), (c, d) = _MATRICES[self._element]
+        x, y = position
+        return a * x + b * y, c * x + d * y
+
+    def toTransformation(self, size: int | None = None) -> Transformation:
+        """
+        :param size: if provided, the Transformation rotates or reflects about the center of a board of this size,
+        with the bottom left cell at (0, 0); otherwise it rotates or reflects about (0, 0)
+        :return: a new Transformation that does the same thing as this one
+        """
+        pureTransformation = _planeTransformation(self._element)
+        if size is None:
+            return pureTransformation
+        # to rotate or reflect about the center, we need to move the center to (0, 0), transform, then move back
+        center = (size - 1) / 2
+        return Translation(center, center) * pureTransformation * Translation(-center, -center)
+
+    def getInverse(self) -> DihedralTransformation:
+        """
+        :return: the DihedralTransformation that undoes this one
+        """
+        return DihedralTransformation(_INVERSES[self._element])
+
+    def __mul__(self, other: DihedralTransformation) -> DihedralTransformation:
+        """
+        :param other: The DihedralTransformation to apply before applying this one
+        :return: The DihedralTransformation that does both
+        """
+        return DihedralTransformation(_CAYLEY[self._element][other._element])
+
+    def __index__(self) -> int:
+        """
+        :return: the number of the symmetry, so this can be used anywhere a symmetry number is expected
+        """
+        return self._element
+
+    def __eq__(self, other: DihedralTransformation) -> bool:
+        return isinstance(other, DihedralTransformation) and self._element == other._element
+
+    def __ne__(self, other: DihedralTransformation) -> bool:
+        return not self == other
+
+    def __hash__(self) -> int:
+        return self._element
+
+    def __repr__(self) -> str:
+        if self._element < 4:
+            return f"DihedralTransformation(rotate {90 * self._element} degrees)"
+        return f"DihedralTransformation(reflect at {45 * (self._element - 4)} degrees)"
+
+
+def testDihedralTransformations() -> None:
+    """
+    Checks that composing and inverting DihedralTransformations matches doing the same with Transformations
+    """
+    points = [(x, y) for x in range(-2, 3) for y in range(-2, 3)]
+    for a in range(8):
+        first = DihedralTransformation(a)
+        assert first * first.getInverse() == DihedralTransformation()
+        for point in points:
+            x, y = first.toTransformation().transformedPoint(point)
+            assert first.transformedPoint(point) == (round(x), round(y))
+        for b in range(8):
+            second = DihedralTransformation(b)
+            assert (first * second).toTransformation() == first.toTransformation() * second.toTransformation()
+
+
 # code from here on out is to test the transformations
 
 
 def drawPoints(points: Sequence[tuple[float | int, float | int]], transformation: Transformation, win: GraphWin)\
         -> list[Circle]:
+    from graphics import Point, Circle, color_rgb, Text
     drawnPoints = []
     for x, y in points:
         transformedPoint = transformation.transformedPoint((x, y))
@@ -240,6 +374,8 @@ def drawPoints(points: Sequence[tuple[float | int, float | int]], transformation
 
 
 def main():
+    from graphics import GraphWin
+    testDihedralTransformations()
     win = GraphWin("Transformation Testing", 600, 600)
     win.setCoords(-5, -5, 5, 5)
     # make points for a square of width 5 from (-2, -2) to (2, 2)
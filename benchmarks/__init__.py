@@ -0,0 +1,13 @@
+#
+# __init__.py
+# 18 October 2026
+#
+
+"""
+Benchmarks for the hot paths of the real modules. Run them from the top of the repository with python -m benchmarks;
+see benchmarks.suite for the options.
+"""
+
+from benchmarks.suite import BENCHMARKS, runBenchmarks, compareToBaseline
+
+__all__ = ["BENCHMARKS", "runBenchmarks", "compareToBaseline"]
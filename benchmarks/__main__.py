@@ -0,0 +1,9 @@
+#
+# __main__.py
+# 18 October 2026
+#
+
+from benchmarks.suite import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+#
+# suite.py
+# 18 October 2026
+#
+
+"""
+Times the hot paths of the real modules on boards of each size, writes the results as JSON, and compares them against
+a stored baseline so regressions fail loudly. For example, from the top of the repository:
+    python -m benchmarks                             (every benchmark on 3x3 to 6x6, compared to baseline.json)
+    python -m benchmarks --sizes 3 4 --only winner   (just the winner benchmarks on 3x3 and 4x4)
+    python -m benchmarks --output results.json       (also save the results)
+    python -m benchmarks --save-baseline             (make these results the new baseline)
+Timings on different machines aren't comparable, so a fixed pure Python loop is timed right before each benchmark,
+and results are compared relative to that loop's time rather than in seconds, taking the median over several rounds.
+Even so, a baseline is most reliable on the machine it was made on, so make a new one with --save-baseline before
+comparing on a different machine.
+"""
+
+from __future__ import annotations
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+from copy import copy
+from statistics import median
+from time import perf_counter
+from typing import Callable
+from BitBoard import BitBoard
+from Board import Board
+from Game import Game
+from MENACE import MENACE
+from Matchbox import Matchbox
+from Move import Move
+import BrainFile
+import Symmetry
+
+# the baseline that's compared against by default
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# the board sizes benchmarked by default
+SIZES = (3, 4, 5, 6)
+# how much slower than the baseline (relative to the calibration loop) a benchmark can get before it's a regression
+TOLERANCE = 0.5
+# benchmarks whose timings depend on the file system, which varies a lot more between runs; they get this many times
+# the tolerance
+_NOISY = ("MENACE.save",)
+_NOISY_FACTOR = 2
+
+# the shortest time, in seconds, to time a benchmark for; shorter benchmarks are run several times in a row
+_MINIMUM_TIME = 0.05
+# the number of positions each per-position benchmark runs over
+_POSITIONS = 200
+# the number of games Game.playGame and the brain for the save and load benchmarks are played for, by board size
+_GAMES = {3: 300, 4: 60, 5: 20, 6: 10}
+
+# a benchmark takes the board size and a temporary directory it can write to, and returns a function that does the
+# work being timed and the number of operations that function does
+Benchmark = Callable[[int, str], tuple[Callable[[], object], int]]
+
+
+def _positions(size: int, count: int, seed: int = 0, boardClass: type[Board] = BitBoard) -> list[Board]:
+    """
+    Makes boards from random games, stopping each game at a random turn before it ends
+    :param size: the number of cells across the board
+    :param count: the number of boards to make
+    :param seed: the seed for the random number generator, so every run gets the same boards
+    :param boardClass: the kind of board to make; defaults to BitBoard, which is what Game plays on
+    :return: the boards
+    """
+    generator = random.Random(seed)
+    symbols = (Move.CROSS, Move.NOUGHT)
+    boards: list[Board] = []
+    while len(boards) < count:
+        board = boardClass(size)
+        cells = list(range(size * size))
+        generator.shuffle(cells)
+        stop = generator.randrange(size * size)
+        for turn, cell in enumerate(cells[:stop]):
+            board.makeMove(Move(cell // size, cell % size, symbols[turn % 2]))
+            if board.isOver():
+                board = None
+                break
+        if board is not None:
+            boards.append(board)
+    return boards
+
+
+def _trainedMenaces(size: int) -> tuple[MENACE, MENACE]:
+    """
+    :param size: the number of cells across the board
+    :return: two MENACEs that have played (and learned from) a few games against each other
+    """
+    random.seed(size)
+    players = (MENACE("Benchmark 1"), MENACE("Benchmark 2"))
+    game = Game(players[0], players[1], size)
+    for i in range(_GAMES[size]):
+        winner = game.playGame(None)
+        for player in players:
+            player.learn(winner)
+    return players
+
+
+def _winner(boardClass: type[Board]) -> Benchmark:
+    """
+    :param boardClass: the kind of board to benchmark
+    :return: a benchmark for winner
+    """
+    def setup(size: int, directory: str) -> tuple[Callable[[], object], int]:
+        boards = _positions(size, _POSITIONS, boardClass=boardClass)
+
+        def run() -> None:
+            for board in boards:
+                board.winner()
+        return run, len(boards)
+    return setup
+
+
+def _transformationTo(boardClass: type[Board]) -> Benchmark:
+    """
+    :param boardClass: the kind of board to benchmark
+    :return: a benchmark for transformationTo
+    """
+    def setup(size: int, directory: str) -> tuple[Callable[[], object], int]:
+        generator = random.Random(1)
+        pairs: list[tuple[Board, Board]] = []
+        for board in _positions(size, _POSITIONS, boardClass=boardClass):
+            other = copy(board)
+            other.applySymmetry(generator.randrange(Symmetry.SYMMETRIES))
+            pairs.append((board, other))
+
+        def run() -> None:
+            for board, other in pairs:
+                board.transformationTo(other)
+        return run, len(pairs)
+    return setup
+
+
+def _equivalentBoards(boardClass: type[Board]) -> Benchmark:
+    """
+    :param boardClass: the kind of board to benchmark
+    :return: a benchmark for equivalentBoards
+    """
+    def setup(size: int, directory: str) -> tuple[Callable[[], object], int]:
+        boards = _positions(size, _POSITIONS // 4, boardClass=boardClass)
+
+        def run() -> None:
+            for board in boards:
+                board.equivalentBoards()
+        return run, len(boards)
+    return setup
+
+
+def _generateLegalMoves(size: int, directory: str) -> tuple[Callable[[], object], int]:
+    symbols = (Move.CROSS, Move.NOUGHT)
+    matchboxes = [Matchbox(board, symbols[board.sum() % 2], False) for board in _positions(size, _POSITIONS)]
+
+    def run() -> None:
+        for matchbox in matchboxes:
+            matchbox._generateLegalMoves()
+    return run, len(matchboxes)
+
+
+def _matchboxFor(size: int, directory: str) -> tuple[Callable[[], object], int]:
+    # only boards where it's X's turn, in a random orientation, so each lookup has to find the symmetry
+    generator = random.Random(2)
+    boards = [board for board in _positions(size, _POSITIONS * 2) if board.sum() % 2 == 0]
+    for board in boards:
+        board.applySymmetry(generator.randrange(Symmetry.SYMMETRIES))
+    menace = MENACE("Benchmark", Move.CROSS)
+    # look every board up once first, so the timed lookups find matchboxes that already exist
+    for board in boards:
+        menace._matchboxFor(board)
+
+    def run() -> None:
+        for board in boards:
+            menace._matchboxFor(board)
+    return run, len(boards)
+
+
+def _playGame(size: int, directory: str) -> tuple[Callable[[], object], int]:
+    player1, player2 = _trainedMenaces(size)
+    game = Game(player1, player2, size)
+    games = _GAMES[size]
+
+    def run() -> None:
+        random.seed(0)
+        for i in range(games):
+            game.playGame(None)
+            # forget the moves without learning from them, so every run plays against the same beads
+            player1.forget()
+            player2.forget()
+    return run, games
+
+
+def _save(extension: str) -> Benchmark:
+    """
+    :param extension: the extension of the file to save to, which picks the format
+    :return: a benchmark for MENACE.save
+    """
+    def setup(size: int, directory: str) -> tuple[Callable[[], object], int]:
+        menace = _trainedMenaces(size)[0]
+        filename = os.path.join(directory, f"save {size}{extension}")
+
+        def run() -> None:
+            menace.save(filename)
+        return run, 1
+    return setup
+
+
+def _fromFile(extension: str) -> Benchmark:
+    """
+    :param extension: the extension of the file to load from, which picks the format
+    :return: a benchmark for MENACE.fromFile; binary brains are loaded lazily, so their matchboxes are all read too
+    """
+    def setup(size: int, directory: str) -> tuple[Callable[[], object], int]:
+        filename = os.path.join(directory, f"load {size}{extension}")
+        _trainedMenaces(size)[0].save(filename)
+
+        def run() -> None:
+            for matchbox in MENACE.fromFile(filename).matchboxes():
+                pass
+        return run, 1
+    return setup
+
+
+# every benchmark, by name; the Matchbox and MENACE benchmarks use BitBoards, like Game
+BENCHMARKS: dict[str, Benchmark] = {
+    "Board.winner": _winner(Board),
+    "BitBoard.winner": _winner(BitBoard),
+    "Board.transformationTo": _transformationTo(Board),
+    "BitBoard.transformationTo": _transformationTo(BitBoard),
+    "Board.equivalentBoards": _equivalentBoards(Board),
+    "BitBoard.equivalentBoards": _equivalentBoards(BitBoard),
+    "Matchbox._generateLegalMoves": _generateLegalMoves,
+    "MENACE._matchboxFor": _matchboxFor,
+    "Game.playGame": _playGame,
+    "MENACE.save (text)": _save(".txt"),
+    "MENACE.save (binary)": _save(BrainFile.EXTENSION),
+    "MENACE.fromFile (text)": _fromFile(".txt"),
+    "MENACE.fromFile (binary)": _fromFile(BrainFile.EXTENSION),
+}
+
+
+def _loops(run: Callable[[], object]) -> int:
+    """
+    :param run: the function to time
+    :return: how many times in a row to call it for each timing to take at least _MINIMUM_TIME
+    """
+    loops = 1
+    while _time(run, loops) * loops < _MINIMUM_TIME:
+        loops *= 2
+    return loops
+
+
+def _time(run: Callable[[], object], loops: int) -> float:
+    """
+    Times a function called several times in a row
+    :param run: the function to time
+    :param loops: the number of calls
+    :return: the average time for one call, in seconds
+    """
+    # like timeit, keep the garbage collector out of the timings, since how long it takes depends on everything else
+    # that happens to be in memory
+    collecting = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        start = perf_counter()
+        for i in range(loops):
+            run()
+        return (perf_counter() - start) / loops
+    finally:
+        if collecting:
+            gc.enable()
+
+
+def _calibration() -> None:
+    """
+    A fixed pure Python loop, timed next to every benchmark to compare how fast different machines (or moments on the
+    same machine) are
+    """
+    total = 0
+    for i in range(20000):
+        total += i * i
+
+
+def _measure(run: Callable[[], object], repeat: int, rounds: int) -> tuple[float, float, int]:
+    """
+    Times a function against the calibration loop. Each round times the calibration loop and then the function (the
+    fastest of repeat timings, which is the one least disturbed by everything else on the machine), so both see the
+    machine in the same state; the median over the rounds ignores the odd round where either was disturbed anyway.
+    :param run: the function to time
+    :param repeat: the number of timings of the function in each round
+    :param rounds: the number of rounds
+    :return: the median time for one call in seconds, the median of its time divided by the calibration loop's, and
+    the number of calls in each timing
+    """
+    loops = _loops(run)
+    calibrationLoops = _loops(_calibration)
+    seconds: list[float] = []
+    relative: list[float] = []
+    for i in range(rounds):
+        calibration = min(_time(_calibration, calibrationLoops) for j in range(repeat))
+        best = min(_time(run, loops) for j in range(repeat))
+        seconds.append(best)
+        relative.append(best / calibration)
+    return median(seconds), median(relative), loops
+
+
+def calibrate(repeat: int = 5) -> float:
+    """
+    Times the calibration loop on its own
+    :param repeat: the number of times to time it; defaults to 5
+    :return: the median time, in seconds
+    """
+    loops = _loops(_calibration)
+    return median(_time(_calibration, loops) for i in range(repeat))
+
+
+def runBenchmarks(sizes: tuple[int, ...] = SIZES, names: tuple[str, ...] | None = None, repeat: int = 3,
+                  rounds: int = 5, verbose: bool = False) -> dict:
+    """
+    Runs benchmarks on boards of each size
+    :param sizes: the board sizes to run on; defaults to SIZES
+    :param names: the names of the benchmarks to run (see BENCHMARKS); defaults to all of them. any name containing
+    one of these (e.g. winner for Board.winner and BitBoard.winner) is run.
+    :param repeat: the number of times to time each benchmark in each round; the fastest is kept. defaults to 3
+    :param rounds: the number of rounds to time each benchmark (and the calibration loop) for; the median is kept.
+    defaults to 5
+    :param verbose: if True, prints each result as it's measured; defaults to False
+    :return: the results, ready to be written as JSON: the calibration time, and for each benchmark on each size (keyed
+    like Board.winner/3) the seconds per operation, the time relative to the calibration loop, and the number of
+    operations in each timing
+    """
+    results: dict = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "calibration": calibrate(),
+        "benchmarks": dict(),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for name, setup in BENCHMARKS.items():
+            if names is not None and not any(part in name for part in names):
+                continue
+            for size in sizes:
+                run, operations = setup(size, directory)
+                seconds, relative, loops = _measure(run, repeat, rounds)
+                results["benchmarks"][f"{name}/{size}"] = {"seconds": seconds / operations,
+                                                           "relative": relative / operations,
+                                                           "operations": operations * loops}
+                if verbose:
+                    print(f"{name}/{size}: {seconds / operations * 1e6:.3f} microseconds")
+    return results
+
+
+def compareToBaseline(results: dict, baseline: dict, tolerance: float = TOLERANCE) -> list[str]:
+    """
+    Compares results from runBenchmarks to a baseline from an earlier run. Times relative to the calibration loop are
+    compared, so a uniformly faster or slower machine doesn't count as a change.
+    :param results: the new results
+    :param baseline: the results to compare against
+    :param tolerance: how much slower (as a fraction) a benchmark can get before it's a regression (or _NOISY_FACTOR
+    times that for benchmarks in _NOISY); defaults to TOLERANCE
+    :return: a description of each regression; benchmarks that are only in one of the results are skipped
+    """
+    regressions: list[str] = []
+    for key, result in results["benchmarks"].items():
+        if key not in baseline["benchmarks"]:
+            continue
+        new = result["relative"]
+        old = baseline["benchmarks"][key]["relative"]
+        allowed = tolerance * _NOISY_FACTOR if key.startswith(_NOISY) else tolerance
+        if new > old * (1 + allowed):
+            regressions.append(f"{key} is {new / old:.2f}x slower than the baseline")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks the hot paths of MENACE")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="board sizes to benchmark")
+    parser.add_argument("--only", nargs="+", help="only run benchmarks whose names contain one of these")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="times to run each benchmark in each round; the fastest is kept")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds to run each benchmark for; the median is kept")
+    parser.add_argument("--output", help="file to write the results to as JSON")
+    parser.add_argument("--baseline", default=BASELINE, help="results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to the baseline instead")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="how much slower than the baseline counts as a regression, as a fraction")
+    arguments = parser.parse_args()
+
+    results = runBenchmarks(tuple(arguments.sizes), arguments.only, arguments.repeat, arguments.rounds, verbose=True)
+    if arguments.output is not None:
+        with open(arguments.output, "w") as outfile:
+            json.dump(results, outfile, indent=2)
+    if arguments.save_baseline:
+        # keep the baseline's results for anything that wasn't run this time
+        baseline = results
+        if os.path.exists(arguments.baseline):
+            with open(arguments.baseline, "r") as infile:
+                baseline = json.load(infile)
+            baseline["benchmarks"].update(results["benchmarks"])
+        with open(arguments.baseline, "w") as outfile:
+            json.dump(baseline, outfile, indent=2)
+        print(f"Saved the baseline to {arguments.baseline}")
+        return
+    if not os.path.exists(arguments.baseline):
+        print(f"No baseline at {arguments.baseline} to compare against; run with --save-baseline to make one")
+        return
+    with open(arguments.baseline, "r") as infile:
+        baseline = json.load(infile)
+    regressions = compareToBaseline(results, baseline, arguments.tolerance)
+    if regressions:
+        print(f"{len(regressions)} regression(s) compared to {arguments.baseline}:", file=sys.stderr)
+        for regression in regressions:
+            print(f"  {regression}", file=sys.stderr)
+        sys.exit(1)
+    print(f"No regressions compared to {arguments.baseline}")
+
+
+if __name__ == "__main__":
+    main()
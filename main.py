@@ -8,10 +8,13 @@ from Game import Game
 from MENACE import MENACE
 from Human import Human
 from Player import Player
-from Drawables import GameUI
+from Checkpoint import CheckpointPolicy, Checkpointer
+from Trainer import Trainer
+from LogAnalytics import analyzeLogs
 
 
-def menaceVsMenace(iterations, menace1File: str | None = None, menace2File: str | None = None, size: int = 3) -> None:
+def menaceVsMenace(iterations, menace1File: str | None = None, menace2File: str | None = None, size: int = 3,
+                   checkpointPolicy: CheckpointPolicy | None = None) -> None:
     if menace1File is not None:
         try:
             m1 = MENACE.fromFile(menace1File)
@@ -26,15 +29,16 @@ def menaceVsMenace(iterations, menace1File: str | None = None, menace2File: str
             m2 = MENACE(menace2File[:-4])
     else:
         m2 = MENACE("Menace 2")
-    g = Game(m1, m2, size)
-    for i in range(iterations):
-        winner = g.playGame(gameLogs)
-        m1.learn(winner)
-        m2.learn(winner)
+    # without a policy, each MENACE is only saved once all the games are done
+    checkpointers: list[Checkpointer] = []
+    if checkpointPolicy is None:
+        checkpointPolicy = CheckpointPolicy(everyGames=None, compactEvery=None)
     if menace1File is not None:
-        m1.save(menace1File)
+        checkpointers.append(Checkpointer(m1, menace1File, checkpointPolicy))
     if menace2File is not None:
-        m2.save(menace2File)
+        checkpointers.append(Checkpointer(m2, menace2File, checkpointPolicy))
+    trainer = Trainer(m1, m2, size, gameLogs, checkpointers=checkpointers)
+    print(trainer.train(games=iterations))
 
 
 def humanVsHuman() -> None:
@@ -53,32 +57,26 @@ def humanVsMenace(player1: Player, player2: Player) -> None:
         player2.save("MENACE Second vs Human.txt")
 
 
-def readLogs(filename: str = "gameLogs.txt"):
-    with open(filename, "r") as infile:
-        wins = dict()
-        draws = 0
-        for line in infile:
-            if " won playing " in line and " turns!" in line:
-                player = line.split(" won playing ")[0]
-                if player in wins:
-                    wins[player] += 1
-                else:
-                    wins[player] = 1
-            elif "Draw in " in line and " turns!" in line:
-                draws += 1
-    for player in wins.keys():
-        print(f"{player} won {wins[player]} times")
-    print(f"There were {draws} draws")
+def readLogs(filename: str = "gameLogs.txt", workers: int | None = 1):
+    """
+    Prints statistics about the games in a log: text, compressed, or game records
+    :param filename: the log to read; defaults to gameLogs.txt
+    :param workers: how many processes to read with; defaults to 1. None uses one per CPU
+    """
+    print(analyzeLogs([filename], workers).report())
 
 
 gameLogs = "5x5 test.txt"
 
 
-def trainMenace(file1: str = "Menace 1.txt", file2: str = "Menace 2.txt", size: int = 3, rounds: int = 500):
-    menaceVsMenace(rounds, file1, file2, size)
+def trainMenace(file1: str = "Menace 1.txt", file2: str = "Menace 2.txt", size: int = 3, rounds: int = 500,
+                checkpointPolicy: CheckpointPolicy | None = None):
+    menaceVsMenace(rounds, file1, file2, size, checkpointPolicy)
 
 
 def main():
+    # only load the GUI (and tkinter) when it's actually shown, so the rest of this module works without a display
+    from Drawables import GameUI
     g = GameUI()
     # GameUI includes a quit button that will exit the program after each game if clicked
     while True:
@@ -5,14 +5,16 @@
 #
 
 from __future__ import annotations
+from copy import copy
 from math import pi
 # heavily referenced https://docs.python.org/3/library/typing.html and various sub-links to better understand
 # type annotations for lists, tuples, and sequences
-from typing import List, Sequence, TYPE_CHECKING
+from typing import Iterator, List, Sequence, TYPE_CHECKING
 # learned this syntax from https://adamj.eu/tech/2021/05/13/python-type-hints-how-to-fix-circular-imports/
 if TYPE_CHECKING:
     from Matchbox import Matchbox
     from Board import Board
+    from BrainFile import BrainReader
 
 
 def toRadians(degrees: float) -> float:
@@ -48,104 +50,164 @@ class IllegalMoveError(Exception):
 class InvalidMoveError(Exception):
     pass
 
-class BinarySearchTree:
+
+class BrainFormatError(Exception):
+    pass
+
+
+class GameRecordError(Exception):
+    pass
+
+
+def _movesInKey(key: int) -> int:
     """
-    A Binary Search Tree for MENACE to use with Matchboxes and Boards
+    :param key: the canonical key of a board (see Board.canonicalKey)
+    :return: the number of moves on the board, i.e. the number of digits of the key in base 3 that aren't 0
     """
-    # the items in the tree
-    _items: List[Matchbox]
-    # the sums of the items in the tree
-    _sums: List[int]
+    moves = 0
+    while key:
+        key, digit = divmod(key, 3)
+        if digit:
+            moves += 1
+    return moves
+
 
-    def __init__(self):
-        self._items = []
-        self._sums = []
+class MatchboxIndex:
+    """
+    An index for MENACE to find its Matchboxes in: one bucket for each board size and number of moves made, each holding
+    a dictionary from the canonical key of a Matchbox's board (see Board.canonicalKey) to the Matchbox. Keys don't say
+    how big the board is (e.g. every empty board has key 0), so boards of different sizes need different buckets.
+    """
+    # the Matchboxes, bucketed by the size of their boards and how many moves they have, then keyed by their canonical
+    # keys
+    _buckets: dict[tuple[int, int], dict[int, Matchbox]]
+    # the total number of Matchboxes in every bucket
+    _length: int
+    # the number of those Matchboxes find has had to create, because they weren't in the index or the source
+    _created: int
+    # a saved brain to load Matchboxes from the first time they're looked for, if any
+    _source: BrainReader | None
+
+    def __init__(self, source: BrainReader | None = None):
+        """
+        :param source: a saved brain to load Matchboxes from as they're needed; if not provided, the index starts empty
+        """
+        self._buckets = dict()
+        self._length = 0
+        self._created = 0
+        self._source = source
+
+    def _loadAll(self) -> None:
+        """
+        Loads every Matchbox that hasn't been loaded from the source yet, then closes the source
+        """
+        if self._source is not None:
+            source = self._source
+            self._source = None
+            for key, item in source:
+                bucket = self._buckets.setdefault((item.size(), item.sum()), dict())
+                # Matchboxes that were already loaded may have learned since, so keep those
+                if key not in bucket:
+                    bucket[key] = item
+                    self._length += 1
+            source.close()
 
     def append(self, item: Matchbox) -> None:
         """
-        Add the given Matchbox to the tree
+        Add the given Matchbox to the index, rotating or reflecting it into its canonical orientation if needed.
+        Replaces any Matchbox already in the index for an equivalent board.
         :param item: the Matchbox to add
         """
-        if len(self._items) == 0:
-            self._items.append(item)
-            self._sums.append(item.sum())
-        else:
-            # insert the item into the first spot where the list would be sorted
-            for i in range(len(self._items)):
-                if self._items[i] >= item:
-                    self._items.insert(i, item)
-                    self._sums.insert(i, item.sum())
-                    return
-            # if we're at this point, it must be larger than any item in the list; it belongs at the end
-            self._items.append(item)
-            self._sums.append(item.sum())
-
-    def __iter__(self) -> Matchbox:
-        for item in self._items:
-            yield item
-
-    def find(self, item: Board, symbol: str) -> Matchbox:
+        import Symmetry
+        key, symmetry = item.canonicalKey()
+        if symmetry != Symmetry.IDENTITY:
+            item.applySymmetry(symmetry)
+        bucket = self._buckets.setdefault((item.size(), item.sum()), dict())
+        if key not in bucket:
+            self._length += 1
+        bucket[key] = item
+
+    def __iter__(self) -> Iterator[Matchbox]:
+        """
+        :return: each Matchbox, smaller boards first, and with earlier turns before later ones for each size
+        """
+        self._loadAll()
+        for bucket in sorted(self._buckets):
+            for item in self._buckets[bucket].values():
+                yield item
+
+    def items(self) -> Iterator[tuple[int, Matchbox]]:
+        """
+        :return: each Matchbox along with the canonical key of its board, in the same order as iterating over the index
+        """
+        self._loadAll()
+        for bucket in sorted(self._buckets):
+            yield from self._buckets[bucket].items()
+
+    def __len__(self) -> int:
+        """
+        :return: the number of Matchboxes in the index
+        """
+        self._loadAll()
+        return self._length
+
+    def loaded(self) -> int:
+        """
+        :return: the number of Matchboxes that have been loaded or created so far, without loading the rest
+        """
+        return self._length
+
+    def created(self) -> int:
+        """
+        :return: the number of Matchboxes find has created so far, rather than finding or loading them
+        """
+        return self._created
+
+    def findKey(self, key: int, size: int, symbol: str, k: int | None = None) -> Matchbox:
+        """
+        Find the Matchbox for the board with the given canonical key, or create it if it doesn't exist
+        :param key: the canonical key of the board (see Board.canonicalKey)
+        :param size: the size of the board
+        :param symbol: the symbol to put on the box we create if we don't already have it
+        :param k: how many in a row wins on the board; defaults to size
+        :return: the Matchbox for that board
+        """
+        # the key says which bucket the Matchbox is in, so the board only needs to be built for a new Matchbox
+        bucket = self._buckets.get((size, _movesInKey(key)))
+        if bucket is not None:
+            box = bucket.get(key)
+            if box is not None:
+                return box
+        from Board import Board
+        return self.find(Board.fromKey(key, size, k), symbol)[0]
+
+    def find(self, item: Board, symbol: str) -> tuple[Matchbox, int]:
         """
         Find the Matchbox for the given Board, or create it if it doesn't exist
         :param item: the Board state to find
         :param symbol: the symbol to put on the box we create if we don't already have it
-        :return: the Matchbox corresponding to this board state; automatically creates a new one and adds it if it
-        isn't in here
-        """
-        box = self._recursiveFind(item, 0, len(self._items))
+        :return: the Matchbox corresponding to this board state, along with the number of the symmetry that turns the
+        given Board into the Matchbox's board; automatically creates a new one and adds it if it isn't in here
+        """
+        key, symmetry = item.canonicalKey()
+        bucket = self._buckets.get((item.size(), item.sum()))
+        if bucket is not None:
+            box = bucket.get(key)
+            if box is not None:
+                return box, symmetry
+        box = None
+        if self._source is not None:
+            box = self._source.find(key, item.size(), symbol)
         if box is None:
             from Matchbox import Matchbox
-            box = Matchbox(item, symbol)
-            self.append(box)
-        return box
-
-    def _recursiveFind(self, item: Board, minPos: int, maxPos: int) -> Matchbox | None:
-        """
-        Tries to find the item in the subset of _items given by the bounds
-        :param item: the item to search for
-        :param minPos: the smallest bound that we should search
-        :param maxPos: the smallest bound we shouldn't search
-        :return: the Matchbox that matches Board, or None if no such matchbox exists.
-        """
-        # if we're trying to search a strip of length 0, it's not in here
-        if minPos == maxPos:
-            return None
-        # if there's only one item, we can find it by hand
-        elif minPos + 1 == maxPos:
-            if self._items[minPos].holdsBoardState(item):
-                return self._items[minPos]
-            else:
-                return None
-        # guess that the item we're looking for is in the middle of the list
-        guess = (minPos + maxPos) // 2
-        # keep track of how many moves our guess made and how many moves the item made
-        boxSum = self._sums[guess]
-        boardSum = item.sum()
-        # if item made fewer moves, it's somewhere before guess
-        if boardSum < boxSum:
-            return self._recursiveFind(item, minPos, guess)
-        # if item made more moves, it's somewhere after guess
-        elif boardSum > boxSum:
-            return self._recursiveFind(item, guess, maxPos)
-        # if they made the same number of moves, it's somewhere nearby
-        else:
-            # start from the middle of the section we're given and fan out
-            for i in range(round((maxPos - minPos) / 2)):
-                # check if we're still in bounds and if we need to look any further right or left
-                largerStillEqual = guess + i < maxPos and self._sums[guess + i] == boardSum
-                smallerStillEqual = guess - i >= minPos and self._sums[guess - i] == boardSum
-                # if neither way is worth looking, we can exit
-                if not largerStillEqual and not smallerStillEqual:
-                    return None
-
-                # use short circuit evaluation to skip evaluating states we know aren't equal from their sums
-                # first pass looks right
-                if largerStillEqual and self._items[guess + i].holdsBoardState(item):
-                    return self._items[guess + i]
-
-                # second pass looks left
-                elif smallerStillEqual and self._items[guess - i].holdsBoardState(item):
-                    return self._items[guess - i]
+            # create the box in the canonical orientation so it doesn't need to be rotated or reflected again
+            board = copy(item)
+            board.applySymmetry(symmetry)
+            box = Matchbox(board, symbol)
+            self._created += 1
+        self._buckets.setdefault((box.size(), box.sum()), dict())[key] = box
+        self._length += 1
+        return box, symmetry
 
 
 class Matrix: